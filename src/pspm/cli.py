@@ -1,60 +1,214 @@
 """Module to define cli commands."""
 
-# ruff: noqa: FBT001 FBT002 B006 UP007
+# ruff: noqa: FBT001 FBT002 B006 UP007 PLC0415
+# Services are imported inside each command so that a command only pays
+# the import cost of what it uses, `spm run` must not load copier.
 from __future__ import annotations
 
-import importlib.metadata
+import os
+from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
-from typing import Annotated, Optional
+from typing import Annotated, Literal, Optional
 
 import typer
 from rich import print as rprint
-from rich.progress import Progress, SpinnerColumn, TextColumn
-
-from pspm.services.bootstrap import (
-    bootstrap_project,
-)
-from pspm.services.dependencies import (
-    change_version,
-    get_version,
-    lock_dependencies,
-    manage_dependency,
-    sync_dependencies,
-)
-from pspm.services.run import run_command
-from pspm.utils.printing import print_file_tree
 
 app = typer.Typer(no_args_is_help=True, invoke_without_command=True)
 
 
 def _version_callback(value: bool) -> None:
     if value:
+        import importlib.metadata
+
         version = importlib.metadata.version("pspm")
         rprint(version)
 
 
 @app.callback()
-def callback(
-    version: Annotated[
+def callback(  # noqa: PLR0913, PLR0917
+    ctx: typer.Context,
+    version: Annotated[  # noqa: ARG001
         Optional[bool],
         typer.Option("--version", callback=_version_callback, is_eager=True),
     ] = None,
+    verbose: Annotated[
+        bool,
+        typer.Option(
+            "--verbose",
+            "-v",
+            help="Report how many subprocesses the command spawned",
+        ),
+    ] = False,
+    directories: Annotated[
+        Optional[list[Path]],
+        typer.Option(
+            "--directory",
+            "-C",
+            file_okay=False,
+            exists=True,
+            help="Run as if spm was started in this directory, "
+            "repeat to run lock or sync in many projects",
+            show_default=False,
+        ),
+    ] = None,
+    all_projects: Annotated[
+        bool,
+        typer.Option(
+            "--all",
+            help="Run lock or sync in every workspace member, or in every "
+            "project found in current directory",
+        ),
+    ] = False,
+    processes: Annotated[
+        Optional[int],
+        typer.Option(
+            "--processes",
+            "-p",
+            min=1,
+            help="Maximum number of projects to run at the same time "
+            "(defaults to the number of CPUs)",
+            show_default=False,
+        ),
+    ] = None,
 ) -> None:
     """Python simple package manager."""
+    if verbose:
+        ctx.call_on_close(_report_spawn_count)
+    if len(directories or []) > 1 or all_projects:
+        ctx.obj = _get_batch_options(
+            ctx,
+            directories or [],
+            all_projects=all_projects,
+            processes=processes,
+        )
+    elif directories:
+        os.chdir(directories[0])
+
+
+@dataclass
+class BatchOptions:
+    """Projects to run a command in."""
+
+    projects: list[Path]
+    processes: int | None = None
+
+
+def _get_batch_options(
+    ctx: typer.Context,
+    directories: list[Path],
+    *,
+    all_projects: bool,
+    processes: int | None,
+) -> BatchOptions:
+    """Find projects to run a command in.
+
+    Returns:
+        Projects and how many of them run at the same time
+
+    Raises:
+        Exit: If command can't run in many projects
+    """
+    from pspm.services.batch import find_projects
+    from pspm.utils.printing import print_error
+
+    if ctx.invoked_subcommand not in {"lock", "sync"}:
+        print_error("Only lock and sync can run in many projects")
+        raise typer.Exit(1)
+    projects = find_projects(directories, all_projects=all_projects)
+    if not projects:
+        print_error("No projects found")
+        raise typer.Exit(1)
+    return BatchOptions(projects, processes)
+
+
+def _run_batch(
+    ctx: typer.Context,
+    command: Literal["lock", "sync"],
+    **options: bool | int | list[str] | None,
+) -> None:
+    from pspm.services.batch import run_in_projects
+    from pspm.utils.printing import print_error
+
+    batch: BatchOptions = ctx.obj
+    failed = run_in_projects(
+        command, batch.projects, processes=batch.processes, **options
+    )
+    if failed:
+        print_error(
+            f"Failed to {command} {len(failed)} of {len(batch.projects)} "
+            f"projects: {', '.join(str(p) for p in failed)}"
+        )
+        raise typer.Exit(1)
+    action = "Locked" if command == "lock" else "Synced"
+    rprint(f"\n:sparkles: {action} {len(batch.projects)} projects")
+
+
+def _report_spawn_count() -> None:
+    from pspm.entities.command_runner import CommandRunner
+
+    rprint(
+        f"[dim]:gear: Spawned {CommandRunner.spawn_count} subprocesses[/dim]"
+    )
+
+
+OnlyOption = Annotated[
+    Optional[list[str]],
+    typer.Option(
+        "--only",
+        help="Only sync these groups, `main` to sync no extra group",
+        show_default=False,
+    ),
+]
+WithoutOption = Annotated[
+    Optional[list[str]],
+    typer.Option(
+        "--without",
+        help="Do not sync these groups",
+        show_default=False,
+    ),
+]
 
 
 @app.command()
-def sync() -> None:
+def sync(
+    ctx: typer.Context,
+    force: Annotated[
+        bool,
+        typer.Option(help="Whether to sync even if already up to date"),
+    ] = False,
+    envs: Annotated[
+        Optional[list[str]],
+        typer.Option(
+            "--env",
+            "-e",
+            help="Named environment to sync, repeat to sync many at once",
+            show_default=False,
+        ),
+    ] = None,
+    only: OnlyOption = None,
+    without: WithoutOption = None,
+) -> None:
     """Sync environment with all dependencies and the package itself."""
+    if ctx.obj:
+        _run_batch(
+            ctx, "sync", force=force, envs=envs, only=only, without=without
+        )
+        return
+    from pspm.services.dependencies import sync_dependencies
+
     rprint(":hourglass: Installing [blue]project[/blue] and dependencies")
-    sync_dependencies()
+    if not sync_dependencies(
+        force=force, envs=envs, only=only, without=without
+    ):
+        rprint(":sparkles: Environment is already up to date")
+        return
     rprint("\n:sparkles: Installed [blue]project[/blue] and dependencies")
 
 
 @app.command()
 def add(
-    package: Annotated[str, typer.Argument(help="Package to add")],
+    packages: Annotated[list[str], typer.Argument(help="Packages to add")],
     group: Annotated[
         Optional[str],
         typer.Option(
@@ -63,15 +217,19 @@ def add(
             help="Target dependency group to add into",
         ),
     ] = None,
+    only: OnlyOption = None,
+    without: WithoutOption = None,
 ) -> None:
-    """Add package to pyproject, install it and lock version."""
-    manage_dependency("add", package, group)
-    rprint(f"\n:sparkles: Added package [blue]{package}[/blue]")
+    """Add packages to pyproject, install them and lock versions."""
+    from pspm.services.dependencies import manage_dependencies
+
+    manage_dependencies("add", packages, group, only=only, without=without)
+    rprint(f"\n:sparkles: Added {_format_packages(packages)}")
 
 
 @app.command()
 def remove(
-    package: Annotated[str, typer.Argument(help="Package to remove")],
+    packages: Annotated[list[str], typer.Argument(help="Packages to remove")],
     group: Annotated[
         Optional[str],
         typer.Option(
@@ -80,10 +238,21 @@ def remove(
             help="Target dependency group to remove from",
         ),
     ] = None,
+    only: OnlyOption = None,
+    without: WithoutOption = None,
 ) -> None:
-    """Remove package from pyproject, uninstall it and lock version."""
-    manage_dependency("remove", package, group or None)
-    rprint(f"\n:boom: Removed package [blue]{package}[/blue]")
+    """Remove packages from pyproject, uninstall them and lock versions."""
+    from pspm.services.dependencies import manage_dependencies
+
+    manage_dependencies(
+        "remove", packages, group or None, only=only, without=without
+    )
+    rprint(f"\n:boom: Removed {_format_packages(packages)}")
+
+
+def _format_packages(packages: list[str]) -> str:
+    names = ", ".join(f"[blue]{p}[/blue]" for p in packages)
+    return f"package{'s' if len(packages) > 1 else ''} {names}"
 
 
 @app.command(
@@ -95,20 +264,70 @@ def remove(
 def run(
     command: str,
     arguments: Annotated[Optional[list[str]], typer.Argument()] = None,
+    exec_: Annotated[
+        Optional[bool],
+        typer.Option(
+            "--exec/--no-exec",
+            help="Whether to replace spm process with the command "
+            "(defaults to true on POSIX systems)",
+        ),
+    ] = None,
+    profile: Annotated[
+        Optional[str],
+        typer.Option(
+            envvar="PSPM_PROFILE",
+            help="Profile whose .env.<profile> file is loaded",
+        ),
+    ] = None,
+    env: Annotated[
+        Optional[str],
+        typer.Option(
+            "--env",
+            "-e",
+            help="Named environment to run command in",
+            show_default=False,
+        ),
+    ] = None,
 ) -> None:
     """Run a command installed in virtual env."""
-    run_command(command, arguments or [])
+    from pspm.services.run import run_command
+
+    run_command(
+        command,
+        arguments or [],
+        replace_process=exec_,
+        profile=profile,
+        env=env,
+    )
+
+
+JobsOption = Annotated[
+    int,
+    typer.Option(
+        "--jobs",
+        "-j",
+        min=1,
+        help="Maximum number of groups to resolve at the same time",
+    ),
+]
 
 
 @app.command()
 def lock(
+    ctx: typer.Context,
     update: Annotated[
         bool,
         typer.Option(help="Whether to update dependencies to latest version"),
     ] = False,
+    jobs: JobsOption = 1,
 ) -> None:
     """Lock the dependencies without installing."""
-    lock_dependencies(update=update)
+    if ctx.obj:
+        _run_batch(ctx, "lock", update=update, jobs=jobs)
+        return
+    from pspm.services.dependencies import lock_dependencies
+
+    lock_dependencies(update=update, jobs=jobs)
     rprint(":lock: Locked dependencies")
     rprint(
         "   :arrow_right_hook: Run `[blue]spm sync[/blue]` to install them",
@@ -116,11 +335,117 @@ def lock(
 
 
 @app.command()
-def upgrade() -> None:
+def upgrade(
+    packages: Annotated[
+        Optional[list[str]],
+        typer.Argument(
+            help="Packages to upgrade, all dependencies if none given",
+            show_default=False,
+        ),
+    ] = None,
+    jobs: JobsOption = 1,
+) -> None:
     """Upgrade dependencies to latest version."""
-    lock_dependencies(update=True)
-    sync_dependencies()
-    rprint("\n:sparkles: Upgraded dependencies")
+    from pspm.services.dependencies import upgrade_dependencies
+
+    upgrade_dependencies(packages, jobs=jobs)
+    if packages:
+        rprint(f"\n:sparkles: Upgraded {_format_packages(packages)}")
+    else:
+        rprint("\n:sparkles: Upgraded dependencies")
+
+
+@app.command()
+def export(  # noqa: PLR0913, PLR0917
+    output: Annotated[
+        Path,
+        typer.Option(
+            "--output",
+            "-o",
+            dir_okay=False,
+            help="Requirements file to write",
+        ),
+    ] = Path("requirements.txt"),
+    env: Annotated[
+        Optional[str],
+        typer.Option(
+            "--env",
+            "-e",
+            help="Named environment whose groups are exported",
+            show_default=False,
+        ),
+    ] = None,
+    only: Annotated[
+        Optional[list[str]],
+        typer.Option(
+            "--only",
+            help="Only export these groups, `main` to export no extra group",
+            show_default=False,
+        ),
+    ] = None,
+    without: Annotated[
+        Optional[list[str]],
+        typer.Option(
+            "--without",
+            help="Do not export these groups",
+            show_default=False,
+        ),
+    ] = None,
+    editable: Annotated[
+        bool,
+        typer.Option(
+            help="Whether to export local projects as editable requirements",
+        ),
+    ] = True,
+    project: Annotated[
+        bool,
+        typer.Option(
+            help="Whether to export local projects, only their dependencies "
+            "otherwise",
+        ),
+    ] = True,
+) -> None:
+    """Export locked dependencies to a single requirements file."""
+    from pspm.services.dependencies import export_dependencies
+
+    if not export_dependencies(
+        str(output),
+        env=env,
+        only=only,
+        without=without,
+        editable=editable,
+        project=project,
+    ):
+        rprint(f":sparkles: [blue]{output}[/blue] is already up to date")
+        return
+    rprint(f":package: Exported dependencies to [blue]{output}[/blue]")
+
+
+@app.command()
+def why(
+    package: Annotated[str, typer.Argument(help="Package to explain")],
+) -> None:
+    """Show why a package is locked."""
+    from pspm.services.dependencies import why_dependency
+
+    why_dependency(package)
+
+
+@app.command()
+def tree(
+    group: Annotated[
+        Optional[str],
+        typer.Option(
+            "--group",
+            "-g",
+            help="Dependency group to show tree for",
+        ),
+    ] = None,
+) -> None:
+    """Show tree of locked dependencies."""
+    from pspm.services.dependencies import show_dependency_tree
+
+    show_dependency_tree(group)
 
 
 class BumpRules(str, Enum):  # noqa: D101
@@ -140,6 +465,8 @@ def version(
     ] = None,
 ) -> None:
     """Checks or update project version."""
+    from pspm.services.dependencies import change_version, get_version
+
     if new_version:
         version = change_version(new_version)
     elif bump:
@@ -178,6 +505,11 @@ def init(
     ] = ProjectTypes.lib,
 ) -> None:
     """Create initial project structure."""
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+
+    from pspm.services.bootstrap import bootstrap_project
+    from pspm.utils.printing import print_file_tree
+
     with Progress(
         SpinnerColumn(style="blue"),
         TextColumn("[progress.description]{task.description}"),
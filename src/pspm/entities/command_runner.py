@@ -3,7 +3,11 @@
 from __future__ import annotations
 
 import abc
+import os
 import subprocess
+import sys
+import threading
+from typing import ClassVar, NoReturn
 
 
 class BaseCommandRunner(abc.ABC):
@@ -11,28 +15,88 @@ class BaseCommandRunner(abc.ABC):
 
     @staticmethod
     @abc.abstractmethod
-    def run(command: str, args: list[str] | None = None) -> int:
+    def run(
+        command: str,
+        args: list[str] | None = None,
+        env: dict[str, str] | None = None,
+    ) -> int:
         """Run a command.
 
         Args:
             command: Command to be executed
             args: Arguments to be passed to command
+            env: Environment variables, defaults to current environment
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    @abc.abstractmethod
+    def execute(
+        command: str,
+        args: list[str] | None = None,
+        env: dict[str, str] | None = None,
+    ) -> NoReturn:
+        """Replace current process with a command.
+
+        Args:
+            command: Command to be executed
+            args: Arguments to be passed to command
+            env: Environment variables, defaults to current environment
         """
         raise NotImplementedError
 
 
 class CommandRunner(BaseCommandRunner):
-    """Runs commands."""
+    """Runs commands.
+
+    Attributes:
+        spawn_count: Number of subprocesses spawned
+    """
+
+    spawn_count: ClassVar[int] = 0
+    # Commands run from many threads when compiling groups concurrently
+    _spawn_count_lock: ClassVar[threading.Lock] = threading.Lock()
 
     @staticmethod
-    def run(command: str, args: list[str] | None = None) -> int:
+    def run(
+        command: str,
+        args: list[str] | None = None,
+        env: dict[str, str] | None = None,
+    ) -> int:
         """Run a command.
 
         Args:
             command: Command to be executed
             args: Arguments to be pased to command
+            env: Environment variables, defaults to current environment
 
         Returns:
             Return code from command
         """
-        return subprocess.call([command, *(args or [])], shell=False)
+        with CommandRunner._spawn_count_lock:
+            CommandRunner.spawn_count += 1
+        return subprocess.call([command, *(args or [])], shell=False, env=env)
+
+    @staticmethod
+    def execute(
+        command: str,
+        args: list[str] | None = None,
+        env: dict[str, str] | None = None,
+    ) -> NoReturn:
+        """Replace current process with a command.
+
+        The command keeps the current process id, so its exit status and
+        signals are seen directly by the caller of pspm.
+
+        Args:
+            command: Command to be executed
+            args: Arguments to be pased to command
+            env: Environment variables, defaults to current environment
+        """
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.execve(  # noqa: S606
+            command,
+            [command, *(args or [])],
+            os.environ if env is None else env,
+        )
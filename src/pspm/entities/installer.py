@@ -3,9 +3,15 @@
 from __future__ import annotations
 
 import abc
+import tempfile
+from pathlib import Path
 from typing import TYPE_CHECKING
 
-from pspm.errors.dependencies import InstallError, SyncError
+from pspm.errors.dependencies import (
+    InstallError,
+    SyncError,
+    UninstallError,
+)
 from pspm.utils.bin_path import get_uv_path
 
 if TYPE_CHECKING:
@@ -35,7 +41,29 @@ class BaseInstaller(abc.ABC):
         raise NotImplementedError
 
     @abc.abstractmethod
-    def sync(self, requirements_files: list[str]) -> None:
+    def update(
+        self,
+        install: list[str],
+        uninstall: list[str],
+        *,
+        editables: list[str] | None = None,
+    ) -> None:
+        """Install and uninstall exactly the given packages.
+
+        Args:
+            install: Pinned requirements to install, without dependencies
+            uninstall: Packages to uninstall
+            editables: Local packages to install in editable mode
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def sync(
+        self,
+        requirements_files: list[str],
+        *,
+        editables: list[str] | None = None,
+    ) -> None:
         """Sync an environment with requirements files.
 
         Install all dependencies listed in requirements files
@@ -43,6 +71,7 @@ class BaseInstaller(abc.ABC):
 
         Args:
             requirements_files: Path to files containing requirements
+            editables: Local packages to install in editable mode
         """
         raise NotImplementedError
 
@@ -50,10 +79,28 @@ class BaseInstaller(abc.ABC):
 class UVInstaller(BaseInstaller):
     """Install packages with UV."""
 
-    def __init__(self, command_runner: BaseCommandRunner) -> None:
-        """Initialize UV Installer."""
+    def __init__(
+        self,
+        command_runner: BaseCommandRunner,
+        venv_path: Path | None = None,
+    ) -> None:
+        """Initialize UV Installer.
+
+        Args:
+            command_runner: Command Runner
+            venv_path: Virtualenv to install into, found by uv if None
+        """
         self._uv_path = get_uv_path()
         self._command_runner = command_runner
+        self._venv_path = venv_path
+
+    def _pip(self, command: str, *args: str) -> list[str]:
+        python = (
+            ["--python", str(self._venv_path.absolute())]
+            if self._venv_path
+            else []
+        )
+        return ["pip", command, *python, *args]
 
     def install(self, package: str, *, editable: bool = False) -> None:
         """Install a package.
@@ -65,12 +112,9 @@ class UVInstaller(BaseInstaller):
         Raises:
             InstallError: If can't install package.
         """
-        args = [
-            "pip",
-            "install",
-            *(["--editable"] if editable else []),
-            package,
-        ]
+        args = self._pip(
+            "install", *(["--editable"] if editable else []), package
+        )
         retcode = self._command_runner.run(self._uv_path, args)
         if retcode != 0:
             raise InstallError(package)
@@ -80,26 +124,99 @@ class UVInstaller(BaseInstaller):
 
         Args:
             package: Package to uninstall
+
+        Raises:
+            UninstallError: If can't uninstall package.
         """
-        raise NotImplementedError
+        args = self._pip("uninstall", package)
+        retcode = self._command_runner.run(self._uv_path, args)
+        if retcode != 0:
+            raise UninstallError(package)
 
-    def sync(self, requirements_files: list[str]) -> None:
+    def update(
+        self,
+        install: list[str],
+        uninstall: list[str],
+        *,
+        editables: list[str] | None = None,
+    ) -> None:
+        """Install and uninstall exactly the given packages.
+
+        Packages are installed from a single requirements file without
+        resolving dependencies, since they come from lock files.
+
+        Args:
+            install: Pinned requirements to install, without dependencies
+            uninstall: Packages to uninstall
+            editables: Local packages to install in editable mode
+
+        Raises:
+            UninstallError: If can't uninstall packages
+            SyncError: If can't install packages
+        """
+        if uninstall:
+            args = self._pip("uninstall", *uninstall)
+            retcode = self._command_runner.run(self._uv_path, args)
+            if retcode != 0:
+                raise UninstallError(", ".join(uninstall))
+        lines = [
+            *install,
+            *(f"-e {Path(e).absolute()}" for e in editables or []),
+        ]
+        if not lines:
+            return
+        requirements_file = _write_requirements_file(lines)
+        try:
+            retcode = self._command_runner.run(
+                self._uv_path,
+                self._pip("install", "--no-deps", "-r", requirements_file),
+            )
+        finally:
+            Path(requirements_file).unlink()
+        if retcode != 0:
+            raise SyncError
+
+    def sync(
+        self,
+        requirements_files: list[str],
+        *,
+        editables: list[str] | None = None,
+    ) -> None:
         """Sync an environment with requirements files.
 
         Install all dependencies listed in requirements files
-        and removes the ones that are not listed.
+        and removes the ones that are not listed. Editable packages
+        are installed by the same uv invocation.
 
         Args:
             requirements_files: Path to files containing requirements
+            editables: Local packages to install in editable mode
 
         Raises:
             SyncError: If cant sync dependencies
         """
-        args = [
-            "pip",
+        editables_file = None
+        if editables:
+            editables_file = _write_requirements_file([
+                f"-e {Path(e).absolute()}" for e in editables
+            ])
+        args = self._pip(
             "sync",
             *requirements_files,
-        ]
-        retcode = self._command_runner.run(self._uv_path, args)
+            *([editables_file] if editables_file else []),
+        )
+        try:
+            retcode = self._command_runner.run(self._uv_path, args)
+        finally:
+            if editables_file:
+                Path(editables_file).unlink()
         if retcode != 0:
             raise SyncError
+
+
+def _write_requirements_file(lines: list[str]) -> str:
+    with tempfile.NamedTemporaryFile(
+        "w", encoding="utf-8", suffix=".txt", delete=False
+    ) as f:
+        f.writelines(f"{line}\n" for line in lines)
+    return f.name
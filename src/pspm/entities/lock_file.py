@@ -0,0 +1,524 @@
+"""Module to read lock files produced by the resolver."""
+
+from __future__ import annotations
+
+import re
+import sys
+from collections import deque
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import TYPE_CHECKING
+from urllib.parse import unquote, urlsplit
+from urllib.request import url2pathname
+
+if sys.version_info >= (3, 11):
+    import tomllib
+else:
+    import tomli as tomllib
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+_NAME_PATTERN = re.compile(r"^([A-Za-z0-9][A-Za-z0-9._-]*)")
+_NORMALIZE_PATTERN = re.compile(r"[-_.]+")
+_VERSION_PATTERN = re.compile(
+    r"^v?(?:(\d+)!)?(\d+(?:\.\d+)*)"
+    r"(?:[-_.]?(a|b|c|rc|alpha|beta|pre|preview)[-_.]?(\d*))?"
+    r"(?:[-_.]?(?:post|rev|r)[-_.]?(\d*))?"
+    r"(?:[-_.]?dev[-_.]?(\d*))?",
+    re.IGNORECASE,
+)
+_PRE_RELEASES = {"a": 0, "alpha": 0, "b": 1, "beta": 1}
+
+# Epoch, release, pre-release, post-release and dev-release
+_VersionKey = tuple[int, tuple[int, ...], tuple[int, int], int, int]
+
+
+def normalize_name(name: str) -> str:
+    """Normalize a package name as in PEP 503.
+
+    Args:
+        name: Package name
+
+    Returns:
+        Normalized package name
+    """
+    name = name.lower()
+    if "_" in name or "." in name or "--" in name:
+        return _NORMALIZE_PATTERN.sub("-", name)
+    return name
+
+
+@dataclass
+class LockedPackage:
+    """Package pinned in a lock file.
+
+    Attributes:
+        name: Normalized package name
+        requirement: Requirement as written in the lock file
+        version: Pinned version, None for direct references
+        hashes: Allowed hashes of the package distributions
+        markers: Environment markers
+        via: Reasons the package was locked, as listed in the lock file
+        editable: Whether the package is installed in editable mode
+        groups: Groups whose lock file pins the package, None for main
+    """
+
+    name: str
+    requirement: str
+    version: str | None = None
+    hashes: list[str] = field(default_factory=list)
+    markers: str | None = None
+    via: list[str] = field(default_factory=list)
+    editable: bool = False
+    groups: list[str | None] = field(default_factory=list)
+
+    @property
+    def line(self) -> str:
+        """Requirement line to install exactly this package."""
+        parts = [
+            f"-e {self.requirement}" if self.editable else self.requirement
+        ]
+        if self.markers:
+            parts.append(f"; {self.markers}")
+        parts.extend(f"--hash={h}" for h in self.hashes)
+        return " ".join(parts)
+
+
+@dataclass
+class LockDiff:
+    """Changes between two versions of locked packages.
+
+    Attributes:
+        added: Packages that were not locked before
+        removed: Packages that are no longer locked
+        upgraded: Pairs of old and new packages locked at a newer version
+        downgraded: Pairs of old and new packages locked at an older version
+        changed: Pairs of old and new packages locked from another source
+    """
+
+    added: list[LockedPackage] = field(default_factory=list)
+    removed: list[LockedPackage] = field(default_factory=list)
+    upgraded: list[tuple[LockedPackage, LockedPackage]] = field(
+        default_factory=list
+    )
+    downgraded: list[tuple[LockedPackage, LockedPackage]] = field(
+        default_factory=list
+    )
+    changed: list[tuple[LockedPackage, LockedPackage]] = field(
+        default_factory=list
+    )
+
+    def __bool__(self) -> bool:
+        """Check if anything changed.
+
+        Returns:
+            Whether any package changed
+        """
+        return bool(
+            self.added
+            or self.removed
+            or self.upgraded
+            or self.downgraded
+            or self.changed
+        )
+
+    @property
+    def to_install(self) -> list[LockedPackage]:
+        """Packages that must be installed to apply changes."""
+        return [
+            *self.added,
+            *(new for _, new in self.upgraded),
+            *(new for _, new in self.downgraded),
+            *(new for _, new in self.changed),
+        ]
+
+    @property
+    def to_uninstall(self) -> list[LockedPackage]:
+        """Packages that must be uninstalled to apply changes."""
+        return list(self.removed)
+
+
+class LockGraph:
+    """Dependency graph of locked packages indexed by name."""
+
+    def __init__(self) -> None:
+        """Initialize LockGraph."""
+        self._packages: dict[str, LockedPackage] = {}
+        self._dependents: dict[str, set[str]] = {}
+        self._dependencies: dict[str, set[str]] = {}
+        self._roots: dict[str | None, set[str]] = {}
+        self._conflicts: dict[str, dict[str | None, str]] = {}
+
+    def add(self, package: LockedPackage, group: str | None = None) -> None:
+        """Add package and its `via` edges to graph.
+
+        A package already in the graph, locked by another group, is merged
+        with the existing one. If the group pins it differently, the
+        existing pin is kept and the conflict recorded.
+
+        Args:
+            package: Locked package
+            group: Group whose lock file pins the package, None for main
+        """
+        existing = self._packages.get(package.name)
+        if existing is None:
+            self._packages[package.name] = package
+        else:
+            existing.via.extend(
+                r for r in package.via if r not in existing.via
+            )
+            if _pin(existing) == _pin(package):
+                existing.hashes.extend(
+                    h for h in package.hashes if h not in existing.hashes
+                )
+            else:
+                pins = self._conflicts.setdefault(
+                    package.name,
+                    dict.fromkeys(existing.groups, _pin(existing)),
+                )
+                pins[group] = _pin(package)
+            package = existing
+        if group not in package.groups:
+            package.groups.append(group)
+        for reason in package.via:
+            if reason.startswith("-c "):
+                continue
+            if reason.startswith("-r ") or reason.endswith(")"):
+                self._roots.setdefault(group, set()).add(package.name)
+                continue
+            parent = normalize_name(reason)
+            self._dependents.setdefault(package.name, set()).add(parent)
+            self._dependencies.setdefault(parent, set()).add(package.name)
+
+    def conflicts(self) -> dict[str, dict[str | None, str]]:
+        """Retrieve packages pinned differently by the lock files of groups.
+
+        Returns:
+            Mapping of package name to its pin in each group, None for main
+        """
+        return {name: dict(pins) for name, pins in self._conflicts.items()}
+
+    def get(self, name: str) -> LockedPackage | None:
+        """Retrieve a package by name.
+
+        Args:
+            name: Package name, normalized or not
+
+        Returns:
+            Locked package, if present
+        """
+        return self._packages.get(normalize_name(name))
+
+    def dependents(self, name: str) -> set[str]:
+        """Retrieve packages that require a package.
+
+        Args:
+            name: Package name
+
+        Returns:
+            Names of packages that require it
+        """
+        return self._dependents.get(normalize_name(name), set())
+
+    def dependencies(self, name: str) -> set[str]:
+        """Retrieve packages required by a package.
+
+        Args:
+            name: Package name
+
+        Returns:
+            Names of packages it requires
+        """
+        return self._dependencies.get(normalize_name(name), set())
+
+    @property
+    def roots(self) -> set[str]:
+        """Names of packages required directly by the project."""
+        return set().union(*self._roots.values())
+
+    def get_roots(self, group: str | None = None) -> set[str]:
+        """Retrieve packages required directly by the project in a group.
+
+        Args:
+            group: Group to retrieve roots from, None for main
+
+        Returns:
+            Names of packages required directly by the project
+        """
+        return self._roots.get(group, set())
+
+    def find_paths(self, name: str) -> list[list[str]]:
+        """Find why a package is locked.
+
+        Walks reverse edges from the package until reaching packages
+        required directly by the project, only visiting its ancestors.
+
+        Args:
+            name: Package name
+
+        Returns:
+            Shortest path from each root to the package
+        """
+        target = normalize_name(name)
+        if target not in self._packages:
+            return []
+        roots = self.roots
+        parents: dict[str, str | None] = {target: None}
+        queue = deque([target])
+        paths: list[list[str]] = []
+        while queue:
+            current = queue.popleft()
+            if current in roots:
+                path = [current]
+                while (parent := parents[path[-1]]) is not None:
+                    path.append(parent)
+                paths.append(path)
+            for dependent in sorted(self.dependents(current)):
+                if dependent not in parents:
+                    parents[dependent] = current
+                    queue.append(dependent)
+        return paths
+
+    def __contains__(self, name: object) -> bool:
+        """Check if a package is locked.
+
+        Returns:
+            Whether the package is locked
+        """
+        return isinstance(name, str) and normalize_name(name) in self._packages
+
+    def __iter__(self) -> Iterator[LockedPackage]:
+        """Iterate over locked packages.
+
+        Returns:
+            Iterator of locked packages
+        """
+        return iter(self._packages.values())
+
+    def __len__(self) -> int:
+        """Count locked packages.
+
+        Returns:
+            Number of locked packages
+        """
+        return len(self._packages)
+
+
+def parse_lock(
+    lines: Iterable[str],
+    graph: LockGraph | None = None,
+    group: str | None = None,
+) -> LockGraph:
+    """Parse lock file lines into a dependency graph.
+
+    Args:
+        lines: Lines of a lock file in pip requirements format
+        graph: Graph to add packages to, a new one by default
+        group: Group whose lock file is parsed, None for main
+
+    Returns:
+        Dependency graph of locked packages
+    """
+    graph = graph if graph is not None else LockGraph()
+    package: LockedPackage | None = None
+    in_via = False
+    continuation = False
+    for raw_line in lines:
+        line = raw_line.strip()
+        if not line:
+            continue
+        if continuation:
+            continuation = line[-1] == "\\"
+            if package is not None:
+                _parse_options(package, line.rstrip("\\"))
+        elif line[0] == "#":
+            if package is not None:
+                in_via = _parse_comment(package, line, in_via=in_via)
+        else:
+            in_via = False
+            continuation = line[-1] == "\\"
+            if package is not None:
+                graph.add(package, group)
+            if continuation:
+                line = line[:-1].rstrip()
+            package = _parse_requirement(line)
+    if package is not None:
+        graph.add(package, group)
+    return graph
+
+
+def load_lock_file(path: str | Path) -> LockGraph:
+    """Stream and parse a lock file.
+
+    Args:
+        path: Path to lock file
+
+    Returns:
+        Dependency graph of locked packages
+    """
+    with Path(path).open(encoding="utf-8") as f:
+        return parse_lock(f)
+
+
+def load_lock_files(files: dict[str | None, str]) -> LockGraph:
+    """Stream and parse many lock files into a single graph.
+
+    Missing lock files are ignored.
+
+    Args:
+        files: Mapping of group, None for main, to its lock file path
+
+    Returns:
+        Dependency graph of packages locked by all files
+    """
+    graph = LockGraph()
+    for group, path in files.items():
+        if not Path(path).exists():
+            continue
+        with Path(path).open(encoding="utf-8") as f:
+            parse_lock(f, graph, group)
+    return graph
+
+
+def _pin(package: LockedPackage) -> str:
+    return replace(package, hashes=[]).line
+
+
+def diff_locks(old: LockGraph, new: LockGraph) -> LockDiff:
+    """Compare two lock graphs.
+
+    Args:
+        old: Previously locked packages
+        new: Currently locked packages
+
+    Returns:
+        Changes from old to new packages
+    """
+    diff = LockDiff()
+    for package in new:
+        previous = old.get(package.name)
+        if previous is None:
+            diff.added.append(package)
+        elif previous.version != package.version:
+            if package.version is None or previous.version is None:
+                diff.changed.append((previous, package))
+            elif compare_versions(package.version, previous.version) > 0:
+                diff.upgraded.append((previous, package))
+            else:
+                diff.downgraded.append((previous, package))
+        elif (previous.requirement, previous.markers, previous.editable) != (
+            package.requirement,
+            package.markers,
+            package.editable,
+        ):
+            diff.changed.append((previous, package))
+    diff.removed.extend(p for p in old if p.name not in new)
+    return diff
+
+
+def compare_versions(version: str, other: str) -> int:
+    """Compare two PEP 440 versions.
+
+    Local version labels are ignored and versions that can't be parsed
+    are compared as text.
+
+    Args:
+        version: Version to compare
+        other: Version to compare against
+
+    Returns:
+        Negative if version is older, positive if newer and zero if equal
+    """
+    key, other_key = _version_key(version), _version_key(other)
+    if key is None or other_key is None:
+        return (version > other) - (version < other)
+    return (key > other_key) - (key < other_key)
+
+
+def _version_key(version: str) -> _VersionKey | None:
+    match = _VERSION_PATTERN.match(version.strip())
+    if not match:
+        return None
+    epoch, release, pre_label, pre_number, post, dev = match.groups()
+    numbers = [int(n) for n in release.split(".")]
+    while len(numbers) > 1 and numbers[-1] == 0:
+        numbers.pop()
+    if pre_label is not None:
+        pre = (_PRE_RELEASES.get(pre_label.lower(), 2), int(pre_number or 0))
+    elif dev is not None and post is None:
+        pre = (-1, 0)
+    else:
+        pre = (3, 0)
+    return (
+        int(epoch or 0),
+        tuple(numbers),
+        pre,
+        -1 if post is None else int(post or 0),
+        1 << 32 if dev is None else int(dev or 0),
+    )
+
+
+def _parse_requirement(line: str) -> LockedPackage | None:
+    if line[0] == "-" and not line.startswith("-e "):
+        return None
+    requirement, *options = line.split(" --")
+    requirement, _, markers = requirement.partition(";")
+    requirement = requirement.strip()
+    editable = requirement.startswith("-e ")
+    if editable:
+        requirement = requirement[3:].strip()
+        name = _editable_name(requirement)
+    else:
+        match = _NAME_PATTERN.match(requirement)
+        if not match:
+            return None
+        name = match.group(1)
+    _, _, version = requirement.partition("==")
+    package = LockedPackage(
+        name=normalize_name(name),
+        requirement=requirement,
+        version=version.strip() or None,
+        markers=markers.strip() or None,
+        editable=editable,
+    )
+    for option in options:
+        _parse_options(package, f"--{option}")
+    return package
+
+
+def _parse_comment(package: LockedPackage, line: str, *, in_via: bool) -> bool:
+    if line.startswith("# via"):
+        reason = line[5:].strip()
+        if not reason:
+            return True
+        package.via.append(reason)
+    elif in_via:
+        package.via.append(line[1:].strip())
+        return True
+    return False
+
+
+def _editable_name(requirement: str) -> str:
+    egg = requirement.partition("#egg=")[2]
+    if egg:
+        return egg
+    name, separator, _ = requirement.partition(" @ ")
+    if separator:
+        return name
+    if requirement.startswith("file:"):
+        path = Path(url2pathname(unquote(urlsplit(requirement).path)))
+    else:
+        path = Path(requirement)
+    # Directory names often differ from project names, e.g. packages/a
+    try:
+        with (path / "pyproject.toml").open("rb") as f:
+            return str(tomllib.load(f)["project"]["name"])
+    except (OSError, tomllib.TOMLDecodeError, KeyError, TypeError):
+        return path.name
+
+
+def _parse_options(package: LockedPackage, line: str) -> None:
+    for option in line.split() if " " in line else (line,):
+        if option.startswith("--hash="):
+            package.hashes.append(option[7:])
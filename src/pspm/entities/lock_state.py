@@ -0,0 +1,95 @@
+"""Module to keep track of the inputs used to compile lock files."""
+
+from __future__ import annotations
+
+import abc
+import json
+from typing import TYPE_CHECKING
+
+from pspm.utils.files import (
+    STATE_DIRECTORY,
+    atomic_write,
+    ensure_state_directory,
+)
+from pspm.utils.hashing import hash_file
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class BaseLockState(abc.ABC):
+    """Record which resolver inputs produced each lock file."""
+
+    @abc.abstractmethod
+    def is_fresh(self, lock_file: str, inputs_hash: str) -> bool:
+        """Check if lock file was compiled from the given inputs.
+
+        Args:
+            lock_file: Lock file path
+            inputs_hash: Digest of the resolver inputs
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def record(self, lock_files: dict[str, str]) -> None:
+        """Record the inputs used to compile lock files.
+
+        Args:
+            lock_files: Mapping of lock file path to digest of its inputs
+        """
+        raise NotImplementedError
+
+
+class LockState(BaseLockState):
+    """Keep lock state in a JSON file inside the project cache directory."""
+
+    def __init__(self, path: Path | None = None) -> None:
+        """Initialize LockState.
+
+        Args:
+            path: Path to state file
+        """
+        self._path = path or STATE_DIRECTORY / "locks.json"
+        self._state: dict[str, dict[str, str | None]] | None = None
+
+    def _load(self) -> dict[str, dict[str, str | None]]:
+        if self._state is None:
+            try:
+                self._state = json.loads(self._path.read_text("utf-8"))
+            except (FileNotFoundError, ValueError):
+                self._state = {}
+        return self._state
+
+    def is_fresh(self, lock_file: str, inputs_hash: str) -> bool:
+        """Check if lock file was compiled from the given inputs.
+
+        The lock file itself must also be unchanged since it was recorded,
+        so manual edits or checkouts of other revisions are recompiled.
+
+        Args:
+            lock_file: Lock file path
+            inputs_hash: Digest of the resolver inputs
+
+        Returns:
+            Whether the lock file is up to date
+        """
+        entry = self._load().get(lock_file)
+        if not entry or entry.get("inputs") != inputs_hash:
+            return False
+        lock_hash = hash_file(lock_file)
+        return lock_hash is not None and entry.get("lock") == lock_hash
+
+    def record(self, lock_files: dict[str, str]) -> None:
+        """Record the inputs used to compile lock files.
+
+        Args:
+            lock_files: Mapping of lock file path to digest of its inputs
+        """
+        state = self._load()
+        for lock_file, inputs_hash in lock_files.items():
+            state[lock_file] = {
+                "inputs": inputs_hash,
+                "lock": hash_file(lock_file),
+            }
+        ensure_state_directory(self._path.parent)
+        atomic_write(self._path, json.dumps(state, indent=2).encode())
@@ -2,28 +2,53 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Literal
+import dataclasses
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Literal
 
-from rich.progress import Progress, SpinnerColumn, TextColumn
-
-from pspm.errors.dependencies import AddError, ResolveError
+from pspm.entities.lock_file import LockDiff, diff_locks, load_lock_files
+from pspm.errors.dependencies import (
+    AddError,
+    GroupNotFoundError,
+    HashedLocalProjectError,
+    LockConflictError,
+    LockFileNotFoundError,
+    NotLockedError,
+    ResolveError,
+)
+from pspm.utils.files import atomic_write, write_if_changed
+from pspm.utils.hashing import hash_data, hash_file
 
 if TYPE_CHECKING:
+    from rich.progress import Progress
+
     from pspm.entities.installer import BaseInstaller
+    from pspm.entities.lock_file import LockGraph
+    from pspm.entities.lock_state import BaseLockState
     from pspm.entities.pyproject import BasePyproject
     from pspm.entities.resolver import BaseResolver
+    from pspm.entities.venv_cache import BaseVenvCache
     from pspm.entities.virtual_env import BaseVirtualEnv
+    from pspm.entities.workspace import Workspace
 
 
 class PackageManager:
     """Manage project dependencies."""
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         pyproject: BasePyproject,
         installer: BaseInstaller,
         resolver: BaseResolver,
         virtual_env: BaseVirtualEnv,
+        lock_state: BaseLockState | None = None,
+        *,
+        workspace: Workspace | None = None,
+        venv_cache: BaseVenvCache | None = None,
+        groups: list[str] | None = None,
+        excluded_groups: list[str] | None = None,
     ) -> None:
         """Initialize PackageManager.
 
@@ -32,30 +57,270 @@ class PackageManager:
             installer: BaseInstaller to install depencies
             resolver: BaseResolver to resolve dependencies
             virtual_env: BaseVirtualEnv to manage venv
+            lock_state: BaseLockState to skip compiling unchanged lock files
+            workspace: Workspace to lock and sync its members together
+            venv_cache: BaseVenvCache to reuse virtualenvs synced before
+            groups: Extra groups synced into the environment, all groups
+                if None
+            excluded_groups: Extra groups not synced into the environment
         """
         self._pyproject = pyproject
         self._installer = installer
         self._resolver = resolver
         self._virtual_env = virtual_env
+        self._lock_state = lock_state
+        self._workspace = workspace
+        self._venv_cache = venv_cache
+        self._groups = groups
+        self._excluded_groups = excluded_groups or []
 
         self._main_requirements_file = "requirements.lock"
         self._group_requirements_file = "requirements-{}.lock"
 
+    def _get_extra_groups(self) -> list[str]:
+        if self._workspace:
+            return self._workspace.get_extra_groups()
+        return self._pyproject.get_extra_groups()
+
     def _get_group_requirements_files(self) -> list[str]:
-        groups = self._pyproject.get_extra_groups()
+        groups = self._get_extra_groups()
         return [self._group_requirements_file.format(g) for g in groups]
 
-    def sync(self) -> None:
-        """Sync environment with all dependencies and the package itself."""
+    def check_groups(self, groups: list[str]) -> None:
+        """Check groups are declared by the project.
+
+        Args:
+            groups: Extra groups to check
+
+        Raises:
+            GroupNotFoundError: If any of the groups is not declared
+        """
+        declared = self._get_extra_groups()
+        missing = [g for g in groups if g not in declared]
+        if missing:
+            raise GroupNotFoundError(missing)
+
+    def _get_synced_groups(self) -> list[str]:
+        groups = self._get_extra_groups()
+        selected = groups if self._groups is None else self._groups
+        self.check_groups([*selected, *self._excluded_groups])
+        return [
+            g
+            for g in groups
+            if g in selected and g not in self._excluded_groups
+        ]
+
+    def _get_synced_requirements_files(self) -> list[str]:
+        return [
+            self._main_requirements_file,
+            *(
+                self._group_requirements_file.format(g)
+                for g in self._get_synced_groups()
+            ),
+        ]
+
+    def get_lock_graph(self, groups: list[str] | None = None) -> LockGraph:
+        """Load lock files into a single dependency graph.
+
+        Args:
+            groups: Groups whose lock files are loaded besides the main
+                one, all groups if None
+
+        Returns:
+            Dependency graph of packages locked by the groups
+        """
+        if groups is None:
+            groups = self._get_extra_groups()
+        return load_lock_files({
+            None: self._main_requirements_file,
+            **{g: self._group_requirements_file.format(g) for g in groups},
+        })
+
+    def sync(self, *, force: bool = False) -> bool:
+        """Sync environment with all dependencies and the package itself.
+
+        Only the lock files of the groups selected for the environment
+        are synced. Syncing is skipped when the lock files and the project
+        itself did not change since the last successful sync. A new
+        environment is restored from the virtualenv cache when it has one
+        synced to the same state.
+
+        Args:
+            force: Whether to sync even if environment seems up to date
+
+        Returns:
+            Whether the environment was synced
+        """
+        requirements_files = self._get_synced_requirements_files()
+        fingerprint = hash_data(self._get_sync_state())
         if not self._virtual_env.already_created():
             self._virtual_env.create()
+            if self._venv_cache and self._venv_cache.restore(fingerprint):
+                return True
+        elif (
+            not force
+            and self._virtual_env.get_sync_fingerprint() == fingerprint
+        ):
+            return False
 
-        self._installer.sync([
-            self._main_requirements_file,
-            *self._get_group_requirements_files(),
-        ])
+        self._virtual_env.set_sync_fingerprint(None)
+        # Workspace lock files already list its projects as editables
+        installable = not self._workspace and self._pyproject.is_installable()
+        self._installer.sync(
+            requirements_files, editables=["."] if installable else None
+        )
+        self._virtual_env.set_sync_fingerprint(fingerprint)
+        if self._venv_cache:
+            self._venv_cache.store(fingerprint)
+        return True
+
+    def _get_sync_state(self) -> dict[str, Any]:
+        requirements_files = self._get_synced_requirements_files()
+        return {
+            "requirements": {f: hash_file(f) for f in requirements_files},
+            "editable": self._get_editables_hash(),
+        }
+
+    def _get_editables_hash(self) -> str | None:
+        if self._workspace:
+            return hash_data({
+                file: hash_file(file)
+                for file in [
+                    "pyproject.toml",
+                    *self._workspace.get_project_files(),
+                ]
+            })
         if self._pyproject.is_installable():
-            self._installer.install(".", editable=True)
+            return hash_file("pyproject.toml")
+        return None
+
+    def _is_synced(self, state: dict[str, Any]) -> bool:
+        return (
+            self._virtual_env.already_created()
+            and self._virtual_env.get_sync_fingerprint() == hash_data(state)
+        )
+
+    def _get_synced_lock_graph(self) -> LockGraph | None:
+        if self._groups is None and not self._excluded_groups:
+            return None
+        return self.get_lock_graph(self._get_synced_groups())
+
+    def _sync_changes(
+        self,
+        diff: LockDiff,
+        previous_state: dict[str, Any],
+        previous_graph: LockGraph | None = None,
+    ) -> None:
+        """Apply lock changes to an environment that was in sync.
+
+        Only changed packages are installed or uninstalled, falling back
+        to a full sync if environment was not in sync before the changes.
+        If the environment syncs only some groups, changes are taken from
+        their lock files, given their graph before the changes.
+        """
+        if previous_graph is not None:
+            diff = diff_locks(
+                previous_graph,
+                self.get_lock_graph(self._get_synced_groups()),
+            )
+        state = self._get_sync_state()
+        previous_editable = previous_state["editable"]
+        if not self._is_synced(previous_state) or (
+            previous_editable is not None and state["editable"] is None
+        ):
+            self.sync()
+            return
+        editable_changed = state["editable"] != previous_editable
+        if diff or editable_changed:
+            editables = (
+                self._workspace.get_editables() if self._workspace else ["."]
+            )
+            self._virtual_env.set_sync_fingerprint(None)
+            self._installer.update(
+                [p.line for p in diff.to_install],
+                [p.name for p in diff.to_uninstall],
+                editables=editables if editable_changed else None,
+            )
+        self._virtual_env.set_sync_fingerprint(hash_data(state))
+
+    def export(
+        self, output_file: str, *, editable: bool = True, project: bool = True
+    ) -> bool:
+        """Merge lock files of the selected groups into a requirements file.
+
+        Packages locked by many groups are written once, with the hashes
+        pinned by any of them. The digest of the requirements is written
+        next to them, in `sha256sum` format, to be used as a cache key.
+        Files are only written when their content changes.
+
+        Local projects have no hashes, so they can't be exported along
+        hashed requirements, which are installed in hash-checking mode.
+
+        Args:
+            output_file: Requirements file to write
+            editable: Whether local projects are exported as editable
+                requirements, as plain path requirements otherwise
+            project: Whether to export local projects, only their
+                dependencies otherwise
+
+        Returns:
+            Whether the requirements file changed
+
+        Raises:
+            LockFileNotFoundError: If selected lock files were not created
+            LockConflictError: If selected groups pin packages differently
+            HashedLocalProjectError: If local projects would be exported
+                along hashed requirements
+        """
+        groups = self._get_synced_groups()
+        lock_files = self._get_synced_requirements_files()
+        missing = [f for f in lock_files if not Path(f).exists()]
+        if missing:
+            raise LockFileNotFoundError(missing)
+        graph = self.get_lock_graph(groups)
+        conflicts = graph.conflicts()
+        if conflicts:
+            raise LockConflictError(conflicts)
+
+        packages = sorted(graph, key=lambda p: p.name)
+        # Workspace lock files already list its projects as editables
+        installable = not self._workspace and self._pyproject.is_installable()
+        local_projects = [
+            *(["."] if installable else []),
+            *(p.requirement for p in packages if p.editable),
+        ]
+        if project and local_projects and any(p.hashes for p in packages):
+            raise HashedLocalProjectError(local_projects)
+
+        lines = [
+            "# This file was exported by spm from the following lock files:",
+            *(f"#    {f}" for f in lock_files),
+        ]
+        for package in packages:
+            if package.editable and not project:
+                continue
+            requirement = dataclasses.replace(
+                package, hashes=[], editable=package.editable and editable
+            )
+            # One hash per line, as uv writes them in lock files
+            lines.append(
+                " \\\n    ".join([
+                    requirement.line,
+                    *(f"--hash={h}" for h in package.hashes),
+                ])
+            )
+        if project and installable:
+            lines.append("-e ." if editable else ".")
+        content = "".join(f"{line}\n" for line in lines).encode()
+
+        output_path = Path(output_file)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256(content).hexdigest()
+        write_if_changed(
+            output_path.with_name(f"{output_path.name}.sha256"),
+            f"{digest}  {output_path.name}\n".encode(),
+        )
+        return write_if_changed(output_path, content)
 
     def manage_dependency(
         self,
@@ -69,42 +334,283 @@ class PackageManager:
             action: Action to take can be either add or remove
             package: Package to install
             group: Group to insert package
+        """
+        self.manage_dependencies(action, [package], group)
+
+    def manage_dependencies(
+        self,
+        action: Literal["add", "remove"],
+        packages: list[str],
+        group: str | None = None,
+    ) -> LockDiff:
+        """Add or remove many dependencies with a single resolve and sync.
+
+        If added packages can't be resolved, pyproject and lock files
+        are restored to their previous state, removing the group and lock
+        files created for them. If environment was in sync, only the
+        packages whose lock changed are installed or uninstalled.
+
+        Args:
+            action: Action to take can be either add or remove
+            packages: Packages to manage
+            group: Group to insert packages
+
+        Returns:
+            Changes in locked packages
 
         Raises:
-            AddError: If can't add dependency
+            AddError: If can't add dependencies
         """
-        self._pyproject.manage_dependency(action, package, group)
+        previous_state = self._get_sync_state()
+        previous_graph = self._get_synced_lock_graph()
+        previous_dependencies = self._pyproject.get_dependencies(group)
+        new_group = (
+            group if group not in self._pyproject.get_extra_groups() else None
+        )
+        self._pyproject.manage_dependencies(action, packages, group)
+        # Read after editing pyproject to include lock files of new groups
+        previous_locks = self._read_requirements_files()
         try:
-            self.compile_requirements()
+            diff = self.compile_requirements()
         except ResolveError as e:
             if action == "add":
-                self._pyproject.manage_dependency("remove", package, group)
-                raise AddError(package) from e
-            return
-        self.sync()
+                if new_group:
+                    self._pyproject.remove_group(new_group)
+                else:
+                    self._pyproject.set_dependencies(
+                        previous_dependencies, group
+                    )
+                _restore_files(previous_locks)
+                raise AddError(packages) from e
+            return LockDiff()
+        self._sync_changes(diff, previous_state, previous_graph)
+        return diff
+
+    def upgrade_dependencies(
+        self, packages: list[str] | None = None, *, jobs: int = 1
+    ) -> LockDiff:
+        """Upgrade dependencies and sync environment.
+
+        Args:
+            packages: Packages to upgrade, all dependencies by default
+            jobs: Maximum number of groups to compile at the same time
+
+        Returns:
+            Changes in locked packages
+        """
+        previous_state = self._get_sync_state()
+        previous_graph = self._get_synced_lock_graph()
+        diff = self.compile_requirements(
+            upgrade=not packages, jobs=jobs, upgrade_packages=packages
+        )
+        self._sync_changes(diff, previous_state, previous_graph)
+        return diff
+
+    def _read_requirements_files(self) -> dict[str, bytes | None]:
+        files = [
+            self._main_requirements_file,
+            *self._get_group_requirements_files(),
+        ]
+        contents: dict[str, bytes | None] = {}
+        for file in files:
+            path = Path(file)
+            contents[file] = path.read_bytes() if path.exists() else None
+        return contents
 
-    def compile_requirements(self, *, upgrade: bool = False) -> None:
+    def compile_requirements(
+        self,
+        *,
+        upgrade: bool = False,
+        jobs: int = 1,
+        upgrade_packages: list[str] | None = None,
+    ) -> LockDiff:
         """Compile all requirements files.
 
+        The main requirements file is compiled first since every group
+        is constrained by it, then groups are compiled concurrently.
+        Lock files whose resolver inputs did not change since they were
+        last compiled are skipped, unless upgrading.
+
         Args:
             upgrade: Whether to upgrade package versions
+            jobs: Maximum number of groups to compile at the same time
+            upgrade_packages: Packages to upgrade, only lock files
+                containing them are compiled again
+
+        Returns:
+            Changes in locked packages
+
+        Raises:
+            ResolveError: If any of the requirements can't be resolved
         """
-        groups = self._pyproject.get_extra_groups()
+        from rich.progress import (  # noqa: PLC0415
+            Progress,
+            SpinnerColumn,
+            TextColumn,
+        )
+
+        groups = self._get_extra_groups()
+        previous_graph = self.get_lock_graph()
+        upgraded_groups = (
+            _find_locking_groups(previous_graph, upgrade_packages)
+            if upgrade_packages
+            else set()
+        )
+        compiled: dict[str, str] = {}
         with Progress(
             SpinnerColumn(style="blue"),
             TextColumn("[progress.description]{task.description}"),
             transient=True,
         ) as progress:
-            progress.add_task("Resolving dependencies...")
-            self._resolver.compile(
-                self._main_requirements_file, upgrade=upgrade
-            )
-            for file, group in zip(
-                self._get_group_requirements_files(), groups
+            main_hash = self._get_inputs_hash()
+            if (
+                upgrade
+                or None in upgraded_groups
+                or not self._is_fresh(self._main_requirements_file, main_hash)
             ):
+                main_task = progress.add_task("Resolving dependencies...")
                 self._resolver.compile(
-                    file,
-                    group,
-                    constraint_file=self._main_requirements_file,
+                    self._main_requirements_file,
+                    **self._get_resolver_inputs(),
                     upgrade=upgrade,
+                    upgrade_packages=(
+                        upgrade_packages if None in upgraded_groups else None
+                    ),
                 )
+                progress.remove_task(main_task)
+                compiled[self._main_requirements_file] = main_hash
+
+            groups_hashes = {
+                group: self._get_inputs_hash(group) for group in groups
+            }
+            stale_groups = [
+                group
+                for group in groups
+                if upgrade
+                or group in upgraded_groups
+                or not self._is_fresh(
+                    self._group_requirements_file.format(group),
+                    groups_hashes[group],
+                )
+            ]
+            failed_groups: list[str] = []
+            constraint_file = (
+                self._workspace.write_constraint_file(
+                    self._main_requirements_file
+                )
+                if self._workspace and stale_groups
+                else self._main_requirements_file
+            )
+            with ThreadPoolExecutor(max_workers=max(jobs, 1)) as executor:
+                futures = {
+                    executor.submit(
+                        self._compile_group,
+                        group,
+                        progress,
+                        constraint_file,
+                        upgrade=upgrade,
+                        upgrade_packages=(
+                            upgrade_packages
+                            if group in upgraded_groups
+                            else None
+                        ),
+                    ): group
+                    for group in stale_groups
+                }
+                for future in as_completed(futures):
+                    group = futures[future]
+                    error = future.exception()
+                    if isinstance(error, ResolveError):
+                        failed_groups.append(group)
+                    elif error is not None:
+                        raise error
+                    else:
+                        compiled[
+                            self._group_requirements_file.format(group)
+                        ] = groups_hashes[group]
+
+        if self._lock_state and compiled:
+            self._lock_state.record(compiled)
+        if failed_groups:
+            raise ResolveError([g for g in groups if g in failed_groups])
+        return diff_locks(previous_graph, self.get_lock_graph())
+
+    def _is_fresh(self, lock_file: str, inputs_hash: str) -> bool:
+        if not self._lock_state:
+            return False
+        return self._lock_state.is_fresh(lock_file, inputs_hash)
+
+    def _get_inputs_hash(self, group: str | None = None) -> str:
+        constraint_file = self._main_requirements_file if group else None
+        workspace_files = (
+            self._workspace.get_project_files() if self._workspace else []
+        )
+        return hash_data({
+            "dependencies": self._pyproject.get_dependencies(),
+            "group": group,
+            "group_dependencies": (
+                self._pyproject.get_dependencies(group) if group else []
+            ),
+            "requires_python": self._pyproject.requires_python,
+            "resolver": self._resolver.get_settings(),
+            "constraint_file": constraint_file,
+            "constraint_hash": (
+                hash_file(constraint_file) if constraint_file else None
+            ),
+            "workspace": {f: hash_file(f) for f in workspace_files},
+        })
+
+    def _get_resolver_inputs(self, group: str | None = None) -> dict[str, Any]:
+        if not self._workspace:
+            return {"group": group}
+        # Extras are part of the workspace input file
+        return {
+            "group": None,
+            "source_file": self._workspace.write_input_file(group),
+        }
+
+    def _compile_group(
+        self,
+        group: str,
+        progress: Progress,
+        constraint_file: str,
+        *,
+        upgrade: bool,
+        upgrade_packages: list[str] | None = None,
+    ) -> None:
+        task = progress.add_task(
+            f"Resolving [blue]{group}[/blue] dependencies..."
+        )
+        try:
+            self._resolver.compile(
+                self._group_requirements_file.format(group),
+                **self._get_resolver_inputs(group),
+                constraint_file=constraint_file,
+                upgrade=upgrade,
+                upgrade_packages=upgrade_packages,
+            )
+        finally:
+            progress.remove_task(task)
+
+
+def _restore_files(contents: dict[str, bytes | None]) -> None:
+    for file, content in contents.items():
+        path = Path(file)
+        if content is None:
+            path.unlink(missing_ok=True)
+        elif not path.exists() or path.read_bytes() != content:
+            atomic_write(path, content)
+
+
+def _find_locking_groups(
+    graph: LockGraph, packages: list[str]
+) -> set[str | None]:
+    missing = [p for p in packages if p not in graph]
+    if missing:
+        raise NotLockedError(missing)
+    groups: set[str | None] = set()
+    for package in packages:
+        locked_package = graph.get(package)
+        if locked_package is not None:
+            groups.update(locked_package.groups)
+    return groups
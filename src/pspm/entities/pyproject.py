@@ -17,7 +17,6 @@ class BasePyproject(abc.ABC):
         toml_parser: Parser to be used for parsing TOML
     """
 
-    @abc.abstractmethod
     def manage_dependency(
         self,
         action: Literal["add", "remove"],
@@ -31,6 +30,43 @@ class BasePyproject(abc.ABC):
             package: Package to manage
             group: Group that package belongs
         """
+        self.manage_dependencies(action, [package], group)
+
+    @abc.abstractmethod
+    def manage_dependencies(
+        self,
+        action: Literal["add", "remove"],
+        packages: list[str],
+        group: str | None = None,
+    ) -> None:
+        """Add or removes many dependencies from project at once.
+
+        Args:
+            action: Action to take can be either add or remove
+            packages: Packages to manage
+            group: Group that packages belong
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def set_dependencies(
+        self, dependencies: list[str], group: str | None = None
+    ) -> None:
+        """Replace dependencies of project or of an extra group.
+
+        Args:
+            dependencies: New list of dependencies
+            group: Group to replace dependencies from
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def remove_group(self, group: str) -> None:
+        """Remove an extra group and its dependencies, if it exists.
+
+        Args:
+            group: Group to remove
+        """
         raise NotImplementedError
 
     @abc.abstractmethod
@@ -38,6 +74,55 @@ class BasePyproject(abc.ABC):
         """Retrieve list of extra groups."""
         raise NotImplementedError
 
+    @abc.abstractmethod
+    def get_dependencies(self, group: str | None = None) -> list[str]:
+        """Retrieve dependencies of project or of an extra group.
+
+        Args:
+            group: Group to retrieve dependencies from
+        """
+        raise NotImplementedError
+
+    def get_workspace_members(self) -> list[str]:  # noqa: PLR6301
+        """Retrieve glob patterns of workspace member projects.
+
+        Returns:
+            Patterns of member directories, empty if not a workspace
+        """
+        return []
+
+    def get_venv_path(self) -> str | None:  # noqa: PLR6301
+        """Retrieve configured virtualenv path.
+
+        Returns:
+            Virtualenv path, if configured
+        """
+        return None
+
+    def get_python(self) -> str | None:  # noqa: PLR6301
+        """Retrieve configured Python interpreter.
+
+        Returns:
+            Python version or interpreter path, if configured
+        """
+        return None
+
+    def get_envs(self) -> dict[str, dict[str, Any]]:  # noqa: PLR6301
+        """Retrieve named environments.
+
+        Returns:
+            Mapping of environment name to its settings
+        """
+        return {}
+
+    def get_generate_hashes(self) -> bool:  # noqa: PLR6301
+        """Determine if lock files pin the hashes of packages.
+
+        Returns:
+            Whether hashes are generated when locking
+        """
+        return False
+
     @abc.abstractmethod
     def is_installable(self) -> bool:
         """Determine if project is installable.
@@ -47,6 +132,16 @@ class BasePyproject(abc.ABC):
         """
         raise NotImplementedError
 
+    @property
+    @abc.abstractmethod
+    def requires_python(self) -> str | None:
+        """Retrieve Python version requirement.
+
+        Returns:
+            Python version specifier
+        """
+        raise NotImplementedError
+
     @property
     @abc.abstractmethod
     def version(self) -> str:
@@ -92,51 +187,70 @@ class Pyproject(BasePyproject):
             toml_parser: Parser to be used for parsing TOML
         """
         self._parser = toml_parser
-        self._data = toml_parser.load()
 
-    def manage_dependency(
+    @property
+    def _data(self) -> dict[str, Any]:
+        # Shared with other readers of the file, must not be modified
+        return self._parser.read()
+
+    def manage_dependencies(
         self,
         action: Literal["add", "remove"],
-        package: str,
+        packages: list[str],
         group: str | None = None,
     ) -> None:
-        """Add or removes dependency from project.
+        """Add or removes many dependencies from project at once.
 
         Args:
             action: Action to take can be either add or remove
-            package: Package to manage
-            group: Group that package belongs
+            packages: Packages to manage
+            group: Group that packages belong
         """
-        data = self._parser.load()
-        project: dict[str, Any] = data.get("project", {})
-        optional_dependencies: dict[str, list[str]] = project.get(
-            "optional-dependencies", {}
-        )
-        dependencies: list[str] = (
-            project.get("dependencies", [])
-            if not group
-            else optional_dependencies.get(group, [])
-        )
-
-        index = _find_dependency_index(package, dependencies)
-        is_package_installed = index != -1
-        if action == "add":
-            if is_package_installed:
-                dependencies[index] = package
-            else:
-                dependencies.append(package)
-        else:
-            if not is_package_installed:
-                return
-            del dependencies[index]
+        dependencies = self.get_dependencies(group)
+        for package in packages:
+            index = _find_dependency_index(package, dependencies)
+            is_package_installed = index != -1
+            if action == "add":
+                if is_package_installed:
+                    dependencies[index] = package
+                else:
+                    dependencies.append(package)
+            elif is_package_installed:
+                del dependencies[index]
+
+        if dependencies != self.get_dependencies(group):
+            self.set_dependencies(dependencies, group)
+
+    def set_dependencies(
+        self, dependencies: list[str], group: str | None = None
+    ) -> None:
+        """Replace dependencies of project or of an extra group.
 
+        Args:
+            dependencies: New list of dependencies
+            group: Group to replace dependencies from
+        """
         if not group:
-            project["dependencies"] = dependencies
+            keys = ["project", "dependencies"]
         else:
-            optional_dependencies[group] = dependencies
-            project["optional-dependencies"] = optional_dependencies
-        data["project"] = project
-        self._parser.dump(data)
+            keys = ["project", "optional-dependencies", group]
+        self._parser.set_value(keys, dependencies)
+
+    def remove_group(self, group: str) -> None:
+        """Remove an extra group and its dependencies, if it exists.
+
+        The optional dependencies table is removed with its last group.
+
+        Args:
+            group: Group to remove
+        """
+        groups = self.get_extra_groups()
+        if group not in groups:
+            return
+        keys = ["project", "optional-dependencies"]
+        if groups != [group]:
+            keys.append(group)
+        self._parser.remove_value(keys)
 
     def get_extra_groups(self) -> list[str]:
         """Retrieve list of extra groups.
@@ -144,22 +258,97 @@ class Pyproject(BasePyproject):
         Returns:
             List of extra groups
         """
-        data = self._parser.load()
+        data = self._data
         optional_dependencies = data["project"].get(
             "optional-dependencies",
             {},
         )
         return list(optional_dependencies.keys())
 
+    def get_dependencies(self, group: str | None = None) -> list[str]:
+        """Retrieve dependencies of project or of an extra group.
+
+        Args:
+            group: Group to retrieve dependencies from
+
+        Returns:
+            List of dependencies
+        """
+        data = self._data
+        project: dict[str, Any] = data.get("project", {})
+        if not group:
+            return list(project.get("dependencies", []))
+        optional_dependencies = project.get("optional-dependencies", {})
+        return list(optional_dependencies.get(group, []))
+
+    def get_workspace_members(self) -> list[str]:
+        """Retrieve glob patterns of workspace member projects.
+
+        Returns:
+            Patterns of member directories, empty if not a workspace
+        """
+        workspace = self._settings.get("workspace") or {}
+        return list(workspace.get("members", []))
+
+    def get_venv_path(self) -> str | None:
+        """Retrieve virtualenv path from `[tool.pspm]` settings.
+
+        Returns:
+            Virtualenv path, if configured
+        """
+        return cast("str | None", self._settings.get("venv"))
+
+    def get_python(self) -> str | None:
+        """Retrieve Python interpreter from `[tool.pspm]` settings.
+
+        Returns:
+            Python version or interpreter path, if configured
+        """
+        return cast("str | None", self._settings.get("python"))
+
+    def get_envs(self) -> dict[str, dict[str, Any]]:
+        """Retrieve named environments from `[tool.pspm.envs]` settings.
+
+        Returns:
+            Mapping of environment name to its settings
+        """
+        return dict(self._settings.get("envs", {}))
+
+    def get_generate_hashes(self) -> bool:
+        """Read `generate-hashes` from `[tool.pspm]` settings.
+
+        Returns:
+            Whether hashes are generated when locking
+        """
+        return bool(self._settings.get("generate-hashes", False))
+
+    @property
+    def _settings(self) -> dict[str, Any]:
+        return cast(
+            "dict[str, Any]", self._data.get("tool", {}).get("pspm", {})
+        )
+
     def is_installable(self) -> bool:
         """Determine if project is installable.
 
         Returns:
             Whether the project is installable
         """
-        data = self._parser.load()
+        data = self._data
         return data.get("build-system") is not None
 
+    @property
+    def requires_python(self) -> str | None:
+        """Retrieve Python version requirement.
+
+        Returns:
+            Python version specifier
+        """
+        data = self._data
+        return cast(
+            "str | None", data.get("project", {}).get("requires-python")
+        )
+
     @property
     def version(self) -> str:
         """Retrieve project version.
@@ -178,11 +367,7 @@ class Pyproject(BasePyproject):
         Returns:
             Updated version
         """
-        data = self._parser.load()
-        project: dict[str, Any] = data.get("project", {})
-        project["version"] = new_version
-        data["project"] = project
-        self._parser.dump(data)
+        self._parser.set_value(["project", "version"], new_version)
         return new_version
 
     def bump_version(self, rule: Literal["major", "minor", "patch"]) -> str:
@@ -3,26 +3,38 @@
 from __future__ import annotations
 
 import abc
-from typing import TYPE_CHECKING
+import re
+import shutil
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 from pspm.errors.dependencies import ResolveError
 from pspm.utils.bin_path import get_uv_path
+from pspm.utils.commands import get_python_version
+from pspm.utils.files import create_temp_file, replace_file
 
 if TYPE_CHECKING:
     from pspm.entities.command_runner import BaseCommandRunner
 
+# Full Python version of a virtualenv, as written by uv or venv
+_VENV_VERSION_PATTERN = re.compile(
+    r"^version(?:_info)?\s*=\s*(\d+\.\d+[^\s]*)", re.MULTILINE
+)
+
 
 class BaseResolver(abc.ABC):
     """Base class for resolving dependencies."""
 
     @abc.abstractmethod
-    def compile(
+    def compile(  # noqa: PLR0913
         self,
         output_file: str,
         group: str | None = None,
         constraint_file: str | None = None,
         *,
         upgrade: bool = False,
+        upgrade_packages: list[str] | None = None,
+        source_file: str = "pyproject.toml",
     ) -> None:
         """Compiles requirements into a lock file.
 
@@ -31,48 +43,154 @@ class BaseResolver(abc.ABC):
             group: Group to include dependencies from
             constraint_file: Requirements file to contrain versions
             upgrade: Whether to upgrade package versions
+            upgrade_packages: Packages to upgrade, keeping other versions
+            source_file: File declaring requirements to compile
         """
         raise NotImplementedError
 
+    def get_settings(self) -> dict[str, Any]:  # noqa: PLR6301
+        """Retrieve settings that change lock files besides their inputs.
+
+        Returns:
+            Settings lock files are compiled with
+        """
+        return {}
+
 
 class UVResolver(BaseResolver):
     """Class for resolving dependencies with UV."""
 
-    def __init__(self, command_runner: BaseCommandRunner) -> None:
-        """Initialize UV Compiler."""
+    def __init__(
+        self,
+        command_runner: BaseCommandRunner,
+        python: str | None = None,
+        *,
+        generate_hashes: bool = False,
+        python_version: str | None = None,
+    ) -> None:
+        """Initialize UV Compiler.
+
+        Args:
+            command_runner: Command Runner
+            python: Python version, interpreter or virtualenv to resolve
+                for, found by uv if None
+            generate_hashes: Whether to pin the hashes of every package
+            python_version: Python version to resolve for, instead of
+                the version of the interpreter
+        """
         self._uv_path = get_uv_path()
         self._command_runner = command_runner
+        self._python = python
+        self._generate_hashes = generate_hashes
+        self._python_version = python_version
+        self._interpreter_version: str | None = None
 
-    def compile(
+    def get_settings(self) -> dict[str, Any]:
+        """Retrieve settings that change lock files besides their inputs.
+
+        The Python to resolve for is identified by its version, so lock
+        files are not compiled again when a virtualenv is created with
+        the Python they were resolved for.
+
+        Returns:
+            Python version to resolve for and whether hashes are generated
+        """
+        if self._interpreter_version is None:
+            self._interpreter_version = self._find_interpreter_version()
+        return {
+            "python": self._interpreter_version,
+            "python_version": self._python_version,
+            "generate_hashes": self._generate_hashes,
+        }
+
+    def _find_interpreter_version(self) -> str:
+        python = self._python
+        if python and Path(python, "pyvenv.cfg").exists():
+            config = Path(python, "pyvenv.cfg").read_text("utf-8")
+            match = _VENV_VERSION_PATTERN.search(config)
+            version = match.group(1) if match else None
+        else:
+            version = get_python_version(python)
+        return version or python or ""
+
+    def compile(  # noqa: PLR0913
         self,
         output_file: str,
         group: str | None = None,
         constraint_file: str | None = None,
         *,
         upgrade: bool = False,
+        upgrade_packages: list[str] | None = None,
+        source_file: str = "pyproject.toml",
     ) -> None:
         """Compiles requirements into a lock file.
 
+        Pins already in the lock file are kept as preferences, so only
+        the packages affected by a change are resolved again, and the
+        lock file is only rewritten when its content changes.
+
         Args:
             output_file: File to write output
             group: Group to include dependencies from
             constraint_file: Requirements file to contrain versions
             upgrade: Whether to upgrade package versions
+            upgrade_packages: Packages to upgrade, keeping other versions
+            source_file: File declaring requirements to compile
 
         Raises:
             ResolveError: If cant resolve dependencies
         """
-        args = [
-            "pip",
-            "compile",
-            "-q",
+        options = [
+            *(["--generate-hashes"] if self._generate_hashes else []),
+            *(
+                ["--python-version", self._python_version]
+                if self._python_version
+                else []
+            ),
             *(["--extra", group] if group else []),
             *(["--constraint", constraint_file] if constraint_file else []),
-            *(["--upgrade"] if upgrade else []),
+        ]
+        # Keep the header as if compiled straight into the output file
+        compile_command = " ".join([
+            "uv pip compile",
+            *options,
             "-o",
             output_file,
-            "pyproject.toml",
-        ]
-        retcode = self._command_runner.run(self._uv_path, args)
-        if retcode != 0:
-            raise ResolveError
+            source_file,
+        ])
+        output_path = Path(output_file)
+        temp_path = create_temp_file(output_path)
+        try:
+            if output_path.exists():
+                shutil.copyfile(output_path, temp_path)
+            args = [
+                "pip",
+                "compile",
+                "-q",
+                *(["--python", self._python] if self._python else []),
+                *options,
+                *(["--upgrade"] if upgrade else []),
+                *(
+                    arg
+                    for package in upgrade_packages or []
+                    for arg in ("--upgrade-package", package)
+                ),
+                "--custom-compile-command",
+                compile_command,
+                "-o",
+                str(temp_path),
+                source_file,
+            ]
+            retcode = self._command_runner.run(self._uv_path, args)
+            if retcode != 0:
+                raise ResolveError
+            if not _same_content(output_path, temp_path):
+                replace_file(temp_path, output_path)
+        finally:
+            temp_path.unlink(missing_ok=True)
+
+
+def _same_content(path: Path, other: Path) -> bool:
+    if not path.exists() or path.stat().st_size != other.stat().st_size:
+        return False
+    return path.read_bytes() == other.read_bytes()
@@ -3,12 +3,16 @@
 from __future__ import annotations
 
 import abc
+import copy
 import sys
 from pathlib import Path
-from typing import Any
+from typing import Any, ClassVar
 
 import tomli_w
 
+from pspm.utils.files import atomic_write
+from pspm.utils.toml_edit import patch_toml, remove_toml_key
+
 if sys.version_info >= (3, 11):
     import tomllib
 else:
@@ -44,24 +48,152 @@ class BaseToml(abc.ABC):
         """
         raise NotImplementedError
 
+    def read(self) -> dict[str, Any]:
+        """Load TOML file to be read, but not modified.
+
+        Returns:
+            A dictionary containing parsed TOML, that may be shared
+        """
+        return self.load()
+
+    def set_value(self, keys: list[str], value: object) -> None:
+        """Set a value in TOML file, creating tables as needed.
+
+        Args:
+            keys: Path of keys to the value
+            value: Value to set
+        """
+        data = self.load()
+        table = data
+        for key in keys[:-1]:
+            table = table.setdefault(key, {})
+        table[keys[-1]] = value
+        self.dump(data)
+
+    def remove_value(self, keys: list[str]) -> None:
+        """Remove a value or table from TOML file, if it exists.
+
+        Args:
+            keys: Path of keys to the value
+        """
+        data = self.load()
+        table = data
+        for key in keys[:-1]:
+            table = table.get(key, {})
+        if keys[-1] in table:
+            del table[keys[-1]]
+            self.dump(data)
+
 
 class Toml(BaseToml):
-    """TOML Parser and writer."""
+    """TOML Parser and writer.
+
+    Parsed documents are cached per file and reused while the file
+    mtime, size and inode do not change.
+
+    Attributes:
+        parse_count: Number of times a TOML file was parsed
+        copy_count: Number of times a parsed document was copied
+    """
+
+    parse_count: ClassVar[int] = 0
+    copy_count: ClassVar[int] = 0
 
     def load(self) -> dict[str, Any]:
         """Load TOML file.
 
         Returns:
-            A dictionary containing parsed TOML
+            A copy of the parsed TOML, which can be modified
         """
-        with Path(self.path).open("rb") as f:
-            return tomllib.load(f)
+        Toml.copy_count += 1
+        return copy.deepcopy(self.read())
+
+    def read(self) -> dict[str, Any]:
+        """Load TOML file to be read, but not modified.
+
+        Returns:
+            The cached parsed TOML, shared by every reader of the file
+        """
+        path = Path(self.path).absolute()
+        key = _stat_key(path)
+        cached = _documents.get(path)
+        if cached is None or cached[0] != key:
+            with path.open("rb") as f:
+                data = tomllib.load(f)
+            Toml.parse_count += 1
+            cached = (key, data)
+            _documents[path] = cached
+        return cached[1]
 
     def dump(self, data: dict[str, Any]) -> None:
         """Write a dictionary to a file containing TOML-formatted data.
 
+        The file is replaced atomically, so it is never left half written.
+
         Args:
             data: TOML data
         """
-        with Path(self.path).open("wb") as f:
-            tomli_w.dump(data, f)
+        path = Path(self.path).absolute()
+        self.invalidate()
+        atomic_write(path, tomli_w.dumps(data).encode())
+        _documents[path] = (_stat_key(path), copy.deepcopy(data))
+
+    def set_value(self, keys: list[str], value: object) -> None:
+        """Set a value in TOML file, creating tables as needed.
+
+        Only the text of the value is rewritten, keeping comments and
+        formatting of the rest of the file. Falls back to dumping the
+        whole document when the value can't be patched in place.
+
+        Args:
+            keys: Path of keys to the value
+            value: Value to set
+        """
+        path = Path(self.path).absolute()
+        stat_key = _stat_key(path)
+        patched = patch_toml(path.read_text("utf-8"), keys, value)
+        if patched is None:
+            super().set_value(keys, value)
+            return
+
+        cached = _documents.get(path)
+        self.invalidate()
+        atomic_write(path, patched.encode())
+        # Update cached document instead of parsing the file again
+        if cached is not None and cached[0] == stat_key:
+            table = cached[1]
+            for key in keys[:-1]:
+                table = table.setdefault(key, {})
+            table[keys[-1]] = copy.deepcopy(value)
+            _documents[path] = (_stat_key(path), cached[1])
+
+    def remove_value(self, keys: list[str]) -> None:
+        """Remove a value or table from TOML file, if it exists.
+
+        Only the lines of the value are removed, keeping comments and
+        formatting of the rest of the file. Falls back to dumping the
+        whole document when the value can't be removed in place.
+
+        Args:
+            keys: Path of keys to the value
+        """
+        path = Path(self.path).absolute()
+        text = path.read_text("utf-8")
+        removed = remove_toml_key(text, keys)
+        if removed is None:
+            super().remove_value(keys)
+        elif removed != text:
+            self.invalidate()
+            atomic_write(path, removed.encode())
+
+    def invalidate(self) -> None:
+        """Drop cached document of this file."""
+        _documents.pop(Path(self.path).absolute(), None)
+
+
+_documents: dict[Path, tuple[tuple[int, int, int], dict[str, Any]]] = {}
+
+
+def _stat_key(path: Path) -> tuple[int, int, int]:
+    stat = path.stat()
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
@@ -0,0 +1,145 @@
+"""Module to reuse virtualenvs synced from the same lock files."""
+
+from __future__ import annotations
+
+import abc
+import os
+import platform
+import shutil
+import sys
+import uuid
+from typing import TYPE_CHECKING
+
+from pspm.utils.files import clone_tree
+from pspm.utils.hashing import hash_data, hash_file
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class BaseVenvCache(abc.ABC):
+    """Store synced virtualenvs to restore them instead of syncing."""
+
+    @abc.abstractmethod
+    def restore(self, fingerprint: str) -> bool:
+        """Replace virtualenv with a cached one synced to the same state.
+
+        Args:
+            fingerprint: Fingerprint of the state to sync
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def store(self, fingerprint: str) -> None:
+        """Store virtualenv after it was synced.
+
+        Args:
+            fingerprint: Fingerprint of the synced state
+        """
+        raise NotImplementedError
+
+
+class VenvCache(BaseVenvCache):
+    """Keep synced virtualenvs in a directory, keyed by what they contain.
+
+    Virtualenvs are not relocatable, so besides the sync fingerprint the
+    key includes the virtualenv path, its interpreter and the platform.
+    Files are hard linked between the cache and the virtualenv when
+    possible, as uv does with its own cache.
+    """
+
+    def __init__(
+        self, directory: Path, venv_path: Path, max_entries: int = 10
+    ) -> None:
+        """Initialize VenvCache.
+
+        Args:
+            directory: Cache directory
+            venv_path: Path to virtualenv
+            max_entries: Maximum number of virtualenvs kept in cache
+        """
+        self._directory = directory
+        self._venv_path = venv_path
+        self._max_entries = max_entries
+
+    def _get_key(self, fingerprint: str) -> str | None:
+        interpreter = hash_file(self._venv_path / "pyvenv.cfg")
+        if interpreter is None:
+            return None
+        return hash_data({
+            "fingerprint": fingerprint,
+            "venv": str(self._venv_path.absolute()),
+            "interpreter": interpreter,
+            "platform": f"{sys.platform}-{platform.machine()}",
+        })
+
+    def restore(self, fingerprint: str) -> bool:
+        """Replace virtualenv with a cached one synced to the same state.
+
+        Args:
+            fingerprint: Fingerprint of the state to sync
+
+        Returns:
+            Whether a cached virtualenv was restored
+        """
+        key = self._get_key(fingerprint)
+        entry = self._directory / key if key else None
+        if entry is None or not entry.is_dir():
+            return False
+        clone = _temp_path(self._venv_path)
+        try:
+            clone_tree(entry, clone)
+            previous = _temp_path(self._venv_path)
+            self._venv_path.replace(previous)
+            clone.replace(self._venv_path)
+            shutil.rmtree(previous, ignore_errors=True)
+        finally:
+            shutil.rmtree(clone, ignore_errors=True)
+        os.utime(entry)
+        return True
+
+    def store(self, fingerprint: str) -> None:
+        """Store virtualenv after it was synced.
+
+        Args:
+            fingerprint: Fingerprint of the synced state
+
+        Raises:
+            OSError: If virtualenv can't be copied into the cache
+        """
+        key = self._get_key(fingerprint)
+        if key is None:
+            return
+        entry = self._directory / key
+        if entry.is_dir():
+            os.utime(entry)
+            return
+        self._directory.mkdir(parents=True, exist_ok=True)
+        clone = _temp_path(entry)
+        try:
+            clone_tree(self._venv_path, clone)
+            clone.replace(entry)
+        except OSError:
+            # Stored by a concurrent sync
+            if not entry.is_dir():
+                raise
+        finally:
+            shutil.rmtree(clone, ignore_errors=True)
+        self._prune()
+
+    def _prune(self) -> None:
+        entries = sorted(
+            (
+                p
+                for p in self._directory.iterdir()
+                if p.is_dir() and not p.name.startswith(".")
+            ),
+            key=lambda p: p.stat().st_mtime,
+            reverse=True,
+        )
+        for entry in entries[self._max_entries :]:
+            shutil.rmtree(entry, ignore_errors=True)
+
+
+def _temp_path(path: Path) -> Path:
+    return path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import os
 from typing import TYPE_CHECKING
 
 from pspm.errors.command import CommandNotFoundError, CommandRunError
@@ -26,12 +27,25 @@ class VenvRunner:
         self._virtual_env = virtual_env
         self._command_runner = command_runner
 
-    def run(self, command: str, arguments: list[str] | None = None) -> None:
+    def run(
+        self,
+        command: str,
+        arguments: list[str] | None = None,
+        *,
+        environment: dict[str, str] | None = None,
+        replace_process: bool = os.name == "posix",
+    ) -> int:
         """Run a command inside virtualenv.
 
         Args:
             command: Command to execute
             arguments: Arguments to be passed to command.
+            environment: Extra environment variables to pass to command
+            replace_process: Whether to replace the current process with
+                the command instead of waiting for it as a child process
+
+        Returns:
+            Return code from command
 
         Raises:
             CommandRunError: If command fails
@@ -41,4 +55,8 @@ class VenvRunner:
         except CommandNotFoundError as e:
             raise CommandRunError(command, str(e)) from e
 
-        self._command_runner.run(command_path, arguments)
+        env = self._virtual_env.get_environment()
+        env.update(environment or {})
+        if replace_process:
+            self._command_runner.execute(command_path, arguments, env)
+        return self._command_runner.run(command_path, arguments, env)
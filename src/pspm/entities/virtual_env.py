@@ -1,11 +1,19 @@
 """Module to define virtualenv classes."""
 
+from __future__ import annotations
+
 import abc
-import subprocess
+import os
 from pathlib import Path
+from typing import TYPE_CHECKING
 
+from pspm.entities.command_runner import CommandRunner
 from pspm.errors.command import CommandNotFoundError
 from pspm.utils.bin_path import get_uv_path
+from pspm.utils.files import atomic_write
+
+if TYPE_CHECKING:
+    from pspm.entities.command_runner import BaseCommandRunner
 
 
 class BaseVirtualEnv(abc.ABC):
@@ -30,13 +38,46 @@ class BaseVirtualEnv(abc.ABC):
         """
         raise NotImplementedError
 
+    @abc.abstractmethod
+    def get_environment(self) -> dict[str, str]:
+        """Retrieve environment variables with the virtualenv activated."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get_sync_fingerprint(self) -> str | None:
+        """Retrieve fingerprint of the last successful sync."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def set_sync_fingerprint(self, fingerprint: str | None) -> None:
+        """Store fingerprint of a successful sync.
+
+        Args:
+            fingerprint: Fingerprint to store, None to clear it
+        """
+        raise NotImplementedError
+
 
 class VirtualEnv(BaseVirtualEnv):
     """Interacts with virtualenv."""
 
-    def __init__(self) -> None:
-        """Initialize BaseVirtualEnv."""
-        self._path = Path(".venv")
+    def __init__(
+        self,
+        command_runner: BaseCommandRunner | None = None,
+        path: Path | None = None,
+        python: str | None = None,
+    ) -> None:
+        """Initialize BaseVirtualEnv.
+
+        Args:
+            command_runner: Command Runner
+            path: Virtualenv path
+            python: Python version or interpreter to create virtualenv with
+        """
+        self._path = path or Path(".venv")
+        self._python = python
+        self._command_runner = command_runner or CommandRunner()
+        self._fingerprint_path = self._path / ".pspm-sync"
 
     def already_created(self) -> bool:
         """Check if env is already created.
@@ -49,7 +90,14 @@ class VirtualEnv(BaseVirtualEnv):
     def create(self) -> None:
         """Create virtualenv."""
         uv_path = get_uv_path()
-        subprocess.run([uv_path, "venv", self._path.absolute()], check=False)
+        self._command_runner.run(
+            uv_path,
+            [
+                "venv",
+                *(["--python", self._python] if self._python else []),
+                str(self._path.absolute()),
+            ],
+        )
 
     def get_path_to_command_bin(self, command: str) -> str:
         """Retrieve path to command bin.
@@ -71,3 +119,50 @@ class VirtualEnv(BaseVirtualEnv):
             )
             raise CommandNotFoundError(command, error_message)
         return str(command_path.absolute())
+
+    def get_environment(self) -> dict[str, str]:
+        """Retrieve environment variables with the virtualenv activated.
+
+        The virtualenv bin directory is prepended to PATH, so commands
+        spawned by the command also resolve to the virtualenv. The mapping
+        is computed once per virtualenv and copied on each call.
+
+        Returns:
+            Environment variables
+        """
+        path = self._path.absolute()
+        environment = _environments.get(path)
+        if environment is None:
+            environment = dict(os.environ)
+            environment.pop("PYTHONHOME", None)
+            environment["VIRTUAL_ENV"] = str(path)
+            environment["PATH"] = os.pathsep.join(
+                p for p in (str(path / "bin"), environment.get("PATH")) if p
+            )
+            _environments[path] = environment
+        return dict(environment)
+
+    def get_sync_fingerprint(self) -> str | None:
+        """Retrieve fingerprint of the last successful sync.
+
+        Returns:
+            Stored fingerprint, if any
+        """
+        try:
+            return self._fingerprint_path.read_text("utf-8").strip()
+        except FileNotFoundError:
+            return None
+
+    def set_sync_fingerprint(self, fingerprint: str | None) -> None:
+        """Store fingerprint of a successful sync.
+
+        Args:
+            fingerprint: Fingerprint to store, None to clear it
+        """
+        if fingerprint is None:
+            self._fingerprint_path.unlink(missing_ok=True)
+            return
+        atomic_write(self._fingerprint_path, fingerprint.encode())
+
+
+_environments: dict[Path, dict[str, str]] = {}
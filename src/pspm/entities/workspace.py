@@ -0,0 +1,162 @@
+"""Module to lock and sync many projects together."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from pspm.entities.pyproject import Pyproject
+from pspm.entities.toml import Toml
+from pspm.utils.files import (
+    STATE_DIRECTORY,
+    ensure_state_directory,
+    write_if_changed,
+)
+
+if TYPE_CHECKING:
+    from pspm.entities.pyproject import BasePyproject
+
+
+class Workspace:
+    """Projects resolved into shared lock files and synced into one venv.
+
+    Every project is added to the resolver input as an editable
+    requirement, so members depending on each other use the local
+    code and all of them are resolved with a single resolver call.
+    """
+
+    def __init__(
+        self,
+        pyproject: BasePyproject,
+        members: dict[str, BasePyproject],
+        state_directory: Path = STATE_DIRECTORY,
+    ) -> None:
+        """Initialize Workspace.
+
+        Args:
+            pyproject: Root project of the workspace
+            members: Mapping of member directory to its project
+            state_directory: Directory to write resolver inputs into
+        """
+        self._pyproject = pyproject
+        self._members = members
+        self._state_directory = state_directory
+
+    def get_extra_groups(self) -> list[str]:
+        """Retrieve extra groups of the root project and all members.
+
+        Returns:
+            List of extra groups, in the order they are declared
+        """
+        groups = dict.fromkeys(self._pyproject.get_extra_groups())
+        for member in self._members.values():
+            groups.update(dict.fromkeys(member.get_extra_groups()))
+        return list(groups)
+
+    def get_project_files(self) -> list[str]:
+        """Retrieve pyproject files of the members.
+
+        Returns:
+            Paths to the pyproject files of every member
+        """
+        return [f"{member}/pyproject.toml" for member in self._members]
+
+    def get_editables(self) -> list[str]:
+        """Retrieve projects installed in editable mode.
+
+        Returns:
+            Paths to the installable projects of the workspace
+        """
+        editables = ["."] if self._pyproject.is_installable() else []
+        return [*editables, *self._members]
+
+    def get_requirements(self, group: str | None = None) -> list[str]:
+        """Retrieve requirements to resolve the workspace with.
+
+        Args:
+            group: Extra group to include, if a project declares it
+
+        Returns:
+            Requirements with every project as an editable requirement
+        """
+        if self._pyproject.is_installable():
+            requirements = [_editable(".", self._pyproject, group)]
+        else:
+            requirements = self._pyproject.get_dependencies()
+            if group:
+                requirements += self._pyproject.get_dependencies(group)
+        requirements.extend(
+            _editable(f"./{path}", member, group)
+            for path, member in self._members.items()
+        )
+        return requirements
+
+    def write_input_file(self, group: str | None = None) -> str:
+        """Write requirements of the workspace to a resolver input file.
+
+        Args:
+            group: Extra group to include, if a project declares it
+
+        Returns:
+            Path to the input file
+        """
+        name = f"workspace-{group}.in" if group else "workspace.in"
+        return _write_if_changed(
+            self._state_directory / name,
+            "".join(f"{r}\n" for r in self.get_requirements(group)),
+        )
+
+    def write_constraint_file(self, lock_file: str) -> str:
+        """Write a lock file as constraints for group lock files.
+
+        Editable requirements are not allowed as constraints, they are
+        left out since group inputs list the same projects.
+
+        Args:
+            lock_file: Main lock file of the workspace
+
+        Returns:
+            Path to the constraint file
+        """
+        lines = Path(lock_file).read_text("utf-8").splitlines(keepends=True)
+        return _write_if_changed(
+            self._state_directory / "workspace-constraints.txt",
+            "".join(line for line in lines if not line.startswith("-e ")),
+        )
+
+
+def find_workspace_members(
+    patterns: list[str], root: Path | None = None
+) -> dict[str, BasePyproject]:
+    """Find member projects matching glob patterns.
+
+    Args:
+        patterns: Glob patterns of member directories
+        root: Workspace root directory
+
+    Returns:
+        Mapping of member directory to its project, sorted by directory
+    """
+    root = root or Path()
+    directories = {
+        path.parent.relative_to(root).as_posix()
+        for pattern in patterns
+        for path in root.glob(f"{pattern.rstrip('/')}/pyproject.toml")
+    }
+    directories.discard(".")
+    return {
+        directory: Pyproject(Toml(str(root / directory / "pyproject.toml")))
+        for directory in sorted(directories)
+    }
+
+
+def _editable(path: str, pyproject: BasePyproject, group: str | None) -> str:
+    if group and group in pyproject.get_extra_groups():
+        return f"-e {path}[{group}]"
+    return f"-e {path}"
+
+
+def _write_if_changed(path: Path, content: str) -> str:
+    ensure_state_directory(path.parent)
+    write_if_changed(path, content.encode())
+    return str(path)
@@ -1,5 +1,7 @@
 """Module with errors related to dependency management."""
 
+from __future__ import annotations
+
 
 class DependencyError(Exception):
     """Base error for dependencies."""
@@ -19,9 +21,35 @@ class InstallError(DependencyError):
         super().__init__(self.message)
 
 
+class UninstallError(DependencyError):
+    """Can't uninstall package."""
+
+    def __init__(self, package: str) -> None:
+        """Initialize UninstallError.
+
+        Args:
+            package: Package that failed to be uninstalled
+        """
+        self.package = package
+        self.message = f"Error uninstalling package {package}"
+        super().__init__(self.message)
+
+
 class AddError(InstallError):
     """Can't add package to project."""
 
+    def __init__(self, packages: list[str]) -> None:
+        """Initialize AddError.
+
+        Args:
+            packages: Packages that failed to be added
+        """
+        self.packages = packages
+        self.package = ", ".join(packages)
+        noun = "package" if len(packages) == 1 else "packages"
+        self.message = f"Error installing {noun} {self.package}"
+        DependencyError.__init__(self, self.message)
+
 
 class SyncError(DependencyError):
     """Can't sync dependencies."""
@@ -34,6 +62,94 @@ class SyncError(DependencyError):
 class ResolveError(DependencyError):
     """Can't resolve dependencies."""
 
-    def __init__(self) -> None:
-        """Initialize SyncError."""
-        super().__init__("Error resolving dependencies")
+    def __init__(self, groups: list[str] | None = None) -> None:
+        """Initialize ResolveError.
+
+        Args:
+            groups: Groups that failed to be resolved
+        """
+        self.groups = groups or []
+        self.message = "Error resolving dependencies"
+        if self.groups:
+            self.message += f" for groups: {', '.join(self.groups)}"
+        super().__init__(self.message)
+
+
+class NotLockedError(DependencyError):
+    """Packages are not locked."""
+
+    def __init__(self, packages: list[str]) -> None:
+        """Initialize NotLockedError.
+
+        Args:
+            packages: Packages missing from lock files
+        """
+        self.packages = packages
+        self.message = f"Packages not locked: {', '.join(packages)}"
+        super().__init__(self.message)
+
+
+class GroupNotFoundError(DependencyError):
+    """Dependency groups are not declared."""
+
+    def __init__(self, groups: list[str]) -> None:
+        """Initialize GroupNotFoundError.
+
+        Args:
+            groups: Groups missing from project
+        """
+        self.groups = groups
+        self.message = f"Unknown dependency groups: {', '.join(groups)}"
+        super().__init__(self.message)
+
+
+class LockFileNotFoundError(DependencyError):
+    """Lock files were not created yet."""
+
+    def __init__(self, files: list[str]) -> None:
+        """Initialize LockFileNotFoundError.
+
+        Args:
+            files: Lock files missing from project
+        """
+        self.files = files
+        self.message = f"Lock files not found: {', '.join(files)}"
+        super().__init__(self.message)
+
+
+class LockConflictError(DependencyError):
+    """Lock files of groups pin packages differently."""
+
+    def __init__(self, conflicts: dict[str, dict[str | None, str]]) -> None:
+        """Initialize LockConflictError.
+
+        Args:
+            conflicts: Mapping of package to its pin in each group, None
+                for main
+        """
+        self.conflicts = conflicts
+        pins = (
+            ", ".join(
+                f"{pin} in {group or 'main'}" for group, pin in p.items()
+            )
+            for p in conflicts.values()
+        )
+        self.message = f"Groups pin packages differently: {'; '.join(pins)}"
+        super().__init__(self.message)
+
+
+class HashedLocalProjectError(DependencyError):
+    """Local projects can't be installed along hashed requirements."""
+
+    def __init__(self, projects: list[str]) -> None:
+        """Initialize HashedLocalProjectError.
+
+        Args:
+            projects: Local projects that have no hashes
+        """
+        self.projects = projects
+        self.message = (
+            "Local projects can't be installed along hashed requirements: "
+            f"{', '.join(repr(p) for p in projects)}"
+        )
+        super().__init__(self.message)
@@ -0,0 +1,23 @@
+"""Module with errors related to project settings."""
+
+from __future__ import annotations
+
+
+class SettingsError(Exception):
+    """Base error for project settings."""
+
+
+class EnvironmentNotFoundError(SettingsError):
+    """Environment is not declared in project settings."""
+
+    def __init__(self, name: str) -> None:
+        """Initialize EnvironmentNotFoundError.
+
+        Args:
+            name: Name of the environment
+        """
+        self.name = name
+        self.message = (
+            f"Environment {name} is not declared in [tool.pspm.envs]"
+        )
+        super().__init__(self.message)
@@ -0,0 +1,160 @@
+"""Module to run commands in many projects at once."""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Literal
+
+from rich import print as rprint
+from rich.markup import escape
+from rich.rule import Rule
+from typer import Exit
+
+from pspm.entities.pyproject import Pyproject
+from pspm.entities.toml import Toml
+from pspm.entities.workspace import find_workspace_members
+from pspm.services.dependencies import lock_dependencies, sync_dependencies
+from pspm.utils.commands import get_uv_cache_dir
+from pspm.utils.printing import print_error
+
+BatchCommand = Literal["lock", "sync"]
+
+
+def find_projects(
+    directories: list[Path], *, all_projects: bool = False
+) -> list[Path]:
+    """Find projects to run a command in.
+
+    Args:
+        directories: Project directories
+        all_projects: Whether to add every project found in current
+            directory, the workspace members if it declares them
+
+    Returns:
+        Project directories, without duplicates
+    """
+    projects = list(directories)
+    if all_projects:
+        projects.extend(_find_all_projects())
+    unique = dict.fromkeys(os.path.normpath(p) for p in projects)
+    return [Path(p) for p in unique]
+
+
+def _find_all_projects() -> list[Path]:
+    if Path("pyproject.toml").exists():
+        patterns = Pyproject(Toml("pyproject.toml")).get_workspace_members()
+        if patterns:
+            return [Path(m) for m in find_workspace_members(patterns)]
+    return sorted(path.parent for path in Path().glob("*/pyproject.toml"))
+
+
+def run_in_projects(
+    command: BatchCommand,
+    projects: list[Path],
+    *,
+    processes: int | None = None,
+    **options: Any,  # noqa: ANN401
+) -> list[Path]:
+    """Run a command in many projects with a pool of processes.
+
+    The output of each project is printed once it finishes. All projects
+    share the same uv cache directory.
+
+    Args:
+        command: Command to run
+        projects: Project directories
+        processes: Maximum number of projects to run at the same time,
+            defaults to the number of CPUs
+        **options: Options passed to the command
+
+    Returns:
+        Projects in which the command failed
+    """
+    if not projects:
+        return []
+    cache_dir = os.environ.get("UV_CACHE_DIR") or get_uv_cache_dir()
+    failed: list[Path] = []
+    with ProcessPoolExecutor(
+        max_workers=min(processes or os.cpu_count() or 1, len(projects)),
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(cache_dir,),
+    ) as executor:
+        futures = {
+            executor.submit(_run_in_project, command, project, options): (
+                project
+            )
+            for project in projects
+        }
+        for future in as_completed(futures):
+            project = futures[future]
+            error = future.exception()
+            if error is not None:
+                success, output = False, f"{error}\n"
+            else:
+                success, output = future.result()
+            rprint(Rule(f"[blue]{escape(str(project))}[/blue]", align="left"))
+            sys.stdout.write(output)
+            sys.stdout.flush()
+            if not success:
+                failed.append(project)
+    return [p for p in projects if p in failed]
+
+
+def _init_worker(cache_dir: str | None) -> None:
+    if cache_dir:
+        os.environ["UV_CACHE_DIR"] = cache_dir
+
+
+def _run_in_project(
+    command: BatchCommand, project: Path, options: dict[str, Any]
+) -> tuple[bool, str]:
+    """Run a command in a project, capturing its output.
+
+    Output is captured at file descriptor level, so it also includes
+    the output of subprocesses such as uv.
+
+    Returns:
+        Whether the command succeeded and its output
+    """
+    with tempfile.TemporaryFile() as output:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        saved_fds = os.dup(1), os.dup(2)
+        os.dup2(output.fileno(), 1)
+        os.dup2(output.fileno(), 2)
+        cwd = Path.cwd()
+        try:
+            os.chdir(project)
+            _run_command(command, options)
+        except Exit:
+            success = False
+        except Exception as e:  # noqa: BLE001
+            print_error(escape(f"{type(e).__name__}: {e}"))
+            success = False
+        else:
+            success = True
+        finally:
+            os.chdir(cwd)
+            sys.stdout.flush()
+            sys.stderr.flush()
+            for fd, saved_fd in zip((1, 2), saved_fds):
+                os.dup2(saved_fd, fd)
+                os.close(saved_fd)
+        output.seek(0)
+        return success, output.read().decode(errors="replace")
+
+
+def _run_command(command: BatchCommand, options: dict[str, Any]) -> None:
+    if command == "lock":
+        lock_dependencies(**options)
+        rprint(":lock: Locked dependencies")
+    elif sync_dependencies(**options):
+        rprint(":sparkles: Installed [blue]project[/blue] and dependencies")
+    else:
+        rprint(":sparkles: Environment is already up to date")
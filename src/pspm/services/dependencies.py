@@ -2,20 +2,49 @@
 
 from __future__ import annotations
 
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Literal
 
+from rich.markup import escape
 from typer import Exit
 
 from pspm.entities.command_runner import BaseCommandRunner, CommandRunner
 from pspm.entities.installer import BaseInstaller, UVInstaller
+from pspm.entities.lock_state import LockState
 from pspm.entities.package_manager import PackageManager
 from pspm.entities.pyproject import Pyproject
 from pspm.entities.resolver import BaseResolver, UVResolver
 from pspm.entities.toml import Toml
+from pspm.entities.venv_cache import VenvCache
 from pspm.entities.virtual_env import VirtualEnv
-from pspm.errors.dependencies import AddError
-from pspm.utils.printing import print_error
+from pspm.entities.workspace import Workspace, find_workspace_members
+from pspm.errors.dependencies import (
+    AddError,
+    GroupNotFoundError,
+    HashedLocalProjectError,
+    LockConflictError,
+    LockFileNotFoundError,
+    NotLockedError,
+    ResolveError,
+)
+from pspm.errors.settings import EnvironmentNotFoundError
+from pspm.services.settings import (
+    VenvSettings,
+    get_resolver_python_version,
+    get_venv_settings,
+)
+from pspm.utils.files import project_lock
+from pspm.utils.printing import (
+    print_dependency_paths,
+    print_dependency_tree,
+    print_error,
+    print_lock_diff,
+)
+
+# Selects no extra group, main dependencies are always synced
+MAIN_GROUP = "main"
 
 
 def _get_pyproject_path() -> str:
@@ -36,52 +65,255 @@ def _get_command_runner() -> BaseCommandRunner:
     return CommandRunner()
 
 
-def _get_resolver() -> BaseResolver:
-    return UVResolver(_get_command_runner())
+def _get_resolver(
+    settings: VenvSettings, pyproject: Pyproject
+) -> BaseResolver:
+    return UVResolver(
+        _get_command_runner(),
+        settings.resolver_python,
+        generate_hashes=pyproject.get_generate_hashes(),
+        python_version=get_resolver_python_version(),
+    )
+
+
+def _get_installer(settings: VenvSettings) -> BaseInstaller:
+    return UVInstaller(_get_command_runner(), settings.path)
+
+
+def _get_workspace(pyproject: Pyproject) -> Workspace | None:
+    patterns = pyproject.get_workspace_members()
+    if not patterns:
+        return None
+    return Workspace(pyproject, find_workspace_members(patterns))
 
 
-def _get_installer() -> BaseInstaller:
-    return UVInstaller(_get_command_runner())
+def _get_venv_cache(settings: VenvSettings) -> VenvCache | None:
+    directory = os.environ.get("PSPM_VENV_CACHE_DIR")
+    if not directory:
+        return None
+    return VenvCache(Path(directory), settings.path)
 
 
-def _get_package_manager() -> PackageManager:
-    virtual_env = VirtualEnv()
+def _get_package_manager(
+    env: str | None = None,
+    *,
+    only: list[str] | None = None,
+    without: list[str] | None = None,
+) -> PackageManager:
+    pyproject = _get_pyproject()
+    try:
+        settings = get_venv_settings(env)
+    except EnvironmentNotFoundError as e:
+        print_error(escape(str(e)))
+        raise Exit(1) from e
+    virtual_env = VirtualEnv(path=settings.path, python=settings.python)
     return PackageManager(
-        _get_pyproject(), _get_installer(), _get_resolver(), virtual_env
+        pyproject,
+        _get_installer(settings),
+        _get_resolver(settings, pyproject),
+        virtual_env,
+        LockState(),
+        workspace=_get_workspace(pyproject),
+        venv_cache=_get_venv_cache(settings),
+        groups=(
+            [g for g in only if g != MAIN_GROUP] if only else settings.groups
+        ),
+        excluded_groups=without,
     )
 
 
-def sync_dependencies() -> None:
-    """Install all dependencies and the package itself."""
-    package_manager = _get_package_manager()
-    package_manager.sync()
+@project_lock()
+def sync_dependencies(
+    *,
+    force: bool = False,
+    envs: list[str] | None = None,
+    only: list[str] | None = None,
+    without: list[str] | None = None,
+) -> bool:
+    """Install all dependencies and the package itself.
+
+    Named environments are synced at the same time.
+
+    Args:
+        force: Whether to sync even if environment seems up to date
+        envs: Named environments to sync, the default one if None
+        only: Only groups to sync, `main` for no extra groups
+        without: Groups not to sync
+
+    Returns:
+        Whether any environment was synced
+
+    Raises:
+        Exit: If environment groups are not declared
+    """
+    names: list[str | None] = [*envs] if envs else [None]
+    package_managers = [
+        _get_package_manager(name, only=only, without=without)
+        for name in names
+    ]
+    try:
+        if len(package_managers) == 1:
+            return package_managers[0].sync(force=force)
+        with ThreadPoolExecutor(max_workers=len(package_managers)) as executor:
+            synced = list(
+                executor.map(lambda p: p.sync(force=force), package_managers)
+            )
+    except GroupNotFoundError as e:
+        print_error(str(e))
+        raise Exit(1) from e
+    return any(synced)
 
 
-def manage_dependency(
-    action: Literal["add", "remove"], package: str, group: str | None = None
+@project_lock()
+def manage_dependencies(
+    action: Literal["add", "remove"],
+    packages: list[str],
+    group: str | None = None,
+    *,
+    only: list[str] | None = None,
+    without: list[str] | None = None,
 ) -> None:
-    """Add dependency to pyproject.
+    """Add or remove dependencies from pyproject.
 
     Args:
         action: Action to take can be either add or remove
-        package: Package to install
-        group: Group to insert package
+        packages: Packages to install
+        group: Group to insert packages
+        only: Only groups to sync, `main` for no extra groups
+        without: Groups not to sync
+
+    Raises:
+        Exit: If cant add dependencies
+    """
+    package_manager = _get_package_manager(only=only, without=without)
+    try:
+        diff = package_manager.manage_dependencies(action, packages, group)
+    except (AddError, GroupNotFoundError) as e:
+        print_error(str(e))
+        raise Exit(1) from e
+    print_lock_diff(diff)
+
+
+@project_lock()
+def lock_dependencies(*, update: bool = False, jobs: int = 1) -> None:
+    """Lock dependencies.
+
+    Args:
+        update: Whether to update dependencies to latest version
+        jobs: Maximum number of groups to lock at the same time
+
+    Raises:
+        Exit: If cant resolve dependencies
+    """
+    package_manager = _get_package_manager()
+    try:
+        diff = package_manager.compile_requirements(upgrade=update, jobs=jobs)
+    except ResolveError as e:
+        print_error(str(e))
+        raise Exit(1) from e
+    print_lock_diff(diff)
+
+
+@project_lock()
+def upgrade_dependencies(
+    packages: list[str] | None = None, *, jobs: int = 1
+) -> None:
+    """Upgrade dependencies and install them.
+
+    Args:
+        packages: Packages to upgrade, all dependencies by default
+        jobs: Maximum number of groups to lock at the same time
 
     Raises:
-        Exit: If cant add dependency
+        Exit: If cant resolve dependencies
     """
     package_manager = _get_package_manager()
     try:
-        package_manager.manage_dependency(action, package, group)
-    except AddError as e:
+        diff = package_manager.upgrade_dependencies(packages, jobs=jobs)
+    except (ResolveError, NotLockedError) as e:
         print_error(str(e))
         raise Exit(1) from e
+    print_lock_diff(diff)
+
+
+@project_lock()
+def export_dependencies(  # noqa: PLR0913
+    output_file: str,
+    *,
+    env: str | None = None,
+    only: list[str] | None = None,
+    without: list[str] | None = None,
+    editable: bool = True,
+    project: bool = True,
+) -> bool:
+    """Export locked dependencies into a single requirements file.
+
+    Args:
+        output_file: Requirements file to write
+        env: Named environment whose groups are exported
+        only: Only groups to export, `main` for no extra groups
+        without: Groups not to export
+        editable: Whether local projects are exported as editable
+        project: Whether to export local projects
+
+    Returns:
+        Whether the requirements file changed
+
+    Raises:
+        Exit: If groups are not declared, not locked or can't be merged
+    """
+    package_manager = _get_package_manager(env, only=only, without=without)
+    try:
+        return package_manager.export(
+            output_file, editable=editable, project=project
+        )
+    except HashedLocalProjectError as e:
+        print_error(escape(f"{e}. Leave them out with --no-project"))
+        raise Exit(1) from e
+    except (
+        GroupNotFoundError,
+        LockConflictError,
+        LockFileNotFoundError,
+    ) as e:
+        print_error(escape(str(e)))
+        raise Exit(1) from e
+
+
+def why_dependency(package: str) -> None:
+    """Print why a package is locked.
 
+    Args:
+        package: Package to explain
+
+    Raises:
+        Exit: If package is not locked
+    """
+    graph = _get_package_manager().get_lock_graph()
+    locked_package = graph.get(package)
+    if locked_package is None:
+        print_error(f"Package {escape(package)} is not locked")
+        raise Exit(1)
+    print_dependency_paths(locked_package, graph.find_paths(package))
 
-def lock_dependencies(*, update: bool = False) -> None:
-    """Lock dependencies."""
+
+def show_dependency_tree(group: str | None = None) -> None:
+    """Print tree of locked dependencies.
+
+    Args:
+        group: Group to print tree, defaults to main dependencies
+
+    Raises:
+        Exit: If group is not declared
+    """
+    if group == MAIN_GROUP:
+        group = None
     package_manager = _get_package_manager()
-    package_manager.compile_requirements(upgrade=update)
+    try:
+        package_manager.check_groups([group] if group else [])
+    except GroupNotFoundError as e:
+        print_error(escape(str(e)))
+        raise Exit(1) from e
+    print_dependency_tree(package_manager.get_lock_graph(), group)
 
 
 def get_version() -> str:
@@ -94,6 +326,7 @@ def get_version() -> str:
     return pyproject.version
 
 
+@project_lock()
 def change_version(
     new_version: str | None = None,
     bump_rule: Literal["major", "minor", "patch"] | None = None,
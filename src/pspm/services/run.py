@@ -1,43 +1,88 @@
 """Module to interact with command runner."""
 
-from os import environ
+from __future__ import annotations
+
+import os
 from pathlib import Path
 
+from rich.markup import escape
+from typer import Exit
+
 from pspm.entities.command_runner import CommandRunner
 from pspm.entities.venv_runner import VenvRunner
 from pspm.entities.virtual_env import VirtualEnv
 from pspm.errors.command import CommandRunError
+from pspm.errors.settings import EnvironmentNotFoundError
+from pspm.services.settings import get_venv_settings
+from pspm.utils.dotenv import load_dotenv_files
 from pspm.utils.printing import print_error
 
 
-def _get_runner() -> VenvRunner:
-    virtual_env = VirtualEnv()
+def _get_runner(env: str | None = None) -> VenvRunner:
+    try:
+        settings = get_venv_settings(env)
+    except EnvironmentNotFoundError as e:
+        print_error(escape(str(e)))
+        raise Exit(1) from e
+    virtual_env = VirtualEnv(path=settings.path, python=settings.python)
     command_runner = CommandRunner()
     return VenvRunner(virtual_env, command_runner)
 
 
-def load_dotenv() -> None:
-    """Load env vars from dotenv file."""
-    path = Path(".env")
-    if not path.exists():
-        return
-    text = path.read_text()
-    lines = text.rsplit()
-    for line in lines:
-        key, value = line.split("=")
-        environ[key] = value
+def load_dotenv(profile: str | None = None) -> dict[str, str]:
+    """Load env vars from dotenv files.
 
+    Files are loaded in order `.env`, `.env.local` and `.env.<profile>`,
+    values from later files take precedence.
+
+    Args:
+        profile: Profile whose dotenv file is loaded last
 
-def run_command(command: str, arguments: list[str]) -> None:
+    Returns:
+        Env vars defined in dotenv files
+    """
+    paths = [Path(".env"), Path(".env.local")]
+    if profile:
+        paths.append(Path(f".env.{profile}"))
+    return load_dotenv_files(paths)
+
+
+def run_command(
+    command: str,
+    arguments: list[str],
+    *,
+    replace_process: bool | None = None,
+    profile: str | None = None,
+    env: str | None = None,
+) -> None:
     """Load dotenv and run a command.
 
     Args:
         command: Command to run
         arguments: Arguments to pass to command
+        profile: Profile of dotenv file to load
+        replace_process: Whether to replace pspm process with the command,
+            defaults to True on POSIX systems
+        env: Named environment to run command in, the default one if None
+
+    Raises:
+        Exit: With the command return code if it fails
     """
-    load_dotenv()
-    runner = _get_runner()
+    environment = load_dotenv(profile)
+    runner = _get_runner(env)
+    if replace_process is None:
+        replace_process = os.name == "posix"
     try:
-        runner.run(command, arguments)
+        retcode = runner.run(
+            command,
+            arguments,
+            environment=environment,
+            replace_process=replace_process,
+        )
     except CommandRunError as e:
         print_error(str(e))
+        raise Exit(1) from e
+    if retcode < 0:
+        retcode = 128 - retcode
+    if retcode != 0:
+        raise Exit(retcode)
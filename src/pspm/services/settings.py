@@ -0,0 +1,145 @@
+"""Module to read project settings."""
+
+from __future__ import annotations
+
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+from pspm.entities.pyproject import Pyproject
+from pspm.entities.toml import Toml
+from pspm.errors.settings import EnvironmentNotFoundError
+
+_VERSION_PATTERN = re.compile(r"\d+(?:\.\d+)*")
+# Lower bounds of a requires-python specifier
+_LOWER_BOUND_PATTERN = re.compile(r"(?:>=|~=|==)\s*(\d+(?:\.\d+)*)")
+
+
+@dataclass(frozen=True)
+class VenvSettings:
+    """Where the virtualenv lives, which Python it uses and what it syncs.
+
+    Attributes:
+        path: Virtualenv path
+        python: Python version or interpreter path, uv default if None
+        groups: Extra groups synced into the virtualenv, all if None
+    """
+
+    path: Path
+    python: str | None = None
+    groups: list[str] | None = None
+
+    @property
+    def resolver_python(self) -> str | None:
+        """Python to resolve dependencies for.
+
+        Returns:
+            Virtualenv path if it exists, otherwise configured Python
+        """
+        return str(self.path) if self.path.exists() else self.python
+
+
+def get_venv_settings(env: str | None = None) -> VenvSettings:
+    """Read virtualenv settings.
+
+    `PSPM_VENV` and `PSPM_PYTHON` env vars take precedence over the
+    `venv` and `python` keys of `[tool.pspm]` in pyproject.toml. Paths
+    may use `~` and env vars and are relative to the project directory.
+
+    Named environments are declared in `[tool.pspm.envs.<name>]` with
+    their own `venv`, `python` and `groups`. By default they live next
+    to the default virtualenv, with the name as suffix.
+
+    Args:
+        env: Name of the environment, the default one if None
+
+    Returns:
+        Virtualenv settings
+
+    Raises:
+        EnvironmentNotFoundError: If environment is not declared
+    """
+    venv = os.environ.get("PSPM_VENV")
+    python = os.environ.get("PSPM_PYTHON")
+    pyproject = None
+    if (env or not (venv and python)) and Path("pyproject.toml").exists():
+        pyproject = Pyproject(Toml("pyproject.toml"))
+        venv = venv or pyproject.get_venv_path()
+        python = python or pyproject.get_python()
+    path = _expand_path(venv or ".venv")
+    if env is None:
+        return VenvSettings(path, python or None)
+
+    settings = pyproject.get_envs().get(env) if pyproject else None
+    if settings is None:
+        raise EnvironmentNotFoundError(env)
+    groups = settings.get("groups")
+    return VenvSettings(
+        (
+            _expand_path(settings["venv"])
+            if "venv" in settings
+            else path.with_name(f"{path.name}-{env}")
+        ),
+        settings.get("python", python) or None,
+        None if groups is None else list(groups),
+    )
+
+
+def get_resolver_python_version() -> str | None:
+    """Find the Python version to resolve lock files for.
+
+    Lock files are shared by all environments, so when named environments
+    declare their own Python they are resolved for the lowest Python of
+    the environments. Pythons that are not plain versions (e.g. paths)
+    count as the lower bound of the project `requires-python`, and so
+    does the default one when it is neither declared nor created yet.
+
+    Returns:
+        Lowest Python version, None to resolve for the default Python
+    """
+    if not Path("pyproject.toml").exists():
+        return None
+    pyproject = Pyproject(Toml("pyproject.toml"))
+    pythons = [
+        env["python"]
+        for env in pyproject.get_envs().values()
+        if "python" in env
+    ]
+    if not pythons:
+        return None
+    default = get_venv_settings()
+    pythons.append(default.python or _get_venv_version(default.path))
+    lower_bound = _get_lower_bound(pyproject.requires_python)
+    versions = [
+        python
+        if python and _VERSION_PATTERN.fullmatch(python)
+        else lower_bound
+        for python in pythons
+    ]
+    known = [v for v in versions if v]
+    return min(known, key=_version_key) if known else None
+
+
+def _get_venv_version(path: Path) -> str | None:
+    try:
+        config = (path / "pyvenv.cfg").read_text("utf-8")
+    except OSError:
+        return None
+    match = re.search(
+        r"^version(?:_info)?\s*=\s*(\d+\.\d+)", config, re.MULTILINE
+    )
+    return match.group(1) if match else None
+
+
+def _get_lower_bound(requires_python: str | None) -> str | None:
+    bounds = _LOWER_BOUND_PATTERN.findall(requires_python or "")
+    return min(bounds, key=_version_key) if bounds else None
+
+
+def _version_key(version: str) -> tuple[int, ...]:
+    return tuple(int(part) for part in version.split("."))
+
+
+def _expand_path(path: str) -> Path:
+    return Path(os.path.expandvars(path)).expanduser()
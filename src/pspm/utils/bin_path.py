@@ -1,22 +1,58 @@
-"""Module to find paths to binaries."""
+"""Module to find paths to binaries.
 
+Paths are looked up once per process and reused while the binary still
+exists, so PATH is not walked by every entity that needs a tool.
+"""
+
+from __future__ import annotations
+
+import os
 import shutil
+from pathlib import Path
 
 from typer import Exit
 
 from pspm.utils.printing import print_error
 
+_paths: dict[str, str] = {}
+
+
+def _exists(path: str) -> bool:
+    try:
+        Path(path).stat()
+    except OSError:
+        return False
+    return True
+
+
+def _find_tool(name: str, override_var: str | None = None) -> str | None:
+    override = os.environ.get(override_var) if override_var else None
+    if override:
+        return override if _exists(override) else None
+
+    cached = _paths.get(name)
+    if cached and _exists(cached):
+        return cached
+    path = shutil.which(name)
+    if path:
+        _paths[name] = path
+    else:
+        _paths.pop(name, None)
+    return path
+
 
 def get_uv_path() -> str:
     """Finds uv binary path.
 
+    The `PSPM_UV` env var can be set to use a specific uv binary.
+
     Returns:
         Path to uv binary
 
     Raises:
         Exit: If UV path was not found
     """
-    path = shutil.which("uv")
+    path = _find_tool("uv", "PSPM_UV")
     if not path:
         print_error(
             r"UV command not found, can be installed by running "
@@ -24,3 +60,12 @@ def get_uv_path() -> str:
         )
         raise Exit
     return path
+
+
+def get_git_path() -> str | None:
+    """Finds git binary path.
+
+    Returns:
+        Path to git binary, if found
+    """
+    return _find_tool("git")
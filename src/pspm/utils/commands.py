@@ -3,7 +3,8 @@
 from __future__ import annotations
 
 import subprocess
-from shutil import which
+
+from pspm.utils.bin_path import get_git_path, get_uv_path
 
 
 def get_git_user() -> dict[str, str] | None:
@@ -13,7 +14,7 @@ def get_git_user() -> dict[str, str] | None:
         Git user with name and email
     """
     user: dict[str, str] = {}
-    git_path = which("git")
+    git_path = get_git_path()
     if not git_path:
         return None
     for field in ["name", "email"]:
@@ -27,3 +28,36 @@ def get_git_user() -> dict[str, str] | None:
             return None
         user[field] = output.strip().decode()
     return user
+
+
+def get_uv_cache_dir() -> str | None:
+    """Retrieve cache directory used by uv.
+
+    Returns:
+        Path to uv cache directory, if uv could report it
+    """
+    try:
+        output = subprocess.check_output([get_uv_path(), "cache", "dir"])
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.strip().decode()
+
+
+def get_python_version(python: str | None = None) -> str | None:
+    """Retrieve version of the Python interpreter uv would use.
+
+    Args:
+        python: Python version or interpreter to find, the default
+            Python found by uv if None
+
+    Returns:
+        Python version, if uv could find an interpreter
+    """
+    args = [get_uv_path(), "python", "find", "--show-version"]
+    if python:
+        args.append(python)
+    try:
+        output = subprocess.check_output(args, stderr=subprocess.DEVNULL)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.strip().decode() or None
@@ -0,0 +1,142 @@
+"""Utils functions to parse dotenv files."""
+
+from __future__ import annotations
+
+import os
+import re
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Mapping
+    from pathlib import Path
+
+_KEY_PATTERN = re.compile(
+    r"^\s*(?:export\s+)?([A-Za-z_][A-Za-z0-9_.]*)\s*=\s*(.*)$"
+)
+_VARIABLE_PATTERN = re.compile(
+    r"\\\$"
+    r"|\$\{([A-Za-z_][A-Za-z0-9_]*)(?::?-([^}]*))?\}"
+    r"|\$([A-Za-z_][A-Za-z0-9_]*)"
+)
+_ESCAPES = {"n": "\n", "r": "\r", "t": "\t", '"': '"', "\\": "\\", "$": "\\$"}
+
+# Entries are (key, value, whether value should be interpolated)
+_Entry = tuple[str, str, bool]
+_cache: dict[Path, tuple[tuple[int, int], list[_Entry]]] = {}
+
+
+def load_dotenv_files(
+    paths: list[Path], environ: Mapping[str, str] | None = None
+) -> dict[str, str]:
+    """Load env vars from dotenv files, later files take precedence.
+
+    Values can reference variables with `${VAR}`, `${VAR:-default}` or
+    `$VAR`, which are looked up in the values loaded so far and then in
+    `environ`.
+
+    Args:
+        paths: Dotenv files to load, missing files are ignored
+        environ: Environment used for interpolation, defaults to os.environ
+
+    Returns:
+        Env vars defined in dotenv files
+    """
+    environ = os.environ if environ is None else environ
+    values: dict[str, str] = {}
+    for path in paths:
+        for key, value, interpolate in _parse_cached(path):
+            values[key] = (
+                _interpolate(value, values, environ) if interpolate else value
+            )
+    return values
+
+
+def _parse_cached(path: Path) -> list[_Entry]:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return []
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _cache.get(path)
+    if cached is None or cached[0] != key:
+        with path.open(encoding="utf-8") as f:
+            cached = (key, list(parse_dotenv(f)))
+        _cache[path] = cached
+    return cached[1]
+
+
+def parse_dotenv(lines: Iterator[str]) -> Iterator[_Entry]:
+    """Parse dotenv lines without interpolating values.
+
+    Args:
+        lines: Lines of dotenv file
+
+    Yields:
+        Tuples of key, value and whether value should be interpolated
+    """
+    for line in lines:
+        match = _KEY_PATTERN.match(line)
+        if not match:
+            continue
+        key, raw_value = match.groups()
+        raw_value = raw_value.strip()
+        quote = raw_value[:1]
+        if quote not in {'"', "'"}:
+            value = re.split(r"\s+#", raw_value, maxsplit=1)[0].rstrip()
+            yield key, value, True
+            continue
+
+        value = raw_value[1:]
+        while not _has_closing_quote(value, quote):
+            next_line = next(lines, None)
+            if next_line is None:
+                break
+            value += "\n" + next_line.rstrip("\r\n")
+        value = _strip_closing_quote(value, quote)
+        if quote == "'":
+            yield key, value, False
+        else:
+            yield key, _unescape(value), True
+
+
+def _has_closing_quote(value: str, quote: str) -> bool:
+    return _find_closing_quote(value, quote) != -1
+
+
+def _find_closing_quote(value: str, quote: str) -> int:
+    escaped = False
+    for index, char in enumerate(value):
+        if escaped:
+            escaped = False
+        elif char == "\\" and quote == '"':
+            escaped = True
+        elif char == quote:
+            return index
+    return -1
+
+
+def _strip_closing_quote(value: str, quote: str) -> str:
+    index = _find_closing_quote(value, quote)
+    return value if index == -1 else value[:index]
+
+
+def _unescape(value: str) -> str:
+    return re.sub(
+        r"\\(.)", lambda m: _ESCAPES.get(m.group(1), m.group(0)), value
+    )
+
+
+def _interpolate(
+    value: str, values: Mapping[str, str], environ: Mapping[str, str]
+) -> str:
+    def replace(match: re.Match[str]) -> str:
+        if match.group(0) == "\\$":
+            return "$"
+        name = match.group(1) or match.group(3)
+        default = match.group(2)
+        found = values.get(name, environ.get(name))
+        if not found and default is not None:
+            return default
+        return found or ""
+
+    return _VARIABLE_PATTERN.sub(replace, value)
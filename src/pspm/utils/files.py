@@ -0,0 +1,224 @@
+"""Utils functions to safely write project files."""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import shutil
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from rich import print as rprint
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+STATE_DIRECTORY = Path(".pspm")
+
+# Project locks held by this process, to allow nested acquisitions
+_held_locks: dict[Path, int] = {}
+
+
+def create_temp_file(path: str | Path) -> Path:
+    """Create an empty temporary file next to a file.
+
+    The temporary file gets the permissions of the file, if it exists,
+    so it can replace it without changing them.
+
+    Args:
+        path: File to be replaced by the temporary file
+
+    Returns:
+        Path to temporary file
+    """
+    path = Path(path)
+    temp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+    os.close(os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666))
+    with contextlib.suppress(FileNotFoundError):
+        temp_path.chmod(path.stat().st_mode)
+    return temp_path
+
+
+def replace_file(temp_path: str | Path, path: str | Path) -> None:
+    """Flush a temporary file to disk and move it over a file.
+
+    Args:
+        temp_path: Temporary file with the new content
+        path: File to replace
+    """
+    fd = os.open(temp_path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    Path(temp_path).replace(path)
+    if sys.platform != "win32":
+        directory_fd = os.open(Path(path).parent, os.O_RDONLY)
+        try:
+            os.fsync(directory_fd)
+        finally:
+            os.close(directory_fd)
+
+
+def atomic_write(path: str | Path, data: bytes) -> None:
+    """Write a file so readers either see its old or new content.
+
+    Args:
+        path: File to write
+        data: Content to write
+    """
+    temp_path = create_temp_file(path)
+    try:
+        temp_path.write_bytes(data)
+        replace_file(temp_path, path)
+    finally:
+        temp_path.unlink(missing_ok=True)
+
+
+def write_if_changed(path: str | Path, data: bytes) -> bool:
+    """Atomically write a file, unless it already has the content.
+
+    Keeps the modification time of unchanged files, so tools caching
+    on them are not invalidated.
+
+    Args:
+        path: File to write
+        data: Content to write
+
+    Returns:
+        Whether the file was written
+    """
+    path = Path(path)
+    if path.exists() and path.read_bytes() == data:
+        return False
+    atomic_write(path, data)
+    return True
+
+
+def ensure_state_directory(directory: Path = STATE_DIRECTORY) -> Path:
+    """Create project state directory, ignored by git.
+
+    Args:
+        directory: State directory
+
+    Returns:
+        State directory
+    """
+    if not directory.exists():
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / ".gitignore").write_text("*\n", "utf-8")
+    return directory
+
+
+def clone_tree(source: Path, destination: Path) -> None:
+    """Copy a directory tree, hard linking its files when possible.
+
+    Files are copied instead when they can't be linked, e.g. when the
+    destination is in another file system. Symlinks are kept as symlinks.
+
+    Args:
+        source: Directory to clone
+        destination: Directory to create
+    """
+    _clone_directory(os.fspath(source), os.fspath(destination), link=True)
+
+
+def _clone_directory(source: str, destination: str, *, link: bool) -> bool:
+    # Plain strings and scandir entries, since venvs have many files
+    os.mkdir(destination)  # noqa: PTH102
+    shutil.copystat(source, destination)
+    with os.scandir(source) as entries:
+        for entry in entries:
+            target = os.path.join(destination, entry.name)  # noqa: PTH118
+            if entry.is_symlink():
+                os.symlink(os.readlink(entry.path), target)  # noqa: PTH115, PTH211
+            elif entry.is_dir():
+                link = _clone_directory(entry.path, target, link=link)
+            else:
+                if link:
+                    try:
+                        os.link(entry.path, target)
+                        continue
+                    except OSError:
+                        link = False
+                shutil.copy2(entry.path, target)
+    return link
+
+
+@contextlib.contextmanager
+def project_lock(
+    path: Path | None = None, poll_interval: float = 0.1
+) -> Generator[None, None, None]:
+    """Hold an advisory lock so concurrent commands run one at a time.
+
+    Can be acquired again by the process holding it. Can also be used
+    as a decorator.
+
+    Args:
+        path: Lock file path, defaults to a file in project state
+            directory, which is only created inside a project
+        poll_interval: Seconds to wait between attempts to acquire lock
+
+    Yields:
+        Nothing, lock is held until context exits
+    """
+    if path is None:
+        if not Path("pyproject.toml").exists():
+            # Nothing to lock, the command reports the missing project
+            yield
+            return
+        path = ensure_state_directory() / "lock"
+    path = path.absolute()
+    if path in _held_locks:
+        _held_locks[path] += 1
+        try:
+            yield
+        finally:
+            _held_locks[path] -= 1
+        return
+
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o666)
+    try:
+        if not _try_lock(fd):
+            rprint(":hourglass: Waiting for another spm command to finish")
+            while not _try_lock(fd):
+                time.sleep(poll_interval)
+        _held_locks[path] = 1
+        try:
+            yield
+        finally:
+            del _held_locks[path]
+            _unlock(fd)
+    finally:
+        os.close(fd)
+
+
+if sys.platform == "win32":
+    import msvcrt
+
+    def _try_lock(fd: int) -> bool:
+        try:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        except OSError:
+            return False
+        return True
+
+    def _unlock(fd: int) -> None:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+else:
+    import fcntl
+
+    def _try_lock(fd: int) -> bool:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+        return True
+
+    def _unlock(fd: int) -> None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
@@ -0,0 +1,35 @@
+"""Utils functions to compute content digests."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+
+
+def hash_data(data: object) -> str:
+    """Compute a stable digest of JSON serializable data.
+
+    Args:
+        data: Data to hash
+
+    Returns:
+        Hex digest of data
+    """
+    serialized = json.dumps(data, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(serialized.encode()).hexdigest()
+
+
+def hash_file(path: str | Path) -> str | None:
+    """Compute digest of file content.
+
+    Args:
+        path: Path to file
+
+    Returns:
+        Hex digest of file content or None if file does not exist
+    """
+    try:
+        return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+    except FileNotFoundError:
+        return None
@@ -1,6 +1,9 @@
 """Utils functions to use rich print."""
 
+from __future__ import annotations
+
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from rich import print as rprint
 from rich.markup import escape
@@ -8,6 +11,9 @@ from rich.panel import Panel
 from rich.text import Text
 from rich.tree import Tree
 
+if TYPE_CHECKING:
+    from pspm.entities.lock_file import LockDiff, LockedPackage, LockGraph
+
 
 def print_error(error_message: str) -> None:
     """Print error message.
@@ -62,3 +68,94 @@ def _walk_directory(directory: Path, tree: Tree) -> None:
             text_filename = Text(path.name)
             text_filename.stylize(str(path))
             tree.add(text_filename)
+
+
+def print_dependency_paths(
+    package: LockedPackage, paths: list[list[str]]
+) -> None:
+    """Print why a package is locked.
+
+    Args:
+        package: Locked package
+        paths: Paths from packages required by the project to the package
+    """
+    groups = ", ".join(g or "main" for g in package.groups)
+    tree = Tree(f"{_format_package(package)} [dim]({groups})[/dim]")
+    for path in paths:
+        tree.add(" :arrow_right: ".join(f"[blue]{p}[/blue]" for p in path))
+    rprint(tree)
+
+
+def print_dependency_tree(
+    graph: LockGraph, group: str | None = None, title: str = ""
+) -> None:
+    """Print tree of packages locked by a group.
+
+    Args:
+        graph: Dependency graph of locked packages
+        group: Group to print tree, None for main
+        title: Tree title
+    """
+    tree = Tree(title or f":package: {group or 'main'}")
+    expanded: set[str] = set()
+    for root in sorted(graph.get_roots(group)):
+        _add_dependency_branch(graph, group, root, tree, expanded)
+    rprint(tree)
+
+
+def print_lock_diff(diff: LockDiff) -> None:
+    """Print changes in locked packages.
+
+    Args:
+        diff: Changes in locked packages
+    """
+    lines = [
+        *(f" [green]+[/green] {_format_package(p)}" for p in diff.added),
+        *(f" [red]-[/red] {_format_package(p)}" for p in diff.removed),
+        *(
+            f" [blue]↑[/blue] {_format_change(old, new)}"
+            for old, new in diff.upgraded
+        ),
+        *(
+            f" [yellow]↓[/yellow] {_format_change(old, new)}"
+            for old, new in diff.downgraded
+        ),
+        *(
+            f" [magenta]~[/magenta] {_format_change(old, new)}"
+            for old, new in diff.changed
+        ),
+    ]
+    for line in lines:
+        rprint(line)
+
+
+def _format_change(old: LockedPackage, new: LockedPackage) -> str:
+    return (
+        f"[blue]{escape(new.name)}[/blue] "
+        f"{escape(old.version or old.requirement)} :arrow_right: "
+        f"{escape(new.version or new.requirement)}"
+    )
+
+
+def _format_package(package: LockedPackage) -> str:
+    version = f"=={package.version}" if package.version else ""
+    return f"[blue]{escape(package.name)}[/blue]{escape(version)}"
+
+
+def _add_dependency_branch(
+    graph: LockGraph,
+    group: str | None,
+    name: str,
+    tree: Tree,
+    expanded: set[str],
+) -> None:
+    package = graph.get(name)
+    if package is None or group not in package.groups:
+        return
+    if name in expanded:
+        tree.add(f"{_format_package(package)} [dim](*)[/dim]")
+        return
+    expanded.add(name)
+    branch = tree.add(_format_package(package))
+    for dependency in sorted(graph.dependencies(name)):
+        _add_dependency_branch(graph, group, dependency, branch, expanded)
@@ -0,0 +1,458 @@
+"""Utils functions to edit TOML documents preserving their format."""
+
+from __future__ import annotations
+
+import difflib
+import re
+import sys
+from dataclasses import dataclass
+
+import tomli_w
+
+if sys.version_info >= (3, 11):
+    import tomllib
+else:
+    import tomli as tomllib
+
+_KEY = r"""(?:[A-Za-z0-9_-]+|"(?:[^"\\\n]|\\.)*"|'[^'\n]*')"""
+_KEY_PATH = rf"{_KEY}(?:[ \t]*\.[ \t]*{_KEY})*"
+_KEY_PART = re.compile(_KEY)
+_BLANK = re.compile(r"(?:[ \t\r\n]+|#[^\n]*)*")
+_HEADER = re.compile(
+    rf"(\[\[?)[ \t]*({_KEY_PATH})[ \t]*\]\]?[ \t]*(?:#[^\n]*)?"
+)
+_KEY_VALUE = re.compile(rf"({_KEY_PATH})[ \t]*=[ \t]*")
+_BARE_KEY = re.compile(r"[A-Za-z0-9_-]+")
+_BASIC_STRING = re.compile(r'"(?:[^"\\\n]|\\.)*"')
+_LITERAL_STRING = re.compile(r"'[^'\n]*'")
+_SCALAR = re.compile(r"[^\n#,\]\}]*")
+# Arrays without nested arrays, tables or multi-line strings
+_FLAT_ARRAY = re.compile(
+    r"""\[[^\[\]{}"'#]*"""
+    r"""(?:(?:"(?!"")[^"\\\n]*(?:\\.[^"\\\n]*)*"|'(?!'')[^'\n]*'|#[^\n]*)"""
+    r"""[^\[\]{}"'#]*)*\]"""
+)
+_DELIMITER = re.compile(r"\"\"\"|'''|[\"'#\[\]\{\}]")
+# Rest of an array item line: its comma and comment, if any
+_ITEM_LINE_END = re.compile(r"[ \t]*,?[ \t]*(?:#[^\n]*)?\n")
+
+
+@dataclass
+class _Statement:
+    keys: tuple[str, ...]
+    end: int
+    value_start: int = -1
+    is_header: bool = False
+    is_array_table: bool = False
+    start: int = 0
+
+
+class _UnsupportedError(Exception):
+    """Document can't be patched in place."""
+
+
+def patch_toml(text: str, keys: list[str], value: object) -> str | None:
+    """Set a value in a TOML document, preserving the rest of it.
+
+    Only the text of the value is replaced. Arrays are edited item by
+    item, keeping comments and formatting of untouched items. New keys are
+    appended to their table and new tables to the document. Only the
+    inserted text is parsed again, to check it holds the value.
+
+    Args:
+        text: TOML document
+        keys: Path of keys to the value
+        value: Value to set
+
+    Returns:
+        Patched document or None if it can't be patched in place
+    """
+    try:
+        return _patch(text, tuple(keys), value)
+    except _UnsupportedError:
+        return None
+
+
+def remove_toml_key(text: str, keys: list[str]) -> str | None:
+    """Remove a key or table from a TOML document, preserving the rest.
+
+    Only the lines of the key, or the header and body of the table, are
+    removed. Nothing else may define the key or its subtables.
+
+    Args:
+        text: TOML document
+        keys: Path of keys to remove
+
+    Returns:
+        Document without the key or None if it can't be removed in place
+    """
+    try:
+        return _remove(text, tuple(keys))
+    except _UnsupportedError:
+        return None
+
+
+def _remove(text: str, keys: tuple[str, ...]) -> str:
+    statements = _parse_statements(text)
+    index = next(
+        (
+            i
+            for i, s in enumerate(statements)
+            if s.keys == keys and not s.is_array_table
+        ),
+        None,
+    )
+    if index is None:
+        removed, start, end = text, 0, 0
+    elif not statements[index].is_header:
+        statement = statements[index]
+        start = text.rfind("\n", 0, statement.start) + 1
+        line_end = _line_end(text, statement.end)
+        if _skip_blank(text, statement.end) < line_end - 1:
+            raise _UnsupportedError
+        removed = text[:start] + text[line_end:]
+        start, end = index, index + 1
+    else:
+        statement = statements[index]
+        end = next(
+            (
+                i
+                for i in range(index + 1, len(statements))
+                if statements[i].is_header
+                and not _is_prefix(keys, statements[i].keys)
+            ),
+            len(statements),
+        )
+        if end < len(statements):
+            removed = text[: statement.start] + text[statements[end].start :]
+        else:
+            kept = text[: statement.start].rstrip("\n")
+            removed = f"{kept}\n" if kept else ""
+        start = index
+    # Key must not be defined elsewhere, e.g. with dotted or inline tables
+    if any(
+        s.keys == keys
+        or _is_prefix(keys, s.keys)
+        or (_is_prefix(s.keys, keys) and not s.is_header)
+        for s in statements[:start] + statements[end:]
+    ):
+        raise _UnsupportedError
+    return removed
+
+
+def _patch(text: str, keys: tuple[str, ...], value: object) -> str:
+    table = keys[:-1]
+    statements = _parse_statements(text)
+    in_table = not table
+    section_end: int | None = 0 if in_table else None
+    for statement in statements:
+        if _is_prefix(keys, statement.keys) or (
+            statement.is_header and statement.keys == keys
+        ):
+            # Value is a table, it can't be set as a key
+            raise _UnsupportedError
+        if statement.is_header:
+            in_table = statement.keys == table and not statement.is_array_table
+            if in_table:
+                section_end = statement.end
+        elif statement.keys == keys:
+            rendered = _render_value(
+                text, statement.value_start, statement.end, value
+            )
+            _check_fragment(f"v = {rendered}\n", ("v",), value)
+            return (
+                text[: statement.value_start]
+                + rendered
+                + text[statement.end :]
+            )
+        elif _is_prefix(statement.keys, keys):
+            raise _UnsupportedError
+        elif in_table:
+            section_end = _line_end(text, statement.end)
+
+    line = f"{_render_key(keys[-1])} = {_render_new_value(value)}\n"
+    if section_end is not None:
+        _check_fragment(line, keys[-1:], value)
+        if section_end > 0 and text[section_end - 1] != "\n":
+            line = "\n" + line
+        return text[:section_end] + line + text[section_end:]
+    return _add_table(text, statements, keys, line, value)
+
+
+def _check_fragment(
+    fragment: str, keys: tuple[str, ...], value: object
+) -> None:
+    # Never splice in text that doesn't hold the value
+    try:
+        table = tomllib.loads(fragment)
+        for key in keys:
+            table = table[key]
+    except (tomllib.TOMLDecodeError, KeyError, TypeError):
+        raise _UnsupportedError from None
+    if table != value:
+        raise _UnsupportedError
+
+
+def _add_table(
+    text: str,
+    statements: list[_Statement],
+    keys: tuple[str, ...],
+    line: str,
+    value: object,
+) -> str:
+    table = keys[:-1]
+    if any(
+        _is_prefix(s.keys, table)
+        or _is_prefix(table, s.keys)
+        or (s.is_header and s.keys == table)
+        for s in statements
+        if not s.is_header or s.keys == table
+    ):
+        raise _UnsupportedError
+    header = f"[{'.'.join(_render_key(k) for k in table)}]\n"
+    _check_fragment(header + line, keys, value)
+    if not text:
+        separator = ""
+    elif text.endswith("\n"):
+        separator = "\n"
+    else:
+        separator = "\n\n"
+    return f"{text}{separator}{header}{line}"
+
+
+def _parse_statements(text: str) -> list[_Statement]:
+    statements: list[_Statement] = []
+    section: tuple[str, ...] = ()
+    position = _skip_blank(text, 0)
+    while position < len(text):
+        if text[position] == "[":
+            match = _HEADER.match(text, position)
+            if not match:
+                raise _UnsupportedError
+            section = _parse_keys(match.group(2))
+            statements.append(
+                _Statement(
+                    section,
+                    match.end(),
+                    is_header=True,
+                    is_array_table=match.group(1) == "[[",
+                    start=position,
+                )
+            )
+            end = match.end()
+        else:
+            match = _KEY_VALUE.match(text, position)
+            if not match:
+                raise _UnsupportedError
+            end = _skip_value(text, match.end())
+            statements.append(
+                _Statement(
+                    (*section, *_parse_keys(match.group(1))),
+                    end,
+                    value_start=match.end(),
+                    start=position,
+                )
+            )
+        position = _skip_blank(text, end)
+    return statements
+
+
+def _parse_keys(key_path: str) -> tuple[str, ...]:
+    keys: list[str] = []
+    for match in _KEY_PART.finditer(key_path):
+        key = match.group(0)
+        if key[0] == '"':
+            key = tomllib.loads(f"k = {key}")["k"]
+        elif key[0] == "'":
+            key = key[1:-1]
+        keys.append(key)
+    return tuple(keys)
+
+
+def _skip_blank(text: str, position: int) -> int:
+    match = _BLANK.match(text, position)
+    return match.end() if match else position
+
+
+def _skip_value(text: str, position: int) -> int:
+    if text.startswith(('"""', "'''"), position):
+        return _skip_multiline_string(text, position)
+    char = text[position : position + 1]
+    if char == "[":
+        match = _FLAT_ARRAY.match(text, position)
+        return match.end() if match else _skip_brackets(text, position)
+    if char == "{":
+        return _skip_brackets(text, position)
+    if char == '"':
+        match = _BASIC_STRING.match(text, position)
+    elif char == "'":
+        match = _LITERAL_STRING.match(text, position)
+    else:
+        match = _SCALAR.match(text, position)
+        if match and match.group(0).strip():
+            return position + len(match.group(0).rstrip())
+        match = None
+    if not match:
+        raise _UnsupportedError
+    return match.end()
+
+
+def _skip_multiline_string(text: str, position: int) -> int:
+    quote = text[position : position + 3]
+    search = position + 3
+    while True:
+        end = text.find(quote, search)
+        if end == -1:
+            raise _UnsupportedError
+        escapes = end - len(text[search:end].rstrip("\\")) - search
+        if quote == "'''" or escapes % 2 == 0:
+            end += 3
+            while text[end : end + 1] == quote[0]:
+                end += 1
+            return end
+        search = end + 1
+
+
+def _skip_brackets(text: str, position: int) -> int:
+    depth = 0
+    while True:
+        match = _DELIMITER.search(text, position)
+        if not match:
+            raise _UnsupportedError
+        delimiter = match.group(0)
+        position = match.start()
+        if delimiter in {"[", "{"}:
+            depth += 1
+            position += 1
+        elif delimiter in {"]", "}"}:
+            depth -= 1
+            position += 1
+            if depth == 0:
+                return position
+        elif delimiter == "#":
+            position = _line_end(text, position)
+        else:
+            position = _skip_value(text, position)
+
+
+def _split_array(text: str, start: int, end: int) -> list[tuple[int, int]]:
+    items: list[tuple[int, int]] = []
+    position = _skip_blank(text, start + 1)
+    while position < end - 1:
+        item_end = _skip_value(text, position)
+        items.append((position, item_end))
+        position = _skip_blank(text, item_end)
+        if text[position] == ",":
+            position = _skip_blank(text, position + 1)
+        elif position < end - 1:
+            raise _UnsupportedError
+    return items
+
+
+def _render_value(text: str, start: int, end: int, value: object) -> str:
+    if not isinstance(value, list) or text[start] != "[":
+        return _render_new_value(value)
+    items = _split_array(text, start, end)
+    if not items or not _items_on_own_lines(text, start, end, items):
+        return _render_array(value, multiline="\n" in text[start:end])
+
+    # Each item owns its line and the comment lines above it
+    regions: list[tuple[int, int]] = []
+    region_start = _line_end(text, start)
+    for _, item_end in items:
+        regions.append((region_start, _line_end(text, item_end)))
+        region_start = regions[-1][1]
+    old_values = tomllib.loads(f"v = {text[start:end]}")["v"]
+    parts = _diff_items(text, items, regions, old_values, value)
+
+    last = len(items) - 1
+    if text[_skip_blank(text, items[last][1])] != ",":
+        comma_at = items[last][1] - regions[last][0]
+        for position, (part, index) in enumerate(parts[:-1]):
+            if index == last:
+                part_with_comma = f"{part[:comma_at]},{part[comma_at:]}"
+                parts[position] = (part_with_comma, index)
+    return (
+        text[start : regions[0][0]]
+        + "".join(part for part, _ in parts)
+        + text[regions[-1][1] : end]
+    )
+
+
+def _diff_items(
+    text: str,
+    items: list[tuple[int, int]],
+    regions: list[tuple[int, int]],
+    old_values: list[object],
+    value: list[object],
+) -> list[tuple[str, int | None]]:
+    # Array lines, paired with the index of the item they come from
+    first_item = items[0][0]
+    indent = text[text.rfind("\n", 0, first_item) + 1 : first_item]
+    parts: list[tuple[str, int | None]] = []
+    matcher = difflib.SequenceMatcher(a=old_values, b=value, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            parts.extend((text[slice(*regions[i])], i) for i in range(i1, i2))
+        elif tag == "replace" and i2 - i1 == j2 - j1:
+            for index, new_value in zip(range(i1, i2), value[j1:j2]):
+                item_start, item_end = items[index]
+                parts.append((
+                    text[regions[index][0] : item_start]
+                    + _render_new_value(new_value)
+                    + text[item_end : regions[index][1]],
+                    index,
+                ))
+        else:
+            parts.extend(
+                (f"{indent}{_render_new_value(v)},\n", None)
+                for v in value[j1:j2]
+            )
+    return parts
+
+
+def _items_on_own_lines(
+    text: str, start: int, end: int, items: list[tuple[int, int]]
+) -> bool:
+    # Only blank lines and comments between items and around brackets
+    if "\n" not in text[start + 1 : items[0][0]]:
+        return False
+    previous_end = start + 1
+    for item_start, item_end in items:
+        if _skip_blank(text, previous_end) != item_start:
+            return False
+        line_end = _ITEM_LINE_END.match(text, item_end)
+        if not line_end:
+            return False
+        previous_end = line_end.end()
+    return _skip_blank(text, previous_end) == end - 1
+
+
+def _line_end(text: str, position: int) -> int:
+    newline = text.find("\n", position)
+    return len(text) if newline == -1 else newline + 1
+
+
+def _render_array(value: list[object], *, multiline: bool) -> str:
+    if not value:
+        return "[]"
+    if multiline:
+        items = "".join(f"    {_render_new_value(v)},\n" for v in value)
+        return f"[\n{items}]"
+    return f"[{', '.join(_render_new_value(v) for v in value)}]"
+
+
+def _render_new_value(value: object) -> str:
+    if isinstance(value, list) and not any(isinstance(v, dict) for v in value):
+        return _render_array(value, multiline=True)
+    return tomli_w.dumps({"v": value}).removeprefix("v = ").rstrip("\n")
+
+
+def _render_key(key: str) -> str:
+    if _BARE_KEY.fullmatch(key):
+        return key
+    return tomli_w.dumps({key: 0}).rsplit(" = ", 1)[0]
+
+
+def _is_prefix(prefix: tuple[str, ...], keys: tuple[str, ...]) -> bool:
+    return len(prefix) < len(keys) and keys[: len(prefix)] == prefix
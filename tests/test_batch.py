@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from pspm.cli import app
+from pspm.services.batch import find_projects, run_in_projects
+
+
+@pytest.fixture
+def projects(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.chdir(tmp_path)
+    for project in ["a", "b", "packages/c"]:
+        (tmp_path / project).mkdir(parents=True)
+        (tmp_path / project / "pyproject.toml").write_text(
+            '[project]\nname = "member"\n'
+        )
+    (tmp_path / "empty").mkdir()
+    return tmp_path
+
+
+def test_find_projects(projects: Path) -> None:
+    assert find_projects([Path("b"), Path("./b/"), Path("a")]) == [
+        Path("b"),
+        Path("a"),
+    ]
+    assert find_projects([Path("b")], all_projects=True) == [
+        Path("b"),
+        Path("a"),
+    ]
+
+
+def test_find_projects_in_workspace(projects: Path) -> None:
+    (projects / "pyproject.toml").write_text(
+        '[tool.pspm.workspace]\nmembers = ["packages/*"]\n'
+    )
+    assert find_projects([], all_projects=True) == [Path("packages/c")]
+
+
+def test_run_in_projects_reports_failures(
+    projects: Path, capfd: pytest.CaptureFixture[str]
+) -> None:
+    failed = run_in_projects(
+        "sync", [Path("empty"), Path("missing")], processes=2
+    )
+    assert failed == [Path("empty"), Path("missing")]
+    output = capfd.readouterr().out
+    assert "Did not found pyproject.toml" in output
+    assert "FileNotFoundError" in output
+
+
+@pytest.mark.parametrize("command", ["lock", "sync"])
+def test_all_without_projects(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, command: str
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    result = CliRunner().invoke(app, ["--all", command])
+    assert result.exit_code == 1
+    assert "No projects found" in result.output
+    assert run_in_projects(command, []) == []
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+from pspm.utils import bin_path
+from pspm.utils.bin_path import get_uv_path
+
+
+@pytest.fixture(autouse=True)
+def clear_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(bin_path, "_paths", {})
+    monkeypatch.delenv("PSPM_UV", raising=False)
+
+
+def test_get_uv_path_is_cached(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[str] = []
+    original_which = shutil.which
+
+    def which(name: str) -> str | None:
+        calls.append(name)
+        return original_which(name)
+
+    monkeypatch.setattr(bin_path.shutil, "which", which)
+    assert get_uv_path() == get_uv_path()
+    assert calls == ["uv"]
+
+
+def test_get_uv_path_override(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    uv = tmp_path / "uv"
+    uv.touch()
+    monkeypatch.setenv("PSPM_UV", str(uv))
+    assert get_uv_path() == str(uv)
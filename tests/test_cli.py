@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from pspm.cli import app
+
+RUN_MODULES = ["pspm.cli", "pspm.services.run"]
+RUN_IMPORT_BUDGET_SECONDS = 0.5
+
+
+def _import_times(modules: list[str]) -> dict[str, int]:
+    """Import modules in a fresh interpreter and report import times."""
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            f"import {', '.join(modules)}",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    times: dict[str, int] = {}
+    for line in output.splitlines()[1:]:
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize("heavy_module", ["copier", "jinja2", "pydantic"])
+def test_run_does_not_import_heavy_modules(heavy_module: str) -> None:
+    assert heavy_module not in _import_times(RUN_MODULES)
+
+
+def test_run_startup_within_budget() -> None:
+    times = _import_times(RUN_MODULES)
+    total = sum(times[module] for module in RUN_MODULES) / 1_000_000
+    assert total < RUN_IMPORT_BUDGET_SECONDS
+
+
+@pytest.fixture
+def project(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "pyproject.toml").write_text(
+        '[project]\nname = "demo"\ndependencies = ["rich"]\n\n'
+        '[project.optional-dependencies]\ndev = ["pytest"]\n'
+    )
+    (tmp_path / "requirements.lock").write_text(
+        "rich==13.9.4\n    # via demo (pyproject.toml)\n"
+    )
+    (tmp_path / "requirements-dev.lock").write_text(
+        "pytest==8.3.3\n    # via demo (pyproject.toml)\n"
+    )
+    return tmp_path
+
+
+def test_tree_of_group(project: Path) -> None:
+    result = CliRunner().invoke(app, ["tree", "-g", "dev"])
+    assert result.exit_code == 0
+    assert "pytest" in result.output
+    result = CliRunner().invoke(app, ["tree", "-g", "main"])
+    assert "rich" in result.output
+
+
+def test_tree_of_unknown_group(project: Path) -> None:
+    result = CliRunner().invoke(app, ["tree", "-g", "nope"])
+    assert result.exit_code == 1
+    assert "Unknown dependency groups: nope" in result.output
+
+
+def test_why_not_locked_package(project: Path) -> None:
+    result = CliRunner().invoke(app, ["why", "[bold]x"])
+    assert result.exit_code == 1
+    assert "Package [bold]x is not locked" in result.output
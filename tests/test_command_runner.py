@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from pspm.entities.command_runner import CommandRunner
+
+
+def test_spawn_count_from_many_threads() -> None:
+    spawn_count = CommandRunner.spawn_count
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        codes = list(
+            executor.map(
+                lambda _: CommandRunner.run(sys.executable, ["-c", ""]),
+                range(16),
+            )
+        )
+    assert codes == [0] * 16
+    assert CommandRunner.spawn_count == spawn_count + 16
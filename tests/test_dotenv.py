@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from pspm.utils.dotenv import load_dotenv_files
+
+
+@pytest.fixture
+def dotenv(tmp_path: Path) -> Path:
+    path = tmp_path / ".env"
+    path.write_text(
+        "# comment\n"
+        "\n"
+        "PLAIN=value\n"
+        "export EXPORTED=1\n"
+        "SPACED = with spaces   # trailing comment\n"
+        "EQUALS=a=b\n"
+        'DOUBLE="quoted # not a comment\\n"\n'
+        "SINGLE='literal ${PLAIN}'\n"
+        "URL=http://${HOST:-localhost}:${PORT}/$PLAIN\n"
+        'MULTILINE="first\n'
+        'second"\n'
+        "ESCAPED=\\$PLAIN\n"
+    )
+    return path
+
+
+@pytest.fixture
+def values(dotenv: Path) -> dict[str, str]:
+    return load_dotenv_files([dotenv], {"PORT": "8000"})
+
+
+@pytest.mark.parametrize(
+    "key,expected",
+    [
+        ("PLAIN", "value"),
+        ("EXPORTED", "1"),
+        ("SPACED", "with spaces"),
+        ("EQUALS", "a=b"),
+        ("DOUBLE", "quoted # not a comment\n"),
+        ("SINGLE", "literal ${PLAIN}"),
+        ("URL", "http://localhost:8000/value"),
+        ("MULTILINE", "first\nsecond"),
+        ("ESCAPED", "$PLAIN"),
+    ],
+)
+def test_parse(values: dict[str, str], key: str, expected: str) -> None:
+    assert values[key] == expected
+
+
+def test_ignores_comments(values: dict[str, str]) -> None:
+    assert len(values) == 9
+
+
+def test_layered_files(dotenv: Path, tmp_path: Path) -> None:
+    local = tmp_path / ".env.local"
+    local.write_text("PLAIN=overridden\nDERIVED=${PLAIN}-local\n")
+    missing = tmp_path / ".env.missing"
+    values = load_dotenv_files([dotenv, local, missing], {})
+    assert values["PLAIN"] == "overridden"
+    assert values["DERIVED"] == "overridden-local"
+    assert values["EXPORTED"] == "1"
+
+
+def test_reloads_modified_file(dotenv: Path) -> None:
+    load_dotenv_files([dotenv], {})
+    dotenv.write_text("PLAIN=changed and longer\n")
+    assert load_dotenv_files([dotenv], {}) == {"PLAIN": "changed and longer"}
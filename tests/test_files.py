@@ -0,0 +1,116 @@
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+from pspm.utils import files
+from pspm.utils.files import (
+    atomic_write,
+    clone_tree,
+    ensure_state_directory,
+    project_lock,
+    write_if_changed,
+)
+
+
+def test_atomic_write(tmp_path: Path) -> None:
+    path = tmp_path / "pyproject.toml"
+    path.write_text("old")
+    path.chmod(0o640)
+    atomic_write(path, b"new")
+    assert path.read_text() == "new"
+    assert path.stat().st_mode & 0o777 == 0o640
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_atomic_write_keeps_file_on_failure(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = tmp_path / "pyproject.toml"
+    path.write_text("old")
+
+    def fail(temp_path: Path, path: Path) -> None:
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(files, "replace_file", fail)
+    with pytest.raises(KeyboardInterrupt):
+        atomic_write(path, b"new")
+    assert path.read_text() == "old"
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_write_if_changed(tmp_path: Path) -> None:
+    path = tmp_path / "requirements.txt"
+    assert write_if_changed(path, b"foo==1.0.0\n")
+    mtime = path.stat().st_mtime_ns
+    assert not write_if_changed(path, b"foo==1.0.0\n")
+    assert path.stat().st_mtime_ns == mtime
+    assert write_if_changed(path, b"foo==2.0.0\n")
+    assert path.read_text() == "foo==2.0.0\n"
+
+
+def test_ensure_state_directory(tmp_path: Path) -> None:
+    directory = ensure_state_directory(tmp_path / ".pspm")
+    assert (directory / ".gitignore").read_text() == "*\n"
+
+
+def test_project_lock_is_reentrant(tmp_path: Path) -> None:
+    lock_file = tmp_path / "lock"
+    with project_lock(lock_file), project_lock(lock_file):
+        pass
+    with project_lock(lock_file):
+        pass
+
+
+def test_project_lock_outside_project(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    with project_lock():
+        pass
+    assert list(tmp_path.iterdir()) == []
+    (tmp_path / "pyproject.toml").write_text("")
+    with project_lock():
+        assert (tmp_path / ".pspm" / "lock").exists()
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses fcntl")
+def test_project_lock_waits_for_other_holder(tmp_path: Path) -> None:
+    import fcntl
+
+    lock_file = tmp_path / "lock"
+    acquired = threading.Event()
+
+    def run() -> None:
+        with project_lock(lock_file, poll_interval=0.01):
+            acquired.set()
+
+    with lock_file.open("w") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        thread = threading.Thread(target=run)
+        thread.start()
+        assert not acquired.wait(0.2)
+        fcntl.flock(f, fcntl.LOCK_UN)
+    thread.join(5)
+    assert acquired.is_set()
+
+
+def test_clone_tree(tmp_path: Path) -> None:
+    source = tmp_path / "source"
+    (source / "lib" / "package").mkdir(parents=True)
+    (source / "lib" / "package" / "module.py").write_text("x = 1")
+    (source / "python").symlink_to("/usr/bin/python3")
+    (source / "lib64").symlink_to("lib")
+    clone_tree(source, tmp_path / "clone")
+
+    module = tmp_path / "clone" / "lib" / "package" / "module.py"
+    assert module.read_text() == "x = 1"
+    assert (
+        module.stat().st_ino
+        == (source / "lib" / "package" / "module.py").stat().st_ino
+    )
+    assert (tmp_path / "clone" / "python").readlink() == Path(
+        "/usr/bin/python3"
+    )
+    assert (tmp_path / "clone" / "lib64").is_symlink()
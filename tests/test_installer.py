@@ -1,8 +1,10 @@
+from pathlib import Path
+
 import pytest
 
 from pspm.entities.command_runner import BaseCommandRunner
 from pspm.entities.installer import UVInstaller
-from pspm.errors.dependencies import InstallError, SyncError
+from pspm.errors.dependencies import InstallError, SyncError, UninstallError
 
 
 class DummyCommandRunner:
@@ -71,3 +73,78 @@ def test_sync_raises_error(installer: UVInstaller) -> None:
     ]
     with pytest.raises(SyncError):
         installer.sync(requirements_files)
+
+
+def test_sync_with_editables(
+    installer: UVInstaller, command_runner: DummyCommandRunner
+) -> None:
+    editables: list[str] = []
+
+    def run(command: str, arguments: list[str] | None = None) -> int:
+        editables.extend(Path(arguments[-1]).read_text().splitlines())
+        return 0
+
+    command_runner.run = run  # type: ignore
+    installer.sync(["requirements.lock"], editables=["."])
+    assert editables == [f"-e {Path().absolute()}"]
+
+
+def test_uninstall(
+    installer: UVInstaller, command_runner: DummyCommandRunner
+) -> None:
+    installer.uninstall("banana")
+    assert command_runner.arguments == ["pip", "uninstall", "banana"]
+
+
+def test_raises_uninstall_error(installer: UVInstaller) -> None:
+    with pytest.raises(UninstallError):
+        installer.uninstall("invalid")
+
+
+def test_update(
+    installer: UVInstaller, command_runner: DummyCommandRunner
+) -> None:
+    calls: list[list[str]] = []
+
+    def run(command: str, arguments: list[str] | None = None) -> int:
+        arguments = arguments or []
+        if "install" in arguments:
+            arguments = [
+                *arguments[:-1],
+                *Path(arguments[-1]).read_text().splitlines(),
+            ]
+        calls.append(arguments)
+        return 0
+
+    command_runner.run = run  # type: ignore
+    installer.update(["apple==1.0.0"], ["banana"], editables=["."])
+    assert calls == [
+        ["pip", "uninstall", "banana"],
+        [
+            "pip",
+            "install",
+            "--no-deps",
+            "-r",
+            "apple==1.0.0",
+            f"-e {Path().absolute()}",
+        ],
+    ]
+
+
+def test_update_without_changes(
+    installer: UVInstaller, command_runner: DummyCommandRunner
+) -> None:
+    installer.update([], [])
+    assert not hasattr(command_runner, "arguments")
+
+
+def test_sync_into_venv_path(command_runner: DummyCommandRunner) -> None:
+    installer = UVInstaller(command_runner, Path("/ssd/venvs/project"))
+    installer.sync(["requirements.lock"])
+    assert command_runner.arguments == [
+        "pip",
+        "sync",
+        "--python",
+        str(Path("/ssd/venvs/project")),
+        "requirements.lock",
+    ]
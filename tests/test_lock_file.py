@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import pytest
+
+from pspm.entities.lock_file import (
+    LockGraph,
+    compare_versions,
+    diff_locks,
+    load_lock_files,
+    normalize_name,
+    parse_lock,
+)
+
+LOCK = """\
+# This file was autogenerated by uv via the following command:
+#    uv pip compile --extra dev -o requirements-dev.lock pyproject.toml
+certifi==2024.8.30 \\
+    --hash=sha256:aaa \\
+    --hash=sha256:bbb
+    # via
+    #   -c requirements.lock
+    #   requests
+colorama==0.4.6 ; sys_platform == 'win32'
+    # via pytest
+-e file:///home/user/demo
+    # via -r requirements.in
+pytest==8.3.3
+    # via demo (pyproject.toml)
+requests==2.32.3
+    # via demo (pyproject.toml)
+Typing_Extensions==4.12.2
+    # via
+    #   pytest
+    #   requests
+"""
+
+
+@pytest.fixture
+def graph() -> LockGraph:
+    return parse_lock(LOCK.splitlines())
+
+
+def test_parse_packages(graph: LockGraph) -> None:
+    assert len(graph) == 6
+    certifi = graph.get("certifi")
+    assert certifi is not None
+    assert certifi.version == "2024.8.30"
+    assert certifi.hashes == ["sha256:aaa", "sha256:bbb"]
+    assert certifi.via == ["-c requirements.lock", "requests"]
+
+
+def test_parse_markers(graph: LockGraph) -> None:
+    colorama = graph.get("colorama")
+    assert colorama is not None
+    assert colorama.version == "0.4.6"
+    assert colorama.markers == "sys_platform == 'win32'"
+
+
+def test_parse_editable(graph: LockGraph) -> None:
+    demo = graph.get("demo")
+    assert demo is not None
+    assert demo.editable
+    assert demo.version is None
+
+
+def test_parse_editable_reads_project_name(tmp_path: Path) -> None:
+    member = tmp_path / "packages" / "core"
+    member.mkdir(parents=True)
+    (member / "pyproject.toml").write_text(
+        '[project]\nname = "Acme_Core"\n', "utf-8"
+    )
+    graph = parse_lock([
+        f"-e {member.as_uri()}",
+        f"-e {member}",
+        "-e ./missing#egg=other",
+        f"-e {tmp_path / 'plain'}",
+    ])
+    assert [p.name for p in graph] == ["acme-core", "other", "plain"]
+
+
+def test_names_are_normalized(graph: LockGraph) -> None:
+    assert normalize_name("Typing_Extensions") == "typing-extensions"
+    assert "typing.extensions" in graph
+
+
+def test_edges(graph: LockGraph) -> None:
+    assert graph.dependents("typing-extensions") == {"pytest", "requests"}
+    assert graph.dependencies("requests") == {"certifi", "typing-extensions"}
+    assert graph.roots == {"demo", "pytest", "requests"}
+
+
+def test_find_paths(graph: LockGraph) -> None:
+    assert graph.find_paths("Typing_Extensions") == [
+        ["pytest", "typing-extensions"],
+        ["requests", "typing-extensions"],
+    ]
+    assert graph.find_paths("requests") == [["requests"]]
+    assert graph.find_paths("missing") == []
+
+
+def test_load_lock_files_merges_groups(tmp_path: Path) -> None:
+    main = tmp_path / "requirements.lock"
+    main.write_text("requests==2.32.3\n    # via demo (pyproject.toml)\n")
+    dev = tmp_path / "requirements-dev.lock"
+    dev.write_text(LOCK)
+    graph = load_lock_files({
+        None: str(main),
+        "dev": str(dev),
+        "docs": str(tmp_path / "requirements-docs.lock"),
+    })
+    requests = graph.get("requests")
+    assert requests is not None
+    assert requests.groups == [None, "dev"]
+    assert graph.get_roots() == {"requests"}
+    assert graph.get_roots("dev") == {"demo", "pytest", "requests"}
+    assert graph.conflicts() == {}
+
+
+def test_conflicting_pins() -> None:
+    graph = parse_lock(["idna==3.6 --hash=sha256:111\n"], group="a")
+    parse_lock(["idna==3.6 --hash=sha256:222\n"], graph, "b")
+    parse_lock(["idna==2.10 --hash=sha256:333\n"], graph, "c")
+    idna = graph.get("idna")
+    assert idna is not None
+    assert idna.version == "3.6"
+    assert idna.hashes == ["sha256:111", "sha256:222"]
+    assert graph.conflicts() == {
+        "idna": {"a": "idna==3.6", "b": "idna==3.6", "c": "idna==2.10"}
+    }
+
+
+@pytest.mark.parametrize(
+    ("version", "other", "expected"),
+    [
+        ("1.0", "1.0.0", 0),
+        ("1.10", "1.9", 1),
+        ("2.0.1", "10", -1),
+        ("2.0rc1", "2.0", -1),
+        ("2.0.dev1", "2.0a1", -1),
+        ("2.0.post1", "2.0", 1),
+        ("1!1.0", "2.0", 1),
+    ],
+)
+def test_compare_versions(version: str, other: str, expected: int) -> None:
+    assert compare_versions(version, other) == expected
+
+
+def test_diff_locks(graph: LockGraph) -> None:
+    new = parse_lock([
+        "certifi==2024.8.30",
+        "pytest==8.2.0",
+        "requests==2.32.4",
+        "typing-extensions==4.12.2 ; python_version < '3.11'",
+        "idna==3.10",
+        "-e file:///home/user/demo",
+    ])
+    diff = diff_locks(graph, new)
+    assert [p.name for p in diff.added] == ["idna"]
+    assert [p.name for p in diff.removed] == ["colorama"]
+    assert [n.name for _, n in diff.upgraded] == ["requests"]
+    assert [n.name for _, n in diff.downgraded] == ["pytest"]
+    assert [n.name for _, n in diff.changed] == ["typing-extensions"]
+    assert diff_locks(graph, graph).to_install == []
+
+
+def test_parse_large_lock_file() -> None:
+    lines: list[str] = []
+    for i in range(2000):
+        lines += [
+            f"package-{i}==1.0.{i} \\",
+            "    --hash=sha256:" + "a" * 64 + " \\",
+            "    --hash=sha256:" + "b" * 64,
+            "    # via",
+            f"    #   package-{i // 2}",
+            "    #   demo (pyproject.toml)",
+        ]
+    durations = []
+    for _ in range(3):
+        start = time.perf_counter()
+        graph = parse_lock(lines)
+        durations.append(time.perf_counter() - start)
+    assert len(graph) == 2000
+    assert min(durations) < 0.05
@@ -0,0 +1,40 @@
+from pathlib import Path
+
+import pytest
+
+from pspm.entities.lock_state import LockState
+
+
+@pytest.fixture
+def lock_file(tmp_path: Path) -> str:
+    path = tmp_path / "requirements.lock"
+    path.write_text("foo==1.0.0\n")
+    return str(path)
+
+
+@pytest.fixture
+def state_path(tmp_path: Path) -> Path:
+    return tmp_path / ".pspm" / "locks.json"
+
+
+def test_is_fresh_after_record(lock_file: str, state_path: Path) -> None:
+    LockState(state_path).record({lock_file: "abc"})
+    state = LockState(state_path)
+    assert state.is_fresh(lock_file, "abc")
+    assert not state.is_fresh(lock_file, "def")
+
+
+def test_not_fresh_when_lock_file_changes(
+    lock_file: str, state_path: Path
+) -> None:
+    state = LockState(state_path)
+    state.record({lock_file: "abc"})
+    Path(lock_file).write_text("foo==2.0.0\n")
+    assert not state.is_fresh(lock_file, "abc")
+
+
+def test_record_creates_ignored_directory(
+    lock_file: str, state_path: Path
+) -> None:
+    LockState(state_path).record({lock_file: "abc"})
+    assert (state_path.parent / ".gitignore").read_text() == "*\n"
@@ -1,11 +1,26 @@
 from pspm.entities.virtual_env import BaseVirtualEnv
+import hashlib
+
 import pytest
 
 from pspm.entities.package_manager import PackageManager
-from pspm.entities.pyproject import BasePyproject
-from pspm.entities.toml import BaseToml
+from pspm.entities.pyproject import BasePyproject, Pyproject
+from pspm.entities.toml import BaseToml, Toml
 from pspm.entities.installer import BaseInstaller
+from pspm.entities.lock_state import BaseLockState
 from pspm.entities.resolver import BaseResolver
+from pspm.entities.venv_cache import BaseVenvCache
+from pspm.entities.workspace import Workspace
+from pspm.errors.dependencies import (
+    AddError,
+    GroupNotFoundError,
+    HashedLocalProjectError,
+    LockConflictError,
+    LockFileNotFoundError,
+    NotLockedError,
+    ResolveError,
+)
+from pathlib import Path
 from typing import Any, Literal
 
 
@@ -28,7 +43,13 @@ class DummyPyproject(BasePyproject):
         self.uninstalled_dependencies: list[str] = []
         self.uninstalled_group_dependencies: dict[str, list[str]] = {}
 
-    def manage_dependency(
+    def manage_dependencies(
+        self, action: str, packages: list[str], group: str | None = None
+    ) -> None:
+        for package in packages:
+            self._manage_dependency(action, package, group)
+
+    def _manage_dependency(
         self, action: str, package: str, group: str | None = None
     ) -> None:
         data = self._parser.load()
@@ -41,7 +62,9 @@ class DummyPyproject(BasePyproject):
                 self.uninstalled_dependencies.append(package)
         else:
             if action == "add":
-                data["project"]["optional-dependencies"][group] += [package]
+                data["project"]["optional-dependencies"].setdefault(
+                    group, []
+                ).append(package)
                 self.added_group_dependencies[group] = (
                     self.added_group_dependencies.get("group", []) + [package]
                 )
@@ -53,13 +76,38 @@ class DummyPyproject(BasePyproject):
                 )
         self._parser.dump(data)
 
+    def set_dependencies(
+        self, dependencies: list[str], group: str | None = None
+    ) -> None:
+        data = self._parser.load()
+        if not group:
+            data["project"]["dependencies"] = dependencies
+        else:
+            data["project"]["optional-dependencies"][group] = dependencies
+        self._parser.dump(data)
+
+    def remove_group(self, group: str) -> None:
+        data = self._parser.load()
+        del data["project"]["optional-dependencies"][group]
+        self._parser.dump(data)
+
     def get_extra_groups(self) -> list[str]:
         data = self._parser.load()
         return list(data["project"].get("optional-dependencies", {}).keys())
 
+    def get_dependencies(self, group: str | None = None) -> list[str]:
+        data = self._parser.load()["project"]
+        if not group:
+            return list(data["dependencies"])
+        return list(data["optional-dependencies"].get(group, []))
+
     def is_installable(self) -> bool:
         return True
 
+    @property
+    def requires_python(self) -> str | None:
+        return ">=3.9"
+
     @property
     def version(self) -> str:
         return "0.0.0"
@@ -74,6 +122,8 @@ class DummyPyproject(BasePyproject):
 class DummyInstaller(BaseInstaller):
     def __init__(self, toml: BaseToml) -> None:
         self.installed_packages: list[str] = []
+        self.sync_count = 0
+        self.updates: list[tuple[list[str], list[str], list[str] | None]] = []
         self._toml = toml
 
     def install(self, package: str, *, editable: bool = True) -> None:
@@ -82,7 +132,22 @@ class DummyInstaller(BaseInstaller):
     def uninstall(self, package: str) -> None:
         raise NotImplementedError
 
-    def sync(self, requirements_files: list[str]) -> None:
+    def update(
+        self,
+        install: list[str],
+        uninstall: list[str],
+        *,
+        editables: list[str] | None = None,
+    ) -> None:
+        self.updates.append((install, uninstall, editables))
+
+    def sync(
+        self,
+        requirements_files: list[str],
+        *,
+        editables: list[str] | None = None,
+    ) -> None:
+        self.sync_count += 1
         data = self._toml.load()
         requirements_per_file = {
             "requirements.lock": data["project"]["dependencies"],
@@ -96,7 +161,7 @@ class DummyInstaller(BaseInstaller):
         packages: list[str] = []
         for f in requirements_files:
             packages.extend(requirements_per_file[f])
-        self.installed_packages = packages
+        self.installed_packages = packages + (editables or [])
 
 
 class DummyResolver(BaseResolver):
@@ -104,6 +169,16 @@ class DummyResolver(BaseResolver):
         self.output_files: list[str] = []
         self.constraints_used: dict[str, str | None] = {}
         self.upgraded = False
+        self.failing_groups: list[str] = []
+        self.fail_on: str | None = None
+        self.dependencies: list[str] = []
+        self.upgraded_packages: dict[str, list[str] | None] = {}
+        self.outputs: dict[str, str] = {}
+        self.source_files: dict[str, str] = {}
+        self.settings: dict[str, Any] = {}
+
+    def get_settings(self) -> dict[str, Any]:
+        return self.settings
 
     def compile(
         self,
@@ -112,16 +187,35 @@ class DummyResolver(BaseResolver):
         constraint_file: str | None = None,
         *,
         upgrade: bool = False,
+        upgrade_packages: list[str] | None = None,
+        source_file: str = "pyproject.toml",
     ) -> None:
-        output_file = f"requirements{'-' + group if group else ''}.lock"
+        self.source_files[output_file] = source_file
+        if group in self.failing_groups or self.fail_on in self.dependencies:
+            raise ResolveError
         self.output_files.append(output_file)
         self.constraints_used[output_file] = constraint_file
         self.upgraded = upgrade
+        self.upgraded_packages[output_file] = upgrade_packages
+        if output_file in self.outputs:
+            Path(output_file).write_text(self.outputs[output_file])
+
+
+class DummyLockState(BaseLockState):
+    def __init__(self) -> None:
+        self.state: dict[str, str] = {}
+
+    def is_fresh(self, lock_file: str, inputs_hash: str) -> bool:
+        return self.state.get(lock_file) == inputs_hash
+
+    def record(self, lock_files: dict[str, str]) -> None:
+        self.state.update(lock_files)
 
 
 class DummyVenv(BaseVirtualEnv):
     def __init__(self) -> None:
         self.created = False
+        self.fingerprint: str | None = None
 
     def already_created(self) -> bool:
         return self.created
@@ -132,6 +226,26 @@ class DummyVenv(BaseVirtualEnv):
     def get_path_to_command_bin(self, command: str) -> None:
         raise NotImplementedError
 
+    def get_environment(self) -> dict[str, str]:
+        return {}
+
+    def get_sync_fingerprint(self) -> str | None:
+        return self.fingerprint
+
+    def set_sync_fingerprint(self, fingerprint: str | None) -> None:
+        self.fingerprint = fingerprint
+
+
+class DummyVenvCache(BaseVenvCache):
+    def __init__(self) -> None:
+        self.venvs: set[str] = set()
+
+    def restore(self, fingerprint: str) -> bool:
+        return fingerprint in self.venvs
+
+    def store(self, fingerprint: str) -> None:
+        self.venvs.add(fingerprint)
+
 
 @pytest.fixture()
 def requirements() -> dict[str, list[str]]:
@@ -173,8 +287,10 @@ def virtual_env() -> BaseVirtualEnv:
 
 
 @pytest.fixture
-def resolver() -> BaseResolver:
-    return DummyResolver()
+def resolver(toml: BaseToml) -> BaseResolver:
+    resolver = DummyResolver()
+    resolver.dependencies = toml.load()["project"]["dependencies"]
+    return resolver
 
 
 @pytest.fixture
@@ -272,3 +388,555 @@ def test_compile_requirements_upgrade(
 ) -> None:
     package_manager.compile_requirements(upgrade=True)
     assert resolver.upgraded == True
+
+
+def test_compile_requirements_parallel(
+    package_manager: PackageManager, resolver: DummyResolver
+) -> None:
+    package_manager.compile_requirements(jobs=4)
+    assert resolver.output_files[0] == "requirements.lock"
+    assert sorted(resolver.output_files[1:]) == [
+        "requirements-dev.lock",
+        "requirements-test.lock",
+    ]
+    assert all(
+        resolver.constraints_used[f] == "requirements.lock"
+        for f in resolver.output_files[1:]
+    )
+
+
+def test_compile_requirements_reports_failed_groups(
+    package_manager: PackageManager, resolver: DummyResolver
+) -> None:
+    resolver.failing_groups = ["dev"]
+    with pytest.raises(ResolveError) as exc_info:
+        package_manager.compile_requirements(jobs=2)
+    assert exc_info.value.groups == ["dev"]
+    assert "requirements-test.lock" in resolver.output_files
+
+
+@pytest.fixture
+def lock_state() -> BaseLockState:
+    return DummyLockState()
+
+
+@pytest.fixture
+def stateful_package_manager(
+    pyproject: BasePyproject,
+    installer: BaseInstaller,
+    resolver: BaseResolver,
+    virtual_env: BaseVirtualEnv,
+    lock_state: BaseLockState,
+) -> PackageManager:
+    return PackageManager(
+        pyproject, installer, resolver, virtual_env, lock_state
+    )
+
+
+def test_compile_requirements_skips_unchanged_files(
+    stateful_package_manager: PackageManager, resolver: DummyResolver
+) -> None:
+    stateful_package_manager.compile_requirements()
+    resolver.output_files = []
+    stateful_package_manager.compile_requirements()
+    assert resolver.output_files == []
+
+
+def test_compile_requirements_only_changed_group(
+    stateful_package_manager: PackageManager,
+    pyproject: DummyPyproject,
+    resolver: DummyResolver,
+) -> None:
+    stateful_package_manager.compile_requirements()
+    resolver.output_files = []
+    pyproject.manage_dependency("add", "new-package", "dev")
+    stateful_package_manager.compile_requirements()
+    assert resolver.output_files == ["requirements-dev.lock"]
+
+
+def test_compile_requirements_when_resolver_settings_change(
+    stateful_package_manager: PackageManager, resolver: DummyResolver
+) -> None:
+    stateful_package_manager.compile_requirements()
+    resolver.output_files = []
+    resolver.settings = {"python": "3.13"}
+    stateful_package_manager.compile_requirements()
+    assert len(resolver.output_files) == 3
+
+
+def test_compile_requirements_upgrade_ignores_state(
+    stateful_package_manager: PackageManager, resolver: DummyResolver
+) -> None:
+    stateful_package_manager.compile_requirements()
+    resolver.output_files = []
+    stateful_package_manager.compile_requirements(upgrade=True)
+    assert len(resolver.output_files) == 3
+
+
+def test_compile_requirements_upgrade_packages(
+    stateful_package_manager: PackageManager,
+    resolver: DummyResolver,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "requirements.lock").write_text("foo==1.0.0\n")
+    (tmp_path / "requirements-dev.lock").write_text(
+        "foo==1.0.0\napple==1.0.0\n"
+    )
+    stateful_package_manager.compile_requirements()
+    resolver.output_files = []
+    stateful_package_manager.compile_requirements(upgrade_packages=["apple"])
+    assert resolver.output_files == ["requirements-dev.lock"]
+    assert resolver.upgraded_packages["requirements-dev.lock"] == ["apple"]
+    assert not resolver.upgraded
+
+
+def test_compile_requirements_upgrade_not_locked_package(
+    package_manager: PackageManager,
+    resolver: DummyResolver,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(NotLockedError):
+        package_manager.compile_requirements(upgrade_packages=["missing"])
+    assert resolver.output_files == []
+
+
+def test_sync_skips_when_up_to_date(
+    package_manager: PackageManager, installer: DummyInstaller
+) -> None:
+    assert package_manager.sync()
+    assert not package_manager.sync()
+    assert installer.sync_count == 1
+
+
+def test_sync_force(
+    package_manager: PackageManager, installer: DummyInstaller
+) -> None:
+    package_manager.sync()
+    assert package_manager.sync(force=True)
+    assert installer.sync_count == 2
+
+
+def test_add_many_dependencies(
+    package_manager: PackageManager,
+    pyproject: DummyPyproject,
+    installer: DummyInstaller,
+    resolver: DummyResolver,
+) -> None:
+    packages = ["apple", "banana", "cherry"]
+    package_manager.manage_dependencies("add", packages, "dev")
+    assert pyproject.get_dependencies("dev") == ["developing", *packages]
+    assert resolver.output_files.count("requirements-dev.lock") == 1
+    assert installer.sync_count == 1
+
+
+def test_add_many_dependencies_rollback(
+    package_manager: PackageManager,
+    pyproject: DummyPyproject,
+    resolver: DummyResolver,
+    installer: DummyInstaller,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    lock_file = tmp_path / "requirements.lock"
+    lock_file.write_text("foo==1.0.0\n")
+    resolver.fail_on = "invalid"
+    with pytest.raises(AddError, match="packages apple, invalid$"):
+        package_manager.manage_dependencies("add", ["apple", "invalid"])
+    assert pyproject.get_dependencies() == ["foo", "bar"]
+    assert lock_file.read_text() == "foo==1.0.0\n"
+    assert installer.sync_count == 0
+
+
+def test_add_to_new_group_rollback(
+    package_manager: PackageManager,
+    pyproject: DummyPyproject,
+    resolver: DummyResolver,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    resolver.outputs["requirements.lock"] = "foo==1.0.0\n"
+    resolver.failing_groups = ["new"]
+    with pytest.raises(AddError, match="packages apple, banana$"):
+        package_manager.manage_dependencies("add", ["apple", "banana"], "new")
+    assert pyproject.get_extra_groups() == ["dev", "test"]
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_sync_installs_project_with_dependencies(
+    package_manager: PackageManager, installer: DummyInstaller
+) -> None:
+    package_manager.sync()
+    assert installer.sync_count == 1
+    assert "." in installer.installed_packages
+
+
+def test_get_lock_graph(
+    package_manager: PackageManager,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "requirements.lock").write_text(
+        "foo==1.0.0\n    # via demo (pyproject.toml)\n"
+    )
+    (tmp_path / "requirements-dev.lock").write_text(
+        "foo==1.0.0\n    # via -c requirements.lock\n"
+        "bar==2.0.0\n    # via foo\n"
+    )
+    graph = package_manager.get_lock_graph()
+    assert graph.find_paths("bar") == [["foo", "bar"]]
+    bar = graph.get("bar")
+    assert bar is not None
+    assert bar.groups == ["dev"]
+
+
+@pytest.fixture
+def locked_project(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.chdir(tmp_path)
+    for file in [
+        "requirements.lock",
+        "requirements-dev.lock",
+        "requirements-test.lock",
+    ]:
+        (tmp_path / file).write_text("foo==1.0.0\nold==1.0.0\n")
+    return tmp_path
+
+
+def test_manage_dependencies_syncs_only_changes(
+    package_manager: PackageManager,
+    resolver: DummyResolver,
+    installer: DummyInstaller,
+    locked_project: Path,
+) -> None:
+    package_manager.sync()
+    lock = "foo==1.1.0 --hash=sha256:aaa\nbar==2.0.0\n"
+    resolver.outputs = {
+        "requirements.lock": lock,
+        "requirements-dev.lock": lock,
+        "requirements-test.lock": lock,
+    }
+    diff = package_manager.manage_dependencies("add", ["bar"])
+    assert [p.name for p in diff.added] == ["bar"]
+    assert [p.name for p in diff.removed] == ["old"]
+    assert [(o.version, n.version) for o, n in diff.upgraded] == [
+        ("1.0.0", "1.1.0")
+    ]
+    assert installer.sync_count == 1
+    assert installer.updates == [
+        (["bar==2.0.0", "foo==1.1.0 --hash=sha256:aaa"], ["old"], None)
+    ]
+    assert not package_manager.sync()
+
+
+def test_manage_dependencies_full_sync_when_out_of_sync(
+    package_manager: PackageManager,
+    resolver: DummyResolver,
+    installer: DummyInstaller,
+    locked_project: Path,
+) -> None:
+    resolver.outputs = {"requirements.lock": "foo==1.1.0\n"}
+    package_manager.manage_dependencies("add", ["bar"])
+    assert installer.sync_count == 1
+    assert installer.updates == []
+
+
+def test_upgrade_dependencies_reports_downgrades(
+    package_manager: PackageManager,
+    resolver: DummyResolver,
+    locked_project: Path,
+) -> None:
+    resolver.outputs = {"requirements.lock": "foo==0.9.0\nold==1.0.0\n"}
+    diff = package_manager.upgrade_dependencies()
+    assert [(o.version, n.version) for o, n in diff.downgraded] == [
+        ("1.0.0", "0.9.0")
+    ]
+    assert not diff.added
+    assert not diff.removed
+
+
+def test_compile_workspace_with_one_resolve_per_lock(
+    pyproject: DummyPyproject,
+    installer: DummyInstaller,
+    resolver: DummyResolver,
+    virtual_env: DummyVenv,
+    locked_project: Path,
+) -> None:
+    member = DummyPyproject(
+        DummyToml({
+            "project": {
+                "dependencies": ["idna"],
+                "optional-dependencies": {"lint": ["ruff"]},
+            }
+        })
+    )
+    (locked_project / "packages" / "a").mkdir(parents=True)
+    (locked_project / "packages" / "a" / "pyproject.toml").write_text("")
+    workspace = Workspace(pyproject, {"packages/a": member})
+    package_manager = PackageManager(
+        pyproject, installer, resolver, virtual_env, workspace=workspace
+    )
+    (locked_project / "requirements.lock").write_text(
+        "-e ./packages/a\nfoo==1.0.0\n"
+    )
+    resolver.outputs = {"requirements-lint.lock": "foo==1.0.0\n"}
+    package_manager.compile_requirements()
+
+    assert resolver.output_files[0] == "requirements.lock"
+    assert sorted(resolver.output_files[1:]) == [
+        "requirements-dev.lock",
+        "requirements-lint.lock",
+        "requirements-test.lock",
+    ]
+    assert resolver.source_files["requirements.lock"] == (".pspm/workspace.in")
+    assert resolver.source_files["requirements-lint.lock"] == (
+        ".pspm/workspace-lint.in"
+    )
+    constraint_file = ".pspm/workspace-constraints.txt"
+    assert resolver.constraints_used["requirements-lint.lock"] == (
+        constraint_file
+    )
+    assert Path(constraint_file).read_text() == "foo==1.0.0\n"
+    assert Path(".pspm/workspace-lint.in").read_text() == (
+        "-e .\n-e ./packages/a[lint]\n"
+    )
+
+
+def test_sync_restores_cached_venv(
+    pyproject: BasePyproject,
+    installer: DummyInstaller,
+    resolver: BaseResolver,
+    locked_project: Path,
+) -> None:
+    venv_cache = DummyVenvCache()
+    for _ in range(2):
+        package_manager = PackageManager(
+            pyproject, installer, resolver, DummyVenv(), venv_cache=venv_cache
+        )
+        assert package_manager.sync()
+    assert installer.sync_count == 1
+    assert len(venv_cache.venvs) == 1
+
+
+def test_sync_selected_groups(
+    pyproject: BasePyproject,
+    installer: DummyInstaller,
+    resolver: BaseResolver,
+    virtual_env: BaseVirtualEnv,
+    requirements: dict[str, list[str]],
+) -> None:
+    package_manager = PackageManager(
+        pyproject, installer, resolver, virtual_env, groups=["test"]
+    )
+    package_manager.sync()
+    assert installer.installed_packages == [
+        *requirements["main"],
+        *requirements["test"],
+        ".",
+    ]
+
+
+def test_sync_unknown_group(
+    pyproject: BasePyproject,
+    installer: DummyInstaller,
+    resolver: BaseResolver,
+    virtual_env: BaseVirtualEnv,
+) -> None:
+    package_manager = PackageManager(
+        pyproject, installer, resolver, virtual_env, groups=["lint"]
+    )
+    with pytest.raises(GroupNotFoundError):
+        package_manager.sync()
+
+
+def test_check_groups(package_manager: PackageManager) -> None:
+    package_manager.check_groups(["dev", "test"])
+    with pytest.raises(GroupNotFoundError, match="nope$"):
+        package_manager.check_groups(["dev", "nope"])
+
+
+def test_manage_dependencies_syncs_only_selected_groups(
+    pyproject: BasePyproject,
+    installer: DummyInstaller,
+    resolver: DummyResolver,
+    virtual_env: BaseVirtualEnv,
+    locked_project: Path,
+) -> None:
+    package_manager = PackageManager(
+        pyproject, installer, resolver, virtual_env, groups=[]
+    )
+    package_manager.sync()
+    resolver.outputs = {
+        "requirements-dev.lock": "foo==1.0.0\nold==1.0.0\npytest==8.0.0\n"
+    }
+    diff = package_manager.manage_dependencies("add", ["pytest"], "dev")
+    assert [p.name for p in diff.added] == ["pytest"]
+    assert installer.updates == []
+    assert not package_manager.sync()
+
+
+def test_sync_without_groups(
+    pyproject: BasePyproject,
+    installer: DummyInstaller,
+    resolver: BaseResolver,
+    virtual_env: BaseVirtualEnv,
+    requirements: dict[str, list[str]],
+) -> None:
+    package_manager = PackageManager(
+        pyproject, installer, resolver, virtual_env, excluded_groups=["dev"]
+    )
+    package_manager.sync()
+    assert installer.installed_packages == [
+        *requirements["main"],
+        *requirements["test"],
+        ".",
+    ]
+    package_manager = PackageManager(
+        pyproject,
+        installer,
+        resolver,
+        virtual_env,
+        groups=["dev"],
+        excluded_groups=["dev"],
+    )
+    package_manager.sync()
+    assert installer.installed_packages == [*requirements["main"], "."]
+
+
+def test_export_merges_selected_lock_files(
+    pyproject: BasePyproject,
+    installer: DummyInstaller,
+    resolver: BaseResolver,
+    virtual_env: BaseVirtualEnv,
+    locked_project: Path,
+) -> None:
+    (locked_project / "requirements.lock").write_text(
+        "foo==1.0.0 \\\n    --hash=sha256:aaa\n"
+    )
+    (locked_project / "requirements-dev.lock").write_text(
+        "foo==1.0.0 \\\n    --hash=sha256:aaa\nbar==2.0.0\n"
+    )
+    package_manager = PackageManager(
+        pyproject,
+        installer,
+        resolver,
+        virtual_env,
+        excluded_groups=["test"],
+    )
+    assert package_manager.export("out/requirements.txt", project=False)
+
+    content = Path("out/requirements.txt").read_text()
+    assert content == (
+        "# This file was exported by spm from the following lock files:\n"
+        "#    requirements.lock\n"
+        "#    requirements-dev.lock\n"
+        "bar==2.0.0\n"
+        "foo==1.0.0 \\\n    --hash=sha256:aaa\n"
+    )
+    with pytest.raises(HashedLocalProjectError) as e:
+        package_manager.export("out/requirements.txt")
+    assert e.value.projects == ["."]
+    digest = hashlib.sha256(content.encode()).hexdigest()
+    assert Path("out/requirements.txt.sha256").read_text() == (
+        f"{digest}  requirements.txt\n"
+    )
+
+
+def test_export_writes_only_changes(
+    package_manager: PackageManager, locked_project: Path
+) -> None:
+    assert package_manager.export("requirements.txt")
+    mtime = Path("requirements.txt").stat().st_mtime_ns
+    assert not package_manager.export("requirements.txt")
+    assert Path("requirements.txt").stat().st_mtime_ns == mtime
+    assert package_manager.export("requirements.txt", editable=False)
+    assert Path("requirements.txt").read_text().endswith("old==1.0.0\n.\n")
+
+
+def test_export_local_projects(
+    pyproject: BasePyproject,
+    installer: DummyInstaller,
+    resolver: BaseResolver,
+    virtual_env: BaseVirtualEnv,
+    locked_project: Path,
+) -> None:
+    (locked_project / "requirements.lock").write_text(
+        "-e ./packages/a\nfoo==1.0.0\n"
+    )
+    workspace = Workspace(pyproject, {"packages/a": pyproject})
+    package_manager = PackageManager(
+        pyproject, installer, resolver, virtual_env, workspace=workspace
+    )
+    package_manager.export("requirements.txt", editable=False)
+    lines = Path("requirements.txt").read_text().splitlines()
+    assert [line for line in lines if "packages" in line] == ["./packages/a"]
+
+    package_manager.export("requirements.txt", project=False)
+    lines = Path("requirements.txt").read_text().splitlines()
+    assert lines[-2:] == ["foo==1.0.0", "old==1.0.0"]
+
+
+def test_export_conflicting_pins(
+    package_manager: PackageManager, locked_project: Path
+) -> None:
+    (locked_project / "requirements-dev.lock").write_text(
+        "idna==3.6 \\\n    --hash=sha256:111\n"
+    )
+    (locked_project / "requirements-test.lock").write_text(
+        "idna==2.10 \\\n    --hash=sha256:222\n"
+    )
+    with pytest.raises(LockConflictError) as e:
+        package_manager.export("requirements.txt")
+    assert e.value.conflicts == {
+        "idna": {"dev": "idna==3.6", "test": "idna==2.10"}
+    }
+    assert not Path("requirements.txt").exists()
+
+
+def test_export_not_locked(
+    package_manager: PackageManager,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(LockFileNotFoundError) as e:
+        package_manager.export("requirements.txt")
+    assert e.value.files == [
+        "requirements.lock",
+        "requirements-dev.lock",
+        "requirements-test.lock",
+    ]
+    assert not Path("requirements.txt").exists()
+
+
+def test_compile_requirements_reads_pyproject_without_copies(
+    installer: DummyInstaller,
+    resolver: DummyResolver,
+    virtual_env: DummyVenv,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    groups = "".join(f'group-{i} = ["package-{i}"]\n' for i in range(50))
+    Path("pyproject.toml").write_text(
+        '[project]\nname = "test"\ndependencies = ["foo"]\n\n'
+        f"[project.optional-dependencies]\n{groups}"
+    )
+    package_manager = PackageManager(
+        Pyproject(Toml("pyproject.toml")),
+        installer,
+        resolver,
+        virtual_env,
+        DummyLockState(),
+    )
+    parse_count, copy_count = Toml.parse_count, Toml.copy_count
+    package_manager.compile_requirements()
+    package_manager.compile_requirements()
+    assert len(resolver.output_files) == 51
+    assert Toml.parse_count == parse_count + 1
+    assert Toml.copy_count == copy_count
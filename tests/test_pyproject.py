@@ -129,6 +129,14 @@ def test_get_extra_groups(pyproject: Pyproject, toml_parser: BaseToml) -> None:
     assert result == ["dev", "test"]
 
 
+def test_remove_group(pyproject: Pyproject, toml_parser: BaseToml) -> None:
+    pyproject.remove_group("missing")
+    pyproject.remove_group("dev")
+    assert pyproject.get_extra_groups() == ["test"]
+    pyproject.remove_group("test")
+    assert "optional-dependencies" not in toml_parser.load()["project"]
+
+
 def test_version_property(pyproject: Pyproject, version: str) -> None:
     assert pyproject.version == version
 
@@ -146,3 +154,47 @@ def test_version_change(pyproject: Pyproject) -> None:
 def test_version_bump(pyproject: Pyproject, rule: str, expected: str) -> None:
     pyproject.bump_version(rule)  # type: ignore
     assert pyproject.version == expected
+
+
+def test_get_dependencies(
+    pyproject: Pyproject, requirements: dict[str, list[str]]
+) -> None:
+    assert pyproject.get_dependencies() == requirements["main"]
+    assert pyproject.get_dependencies("dev") == requirements["dev"]
+    assert pyproject.get_dependencies("missing") == []
+
+
+def test_get_workspace_members(
+    pyproject: Pyproject, toml_parser: BaseToml
+) -> None:
+    assert pyproject.get_workspace_members() == []
+    data = toml_parser.load()
+    data["tool"] = {"pspm": {"workspace": {"members": ["packages/*"]}}}
+    assert pyproject.get_workspace_members() == ["packages/*"]
+
+
+def test_get_venv_settings(
+    pyproject: Pyproject, toml_parser: BaseToml
+) -> None:
+    assert pyproject.get_venv_path() is None
+    assert pyproject.get_python() is None
+    data = toml_parser.load()
+    data["tool"] = {"pspm": {"venv": "/ssd/project", "python": "3.12"}}
+    assert pyproject.get_venv_path() == "/ssd/project"
+    assert pyproject.get_python() == "3.12"
+
+
+def test_get_envs(pyproject: Pyproject, toml_parser: BaseToml) -> None:
+    assert pyproject.get_envs() == {}
+    data = toml_parser.load()
+    data["tool"] = {"pspm": {"envs": {"prod": {"groups": []}}}}
+    assert pyproject.get_envs() == {"prod": {"groups": []}}
+
+
+def test_get_generate_hashes(
+    pyproject: Pyproject, toml_parser: BaseToml
+) -> None:
+    assert not pyproject.get_generate_hashes()
+    data = toml_parser.load()
+    data["tool"] = {"pspm": {"generate-hashes": True}}
+    assert pyproject.get_generate_hashes()
@@ -1,3 +1,5 @@
+from pathlib import Path
+
 import pytest
 
 from pspm.entities.command_runner import BaseCommandRunner
@@ -5,14 +7,27 @@ from pspm.entities.resolver import UVResolver
 
 
 class DummyCommandRunner:
+    def __init__(self) -> None:
+        self.seeded_with: str | None = None
+        self.output = "foo==1.0.0\n"
+
     def run(self, command: str, arguments: list[str] | None = None) -> int:
         self.command = command
         self.arguments = arguments or []
         if arguments and arguments[-1] == "invalid":
             return -1
+        output_file = Path(self.arguments[self.arguments.index("-o") + 1])
+        self.seeded_with = output_file.read_text()
+        output_file.write_text(self.output)
         return 0
 
 
+@pytest.fixture(autouse=True)
+def project_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
 @pytest.fixture
 def command_runner() -> DummyCommandRunner:
     return DummyCommandRunner()
@@ -41,17 +56,51 @@ def test_compile(
     pyproject_path: str,
     output_file: str,
 ) -> None:
-    args = [
-        "pip",
-        "compile",
-        "-q",
-        "-o",
-        output_file,
-        pyproject_path,
-    ]
     resolver.compile(output_file)
     assert command_runner.command.endswith("uv")
-    assert command_runner.arguments == args
+    assert command_runner.arguments[:3] == ["pip", "compile", "-q"]
+    assert command_runner.arguments[-1] == pyproject_path
+    assert "--custom-compile-command" in command_runner.arguments
+    assert Path(output_file).read_text() == "foo==1.0.0\n"
+    assert list(Path().iterdir()) == [Path(output_file)]
+
+
+def test_compile_keeps_header(
+    resolver: UVResolver,
+    command_runner: DummyCommandRunner,
+    output_file: str,
+) -> None:
+    resolver.compile(output_file, group="dev", constraint_file="main.lock")
+    arguments = command_runner.arguments
+    header = arguments[arguments.index("--custom-compile-command") + 1]
+    assert header == (
+        "uv pip compile --extra dev --constraint main.lock"
+        f" -o {output_file} pyproject.toml"
+    )
+
+
+def test_compile_seeds_existing_pins(
+    resolver: UVResolver,
+    command_runner: DummyCommandRunner,
+    output_file: str,
+) -> None:
+    Path(output_file).write_text("foo==0.9.0\n")
+    resolver.compile(output_file)
+    assert command_runner.seeded_with == "foo==0.9.0\n"
+    assert Path(output_file).read_text() == "foo==1.0.0\n"
+
+
+def test_compile_does_not_rewrite_unchanged_lock(
+    resolver: UVResolver,
+    output_file: str,
+) -> None:
+    lock_file = Path(output_file)
+    lock_file.write_text("foo==1.0.0\n")
+    mtime = lock_file.stat().st_mtime_ns
+    inode = lock_file.stat().st_ino
+    resolver.compile(output_file)
+    assert lock_file.stat().st_mtime_ns == mtime
+    assert lock_file.stat().st_ino == inode
 
 
 def test_compile_with_group(
@@ -86,3 +135,85 @@ def test_compile_with_upgrade(
     resolver.compile(output_file, upgrade=True)
     assert command_runner.command.endswith("uv")
     assert "--upgrade" in command_runner.arguments
+
+
+def test_compile_with_upgrade_packages(
+    resolver: UVResolver,
+    command_runner: DummyCommandRunner,
+    output_file: str,
+) -> None:
+    resolver.compile(output_file, upgrade_packages=["requests", "urllib3"])
+    arguments = " ".join(command_runner.arguments)
+    assert "--upgrade-package requests --upgrade-package urllib3" in arguments
+    assert "--upgrade " not in arguments
+
+
+def test_compile_with_source_file(
+    resolver: UVResolver,
+    command_runner: DummyCommandRunner,
+    output_file: str,
+) -> None:
+    resolver.compile(output_file, source_file="workspace.in")
+    assert command_runner.arguments[-1] == "workspace.in"
+
+
+def test_compile_with_hashes(
+    command_runner: DummyCommandRunner, output_file: str
+) -> None:
+    resolver = UVResolver(command_runner, generate_hashes=True)
+    resolver.compile(output_file)
+    arguments = command_runner.arguments
+    assert "--generate-hashes" in arguments
+    header = arguments[arguments.index("--custom-compile-command") + 1]
+    assert header == (
+        f"uv pip compile --generate-hashes -o {output_file} pyproject.toml"
+    )
+
+
+def test_get_settings(
+    command_runner: DummyCommandRunner,
+    project_dir: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    found: list[str | None] = []
+
+    def get_python_version(python: str | None = None) -> str | None:
+        found.append(python)
+        return "3.12.1" if python in {None, "3.12"} else None
+
+    monkeypatch.setattr(
+        "pspm.entities.resolver.get_python_version", get_python_version
+    )
+    uv_resolver = UVResolver(command_runner, "3.12")
+    settings = uv_resolver.get_settings()
+    assert settings == {
+        "python": "3.12.1",
+        "python_version": None,
+        "generate_hashes": False,
+    }
+    assert uv_resolver.get_settings() == settings
+    assert found == ["3.12"]
+    assert UVResolver(command_runner, "/usr/bin/python3").get_settings()[
+        "python"
+    ] == ("/usr/bin/python3")
+
+    # Creating the virtualenv with the same Python keeps the settings
+    venv = project_dir / ".venv"
+    assert UVResolver(command_runner, str(venv)).get_settings() != settings
+    venv.mkdir()
+    (venv / "pyvenv.cfg").write_text("home = /usr\nversion_info = 3.12.1\n")
+    assert UVResolver(command_runner, str(venv)).get_settings() == settings
+    (venv / "pyvenv.cfg").write_text("version = 3.13.0\n")
+    assert UVResolver(command_runner, str(venv)).get_settings() != settings
+
+
+def test_compile_with_python_version(
+    command_runner: DummyCommandRunner, output_file: str
+) -> None:
+    resolver = UVResolver(command_runner, ".venv", python_version="3.9")
+    resolver.compile(output_file)
+    arguments = command_runner.arguments
+    header = arguments[arguments.index("--custom-compile-command") + 1]
+    assert header == (
+        f"uv pip compile --python-version 3.9 -o {output_file} pyproject.toml"
+    )
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from pspm.errors.settings import EnvironmentNotFoundError
+from pspm.services.settings import (
+    VenvSettings,
+    get_resolver_python_version,
+    get_venv_settings,
+)
+
+
+@pytest.fixture(autouse=True)
+def project(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("PSPM_VENV", raising=False)
+    monkeypatch.delenv("PSPM_PYTHON", raising=False)
+    (tmp_path / "pyproject.toml").write_text(
+        '[tool.pspm]\nvenv = "~/venvs/project"\npython = "3.12"\n'
+    )
+    return tmp_path
+
+
+def test_get_venv_settings_from_pyproject() -> None:
+    assert get_venv_settings() == VenvSettings(
+        Path("~/venvs/project").expanduser(), "3.12"
+    )
+
+
+def test_get_venv_settings_env_overrides(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("PSPM_VENV", "/ssd/project")
+    assert get_venv_settings() == VenvSettings(Path("/ssd/project"), "3.12")
+    monkeypatch.setenv("PSPM_PYTHON", "pypy3.10")
+    assert get_venv_settings().python == "pypy3.10"
+
+
+def test_get_venv_settings_defaults(project: Path) -> None:
+    (project / "pyproject.toml").write_text("[project]\n")
+    settings = get_venv_settings()
+    assert settings == VenvSettings(Path(".venv"))
+    assert settings.resolver_python is None
+    Path(".venv").mkdir()
+    assert settings.resolver_python == ".venv"
+
+
+def test_get_venv_settings_named_env(project: Path) -> None:
+    (project / "pyproject.toml").write_text(
+        '[tool.pspm]\npython = "3.12"\n'
+        "[tool.pspm.envs.prod]\ngroups = []\n"
+        '[tool.pspm.envs.py313]\npython = "3.13"\nvenv = "/ssd/py313"\n'
+    )
+    assert get_venv_settings("prod") == VenvSettings(
+        Path(".venv-prod"), "3.12", []
+    )
+    assert get_venv_settings("py313") == VenvSettings(
+        Path("/ssd/py313"), "3.13"
+    )
+    with pytest.raises(EnvironmentNotFoundError):
+        get_venv_settings("dev")
+
+
+def test_get_resolver_python_version(project: Path) -> None:
+    assert get_resolver_python_version() is None
+    (project / "pyproject.toml").write_text(
+        '[project]\nrequires-python = ">=3.9,<4"\n'
+        '[tool.pspm]\npython = "3.12"\n'
+        '[tool.pspm.envs.py313]\npython = "3.13"\n'
+        '[tool.pspm.envs.py310]\npython = "3.10"\n'
+    )
+    assert get_resolver_python_version() == "3.10"
+    (project / "pyproject.toml").write_text(
+        '[project]\nrequires-python = ">=3.9,<4"\n'
+        '[tool.pspm.envs.pypy]\npython = "pypy@3.10"\n'
+    )
+    assert get_resolver_python_version() == "3.9"
+    Path(".venv").mkdir()
+    Path(".venv/pyvenv.cfg").write_text("version_info = 3.8.20\n")
+    assert get_resolver_python_version() == "3.8"
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from pspm.entities.pyproject import Pyproject
+from pspm.entities.toml import Toml
+
+
+@pytest.fixture
+def pyproject_path(tmp_path: Path) -> Path:
+    path = tmp_path / "pyproject.toml"
+    path.write_text(
+        "[project]\n"
+        'name = "test"\n'
+        'version = "1.0.0"\n'
+        'dependencies = ["foo"]\n'
+        "\n"
+        "[project.optional-dependencies]\n"
+        'dev = ["developing"]\n'
+    )
+    return path
+
+
+def test_load_is_cached(pyproject_path: Path) -> None:
+    toml = Toml(str(pyproject_path))
+    parse_count = Toml.parse_count
+    first = toml.load()
+    second = toml.load()
+    assert first == second
+    assert first is not second
+    assert Toml.parse_count == parse_count + 1
+
+
+def test_load_reparses_modified_file(pyproject_path: Path) -> None:
+    toml = Toml(str(pyproject_path))
+    toml.load()
+    parse_count = Toml.parse_count
+    pyproject_path.write_text('[project]\nname = "changed"\n')
+    stat = pyproject_path.stat()
+    os.utime(pyproject_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    assert toml.load()["project"]["name"] == "changed"
+    assert Toml.parse_count == parse_count + 1
+
+
+def test_dump_refreshes_cache(pyproject_path: Path) -> None:
+    toml = Toml(str(pyproject_path))
+    data = toml.load()
+    data["project"]["version"] = "2.0.0"
+    toml.dump(data)
+    parse_count = Toml.parse_count
+    assert toml.load()["project"]["version"] == "2.0.0"
+    assert Toml.parse_count == parse_count
+
+
+def test_pyproject_parses_once_per_command(pyproject_path: Path) -> None:
+    parse_count = Toml.parse_count
+    pyproject = Pyproject(Toml(str(pyproject_path)))
+    pyproject.manage_dependency("add", "bar", "dev")
+    pyproject.get_extra_groups()
+    pyproject.get_extra_groups()
+    pyproject.get_dependencies("dev")
+    pyproject.is_installable()
+    assert pyproject.get_dependencies("dev") == ["developing", "bar"]
+    assert Toml.parse_count == parse_count + 1
+
+
+def test_set_value_preserves_format(pyproject_path: Path) -> None:
+    pyproject_path.write_text(
+        pyproject_path.read_text().replace(
+            'dev = ["developing"]', 'dev = ["developing"]  # tools'
+        )
+    )
+    toml = Toml(str(pyproject_path))
+    toml.load()
+    parse_count = Toml.parse_count
+    toml.set_value(
+        ["project", "optional-dependencies", "dev"], ["developing", "bar"]
+    )
+    assert (
+        'dev = ["developing", "bar"]  # tools\n' in pyproject_path.read_text()
+    )
+    assert toml.load()["project"]["optional-dependencies"]["dev"] == [
+        "developing",
+        "bar",
+    ]
+    assert Toml.parse_count == parse_count
+
+
+def test_set_value_falls_back_to_dump(pyproject_path: Path) -> None:
+    pyproject_path.write_text('project = { name = "test" }\n')
+    toml = Toml(str(pyproject_path))
+    toml.set_value(["project", "version"], "1.0.0")
+    assert toml.load()["project"] == {"name": "test", "version": "1.0.0"}
+
+
+def test_set_value_closing_bracket_on_item_line(pyproject_path: Path) -> None:
+    pyproject_path.write_text(
+        '[project]\nname = "test"\ndependencies = [\n    "foo",\n    "bar"]\n'
+    )
+    toml = Toml(str(pyproject_path))
+    toml.set_value(["project", "dependencies"], ["foo"])
+    toml.invalidate()
+    assert toml.load()["project"]["dependencies"] == ["foo"]
+
+
+def test_remove_value_preserves_format(pyproject_path: Path) -> None:
+    pyproject_path.write_text(
+        pyproject_path.read_text() + 'new = [\n    "foo",  # added\n]\n'
+    )
+    toml = Toml(str(pyproject_path))
+    assert "new" in toml.load()["project"]["optional-dependencies"]
+    toml.remove_value(["project", "optional-dependencies", "new"])
+    assert pyproject_path.read_text().endswith('dev = ["developing"]\n')
+    assert "new" not in toml.load()["project"]["optional-dependencies"]
+
+
+def test_remove_value_falls_back_to_dump(pyproject_path: Path) -> None:
+    pyproject_path.write_text('project = { name = "test", version = "1" }\n')
+    toml = Toml(str(pyproject_path))
+    toml.remove_value(["project", "version"])
+    assert toml.load()["project"] == {"name": "test"}
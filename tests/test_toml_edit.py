@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import difflib
+import sys
+import time
+
+import pytest
+
+from pspm.utils import toml_edit
+from pspm.utils.toml_edit import patch_toml, remove_toml_key
+
+if sys.version_info >= (3, 11):
+    import tomllib
+else:
+    import tomli as tomllib
+
+DOCUMENT = """\
+# Project settings
+[project]
+name = "demo"  # name
+version = "0.1.0"
+dependencies = [
+    # web
+    "requests>=2",  # http
+    "rich",
+    "typer" # cli
+]
+urls.homepage = "https://example.com"
+
+[project.optional-dependencies]
+dev = ["pytest", "ruff"]  # tools
+docs = [
+  "mkdocs",
+]
+
+[tool.other]
+text = \"\"\"
+[not.a.table]
+\"\"\"
+nested = [[1, 2], [3]]
+"""
+
+
+def _patch(keys: list[str], value: object) -> str:
+    patched = patch_toml(DOCUMENT, keys, value)
+    assert patched is not None
+    table = tomllib.loads(patched)
+    for key in keys:
+        table = table[key]
+    assert table == value
+    return patched
+
+
+def _changed_lines(patched: str) -> list[str]:
+    return [
+        line
+        for line in difflib.ndiff(DOCUMENT.splitlines(), patched.splitlines())
+        if line[:1] in {"+", "-"}
+    ]
+
+
+def test_patch_array_keeps_comments() -> None:
+    patched = _patch(["project", "dependencies"], ["requests>=2", "typer"])
+    assert _changed_lines(patched) == ['-     "rich",']
+
+
+def test_patch_array_adds_missing_comma() -> None:
+    patched = _patch(
+        ["project", "dependencies"], ["requests>=2", "rich", "typer", "click"]
+    )
+    assert _changed_lines(patched) == [
+        '-     "typer" # cli',
+        '+     "typer", # cli',
+        '+     "click",',
+    ]
+
+
+def test_patch_array_appends_item() -> None:
+    patched = _patch(
+        ["project", "optional-dependencies", "docs"], ["mkdocs", "mike"]
+    )
+    assert _changed_lines(patched) == ['+   "mike",']
+
+
+def test_patch_array_replaces_item() -> None:
+    patched = _patch(
+        ["project", "dependencies"], ["requests>=3", "rich", "typer"]
+    )
+    assert _changed_lines(patched) == [
+        '-     "requests>=2",  # http',
+        '+     "requests>=3",  # http',
+    ]
+
+
+def test_patch_inline_array() -> None:
+    patched = _patch(
+        ["project", "optional-dependencies", "dev"], ["pytest", "mypy"]
+    )
+    assert 'dev = ["pytest", "mypy"]  # tools\n' in patched
+
+
+def test_patch_scalar() -> None:
+    patched = _patch(["project", "version"], "0.2.0")
+    assert _changed_lines(patched) == [
+        '- version = "0.1.0"',
+        '+ version = "0.2.0"',
+    ]
+
+
+def test_patch_adds_key_to_table() -> None:
+    patched = _patch(["project", "optional-dependencies", "test"], ["x"])
+    assert 'docs = [\n  "mkdocs",\n]\ntest = [\n    "x",\n]\n' in patched
+
+
+def test_patch_adds_table() -> None:
+    patched = _patch(["tool", "pspm", "venv"], ".env")
+    assert patched.endswith(
+        'nested = [[1, 2], [3]]\n\n[tool.pspm]\nvenv = ".env"\n'
+    )
+
+
+@pytest.mark.parametrize(
+    "keys",
+    [["project", "urls", "docs"], ["tool", "other", "nested", "x"]],
+)
+def test_patch_unsupported(keys: list[str]) -> None:
+    assert patch_toml(DOCUMENT, keys, "x") is None
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        'deps = [\n    "a",\n    "b"]\n',
+        'deps = [\n    "a",\n    "b"]  # end\n',
+        'deps = [\n    "a",\n    "b"\n    ,\n]\n',
+        'deps = [\n    "a",\n    "b", # b\n]  # end\n',
+    ],
+)
+@pytest.mark.parametrize("value", [["a", "b", "c"], ["a"], ["a", "c"], []])
+def test_patch_array_layouts(text: str, value: list[str]) -> None:
+    patched = patch_toml(text, ["deps"], value)
+    assert patched is not None
+    assert tomllib.loads(patched) == {"deps": value}
+    assert patched.endswith("  # end\n") == text.endswith("  # end\n")
+
+
+def test_patch_rejects_invalid_result(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(toml_edit, "_render_value", lambda *_: '["a",')
+    assert patch_toml('deps = ["a"]\n', ["deps"], ["a", "b"]) is None
+    monkeypatch.setattr(toml_edit, "_render_value", lambda *_: '["a"]')
+    assert patch_toml('deps = ["a"]\n', ["deps"], ["a", "b"]) is None
+
+
+@pytest.mark.parametrize(
+    ("text", "keys"),
+    [
+        ("[deps.extra]\nx = 1\n", ["deps"]),
+        ("deps.x = 1\n", ["deps"]),
+        ("[[deps]]\nx = 1\n", ["deps"]),
+        ("[[tool]]\nx = 1\n", ["tool", "deps"]),
+    ],
+)
+def test_patch_rejects_key_defined_as_table(
+    text: str, keys: list[str]
+) -> None:
+    assert patch_toml(text, keys, ["a"]) is None
+
+
+def test_remove_key() -> None:
+    removed = remove_toml_key(
+        DOCUMENT, ["project", "optional-dependencies", "docs"]
+    )
+    assert removed is not None
+    assert _changed_lines(removed) == ["- docs = [", '-   "mkdocs",', "- ]"]
+
+
+def test_remove_table() -> None:
+    removed = remove_toml_key(DOCUMENT, ["project", "optional-dependencies"])
+    assert removed is not None
+    assert "[project.optional-dependencies]" not in removed
+    assert removed.endswith(
+        ']\nurls.homepage = "https://example.com"\n\n'
+        "[tool.other]\n" + DOCUMENT.split("[tool.other]\n")[1]
+    )
+
+
+def test_remove_last_table() -> None:
+    text = '[project]\nname = "demo"\n\n[tool.pspm]\nvenv = ".env"\n'
+    assert remove_toml_key(text, ["tool", "pspm"]) == (
+        '[project]\nname = "demo"\n'
+    )
+
+
+def test_remove_missing_key() -> None:
+    assert remove_toml_key(DOCUMENT, ["tool", "pspm"]) == DOCUMENT
+
+
+def test_remove_unsupported() -> None:
+    assert remove_toml_key(DOCUMENT, ["project", "urls"]) is None
+
+
+def test_patch_large_pyproject(monkeypatch: pytest.MonkeyPatch) -> None:
+    lines = ["[project]", 'name = "big"', "dependencies = ["]
+    lines += [f'    "package-{i}>=1.0",  # reason {i}' for i in range(400)]
+    lines += ["]", "", "[project.optional-dependencies]"]
+    for group in range(200):
+        lines.append(f"group-{group} = [")
+        lines += [f'    "group-{group}-package-{i}",' for i in range(20)]
+        lines.append("]")
+    text = "\n".join(lines) + "\n"
+    value = [f"group-199-package-{i}" for i in range(20)] + ["new"]
+    parse_durations = []
+    for _ in range(3):
+        start = time.perf_counter()
+        tomllib.loads(text)
+        parse_durations.append(time.perf_counter() - start)
+
+    # Only the edited value is parsed, never the whole document
+    parsed: list[str] = []
+    original_loads = tomllib.loads
+
+    def loads(fragment: str) -> dict[str, object]:
+        parsed.append(fragment)
+        return original_loads(fragment)
+
+    monkeypatch.setattr(toml_edit.tomllib, "loads", loads)
+    durations = []
+    for _ in range(3):
+        start = time.perf_counter()
+        patched = patch_toml(
+            text, ["project", "optional-dependencies", "group-199"], value
+        )
+        removed = remove_toml_key(
+            text, ["project", "optional-dependencies", "group-0"]
+        )
+        durations.append(time.perf_counter() - start)
+    assert patched == text.replace(
+        '"group-199-package-19",\n', '"group-199-package-19",\n    "new",\n'
+    )
+    assert removed is not None
+    assert "group-0 = [" not in removed
+    assert max(len(fragment) for fragment in parsed) < 1000
+    assert min(durations) < min(parse_durations) / 2
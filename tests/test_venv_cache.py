@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from pspm.entities.venv_cache import VenvCache
+
+
+@pytest.fixture
+def venv(tmp_path: Path) -> Path:
+    path = tmp_path / ".venv"
+    (path / "lib").mkdir(parents=True)
+    (path / "pyvenv.cfg").write_text("version_info = 3.12.0\n")
+    (path / "lib" / "package.py").write_text("synced")
+    return path
+
+
+@pytest.fixture
+def venv_cache(tmp_path: Path, venv: Path) -> VenvCache:
+    return VenvCache(tmp_path / "cache", venv, max_entries=2)
+
+
+def _recreate(venv: Path) -> None:
+    (venv / "lib" / "package.py").unlink()
+
+
+def test_restore_stored_venv(venv_cache: VenvCache, venv: Path) -> None:
+    assert not venv_cache.restore("lock")
+    venv_cache.store("lock")
+    _recreate(venv)
+
+    assert venv_cache.restore("lock")
+    assert (venv / "lib" / "package.py").read_text() == "synced"
+    assert sorted(p.name for p in venv.parent.iterdir()) == [".venv", "cache"]
+
+
+def test_restore_needs_same_interpreter(
+    venv_cache: VenvCache, venv: Path
+) -> None:
+    venv_cache.store("lock")
+    _recreate(venv)
+    (venv / "pyvenv.cfg").write_text("version_info = 3.13.0\n")
+
+    assert not venv_cache.restore("lock")
+    assert not venv_cache.restore("other-lock")
+
+
+def test_store_prunes_old_venvs(venv_cache: VenvCache, tmp_path: Path) -> None:
+    for fingerprint in ["first", "second", "third"]:
+        venv_cache.store(fingerprint)
+    assert len(list((tmp_path / "cache").iterdir())) == 2
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import pytest
+
+from pspm.entities.venv_runner import VenvRunner
+from pspm.errors.command import CommandNotFoundError, CommandRunError
+
+
+class ProcessReplaced(Exception):
+    pass
+
+
+class DummyCommandRunner:
+    def __init__(self) -> None:
+        self.executed: list[str] = []
+        self.env: dict[str, str] | None = None
+
+    def run(
+        self,
+        command: str,
+        arguments: list[str] | None = None,
+        env: dict[str, str] | None = None,
+    ) -> int:
+        self.executed = [command, *(arguments or [])]
+        self.env = env
+        return 3
+
+    def execute(
+        self,
+        command: str,
+        arguments: list[str] | None = None,
+        env: dict[str, str] | None = None,
+    ) -> None:
+        self.executed = [command, *(arguments or [])]
+        self.env = env
+        raise ProcessReplaced
+
+
+class DummyVenv:
+    def get_path_to_command_bin(self, command: str) -> str:
+        if command == "missing":
+            raise CommandNotFoundError(command)
+        return f"/venv/bin/{command}"
+
+    def get_environment(self) -> dict[str, str]:
+        return {"PATH": "/venv/bin", "VIRTUAL_ENV": "/venv"}
+
+
+@pytest.fixture
+def command_runner() -> DummyCommandRunner:
+    return DummyCommandRunner()
+
+
+@pytest.fixture
+def runner(command_runner: DummyCommandRunner) -> VenvRunner:
+    return VenvRunner(DummyVenv(), command_runner)  # type: ignore
+
+
+def test_run_returns_exit_code(
+    runner: VenvRunner, command_runner: DummyCommandRunner
+) -> None:
+    assert runner.run("pytest", ["-x"], replace_process=False) == 3
+    assert command_runner.executed == ["/venv/bin/pytest", "-x"]
+
+
+def test_run_replaces_process(
+    runner: VenvRunner, command_runner: DummyCommandRunner
+) -> None:
+    with pytest.raises(ProcessReplaced):
+        runner.run("gunicorn", ["app:app"], replace_process=True)
+    assert command_runner.executed == ["/venv/bin/gunicorn", "app:app"]
+
+
+def test_run_missing_command(runner: VenvRunner) -> None:
+    with pytest.raises(CommandRunError):
+        runner.run("missing")
+
+
+def test_run_passes_environment(
+    runner: VenvRunner, command_runner: DummyCommandRunner
+) -> None:
+    runner.run("pytest", environment={"FOO": "bar"}, replace_process=False)
+    assert command_runner.env == {
+        "PATH": "/venv/bin",
+        "VIRTUAL_ENV": "/venv",
+        "FOO": "bar",
+    }
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from pspm.entities.virtual_env import VirtualEnv
+
+
+@pytest.fixture
+def virtual_env(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> VirtualEnv:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("PYTHONHOME", "/usr")
+    return VirtualEnv()
+
+
+def test_get_environment_activates_venv(
+    virtual_env: VirtualEnv, tmp_path: Path
+) -> None:
+    environment = virtual_env.get_environment()
+    venv_path = tmp_path / ".venv"
+    assert environment["VIRTUAL_ENV"] == str(venv_path)
+    assert environment["PATH"].split(os.pathsep)[0] == str(venv_path / "bin")
+    assert "PYTHONHOME" not in environment
+
+
+def test_get_environment_returns_copy(virtual_env: VirtualEnv) -> None:
+    environment = virtual_env.get_environment()
+    environment["FOO"] = "bar"
+    assert "FOO" not in virtual_env.get_environment()
+
+
+def test_sync_fingerprint(virtual_env: VirtualEnv) -> None:
+    Path(".venv").mkdir()
+    assert virtual_env.get_sync_fingerprint() is None
+    virtual_env.set_sync_fingerprint("abc")
+    assert virtual_env.get_sync_fingerprint() == "abc"
+    virtual_env.set_sync_fingerprint(None)
+    assert virtual_env.get_sync_fingerprint() is None
+
+
+class DummyCommandRunner:
+    def run(self, command: str, arguments: list[str] | None = None) -> int:
+        self.arguments = arguments or []
+        return 0
+
+
+def test_create_with_path_and_python(tmp_path: Path) -> None:
+    command_runner = DummyCommandRunner()
+    venv_path = tmp_path / "venvs" / "project"
+    virtual_env = VirtualEnv(command_runner, venv_path, "3.12")
+    virtual_env.create()
+    assert command_runner.arguments == [
+        "venv",
+        "--python",
+        "3.12",
+        str(venv_path),
+    ]
+
+    (venv_path / "bin").mkdir(parents=True)
+    (venv_path / "bin" / "pytest").touch()
+    assert virtual_env.get_path_to_command_bin("pytest") == str(
+        venv_path / "bin" / "pytest"
+    )
+    assert virtual_env.get_environment()["VIRTUAL_ENV"] == str(venv_path)
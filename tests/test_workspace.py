@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from pspm.entities.pyproject import BasePyproject, Pyproject
+from pspm.entities.toml import BaseToml
+from pspm.entities.workspace import Workspace, find_workspace_members
+
+
+class DummyToml(BaseToml):
+    def __init__(self, data: dict[str, Any]) -> None:
+        self.data = data
+
+    def load(self) -> dict[str, Any]:
+        return self.data
+
+    def dump(self, data: dict[str, Any]) -> None:
+        self.data = data
+
+
+def _pyproject(
+    dependencies: list[str],
+    extras: dict[str, list[str]] | None = None,
+    *,
+    installable: bool = True,
+) -> BasePyproject:
+    data: dict[str, Any] = {
+        "project": {
+            "name": "test",
+            "dependencies": dependencies,
+            "optional-dependencies": extras or {},
+        }
+    }
+    if installable:
+        data["build-system"] = {"build-backend": "hatchling.build"}
+    return Pyproject(DummyToml(data))
+
+
+@pytest.fixture
+def workspace(tmp_path: Path) -> Workspace:
+    return Workspace(
+        _pyproject(["foo"], {"docs": ["sphinx"]}, installable=False),
+        {
+            "packages/a": _pyproject(["b"], {"dev": ["pytest"]}),
+            "packages/b": _pyproject(["idna"]),
+        },
+        tmp_path / ".pspm",
+    )
+
+
+def test_get_extra_groups(workspace: Workspace) -> None:
+    assert workspace.get_extra_groups() == ["docs", "dev"]
+
+
+def test_get_requirements(workspace: Workspace) -> None:
+    assert workspace.get_requirements() == [
+        "foo",
+        "-e ./packages/a",
+        "-e ./packages/b",
+    ]
+    assert workspace.get_requirements("dev") == [
+        "foo",
+        "-e ./packages/a[dev]",
+        "-e ./packages/b",
+    ]
+    assert workspace.get_requirements("docs")[:2] == ["foo", "sphinx"]
+
+
+def test_get_editables(workspace: Workspace) -> None:
+    assert workspace.get_editables() == ["packages/a", "packages/b"]
+
+
+def test_write_input_file(workspace: Workspace, tmp_path: Path) -> None:
+    path = Path(workspace.write_input_file("dev"))
+    assert path == tmp_path / ".pspm" / "workspace-dev.in"
+    assert path.read_text() == "foo\n-e ./packages/a[dev]\n-e ./packages/b\n"
+
+    mtime = path.stat().st_mtime_ns
+    workspace.write_input_file("dev")
+    assert path.stat().st_mtime_ns == mtime
+
+
+def test_write_constraint_file(workspace: Workspace, tmp_path: Path) -> None:
+    lock_file = tmp_path / "requirements.lock"
+    lock_file.write_text(
+        "-e ./packages/a\n    # via -r .pspm/workspace.in\nidna==3.7\n"
+    )
+    path = Path(workspace.write_constraint_file(str(lock_file)))
+    assert path.read_text() == "    # via -r .pspm/workspace.in\nidna==3.7\n"
+
+
+def test_find_workspace_members(tmp_path: Path) -> None:
+    for member in ["packages/a", "packages/b", "packages/docs", "tools/c"]:
+        (tmp_path / member).mkdir(parents=True)
+    for member in ["packages/a", "packages/b", "tools/c"]:
+        (tmp_path / member / "pyproject.toml").write_text(
+            '[project]\nname = "member"\n'
+        )
+    members = find_workspace_members(["packages/*", "tools/c/"], tmp_path)
+    assert list(members) == ["packages/a", "packages/b", "tools/c"]